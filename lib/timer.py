@@ -6,6 +6,8 @@ import the variable timer instead.
 
 
 from time import perf_counter_ns as _get_time_ns
+from time import sleep as _os_sleep
+from dataclasses import dataclass
 from typing import Callable
 
 
@@ -152,9 +154,28 @@ class Timer:
 timer = Timer()
 
 
-# Highest accuracy sleep
+# How close to the deadline sleep() stops using the OS and starts spinning.
+# The OS can wake up late, so this should cover its overshoot. Set by calibrate_sleep().
+_spin_threshold_ns = 10**6
+
+
+@dataclass(slots=True)
+class SleepCalibration:
+    """Result of calibrate_sleep(). All times in ns."""
+
+    spin_threshold: int  # Tail of each sleep that is spun instead of slept
+    os_overshoot_median: int  # How late the OS sleep woke up
+    os_overshoot_max: int
+    jitter_median: int  # How far sleep() landed from the requested delay
+    jitter_max: int
+
+
+# Highest accuracy sleep without pinning the CPU
 def sleep(delay: int, unit: str ="s") -> None:
-        """Sleeps for specified unit of time."""
+        """Sleeps for specified unit of time.
+        The OS sleeps for most of the delay, freeing the core and the GIL.
+        Only the last _spin_threshold_ns is spun for accuracy.
+        """
         if unit == "ns":
             ns = delay
         elif unit == "us":
@@ -171,5 +192,41 @@ def sleep(delay: int, unit: str ="s") -> None:
             raise NotImplementedError("Invalid time unit for sleep.")
         
         end = _get_time_ns() + ns
+        if ns > _spin_threshold_ns:
+            _os_sleep((ns - _spin_threshold_ns) / 10**9)
+
+        # sleep(0) still releases the GIL for other threads while spinning
         while _get_time_ns() < end:
-            pass
\ No newline at end of file
+            _os_sleep(0)
+
+
+def calibrate_sleep(samples: int = 50, delay_us: int = 1000, margin_us: int = 50) -> SleepCalibration:
+    """Measures how late the OS wakes up from a sleep and sets the spin threshold to cover it.
+    Then measures the jitter of sleep() itself with the new threshold.
+    """
+    global _spin_threshold_ns
+
+    overshoots = []
+    for _ in range(samples):
+        start = _get_time_ns()
+        _os_sleep(delay_us / 10**6)
+        overshoots.append(max(_get_time_ns() - start - delay_us * 10**3, 0))
+    overshoots.sort()
+
+    # Covers nearly every overshoot without letting one outlier force spinning the whole delay
+    _spin_threshold_ns = overshoots[int(0.95 * (samples - 1))] + margin_us * 10**3
+
+    jitters = []
+    for _ in range(samples):
+        start = _get_time_ns()
+        sleep(delay_us, unit="us")
+        jitters.append(abs(_get_time_ns() - start - delay_us * 10**3))
+    jitters.sort()
+
+    return SleepCalibration(
+        spin_threshold=_spin_threshold_ns,
+        os_overshoot_median=overshoots[samples // 2],
+        os_overshoot_max=overshoots[-1],
+        jitter_median=jitters[samples // 2],
+        jitter_max=jitters[-1]
+    )
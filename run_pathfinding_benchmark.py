@@ -0,0 +1,10 @@
+"""Run pathfinding benchmarks. Must be '__main__'. Use --help for options."""
+
+
+from src.pathfinding.py.benchmark import main
+
+import sys
+
+
+if __name__ == "__main__":
+    sys.exit(main())
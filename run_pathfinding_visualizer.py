@@ -9,10 +9,12 @@ else:
     from src.pathfinding.py.algorithms import AlgoState
 
 from src.pathfinding.py.graph import GraphState, VisText
-from src.pathfinding.py.logic import LogicState, run_pathfinding
+from src.pathfinding.py.logic import LogicState, run_pathfinding, run_replay
+from src.pathfinding.py.graph import TRACE_PATH
 
 import sys
 import os
+import argparse
 
 
 def overide_where():
@@ -42,6 +44,11 @@ def overide_where():
 def main() -> None:
     """Main function"""
 
+    parser = argparse.ArgumentParser(description="Pathfinding visualizer")
+    parser.add_argument("--replay", metavar="PATH", nargs="?", const=TRACE_PATH,
+        help=f"Play back a trace recorded with 'R' instead, {TRACE_PATH} if no path is given")
+    args = parser.parse_args()
+
     overide_where()
 
     gph = GraphState(rects_to_update=[])
@@ -52,6 +59,10 @@ def main() -> None:
 
     txt = VisText()
 
+    if args.replay:
+        run_replay(gph, algo, txt, args.replay)
+        return
+
     run_pathfinding(gph, algo, lgc, txt)
 
 
@@ -0,0 +1,10 @@
+"""Run sorting benchmarks. Must be '__main__'. Use --help for options."""
+
+
+from src.sorting.py.benchmark import main
+
+import sys
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,12 +1,22 @@
 """Run sort visualizer. Must be '__main__'."""
 
-from src.sorting.py.graph import Graph, set_graph
+import argparse
+from src.sorting.py.graph import Graph, set_graph, replay
 from src.sorting.py.utils.values import generate_array
 
 
 def main() -> None:
     """Set default values to initialize graph with"""
 
+    parser = argparse.ArgumentParser(description="Sorting visualizer")
+    parser.add_argument("--record", metavar="PATH", help="Record each sort as a trace here, replacing the last")
+    parser.add_argument("--replay", metavar="PATH", help="Show a recorded trace instead")
+    parser.add_argument("--start", type=int, default=0, help="Event to start the replay at")
+    args = parser.parse_args()
+    if args.replay:
+        replay(args.replay, args.start)
+        return
+
     array = generate_array(0, 150, 30)
     array_size = len(array)
     labels = [label for label in range(array_size)]
@@ -14,8 +24,6 @@ def main() -> None:
 
     vis = None  # Created in set_graph. Defining here would be redundant
     pause_short = 150 / array_size * 0.01
-    pause_mid = (pause_short * 3) + (array_size * 0.001)
-    pause_long = (pause_short * 3) + (array_size * 0.005)
 
     g = Graph(
         array=array,
@@ -24,8 +32,7 @@ def main() -> None:
         is_sorted=is_sorted,
         vis=vis,
         pause_short=pause_short,
-        pause_mid=pause_mid,
-        pause_long=pause_long
+        record_path=args.record
     )
 
     set_graph(g)
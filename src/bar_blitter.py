@@ -0,0 +1,345 @@
+"""Bar graphs for the sorting and searching visualizers that only redraw what changed.
+Full draws cache the axes without the bars as a background. Each frame puts the background
+back behind the changed bars only, redraws the bars there and blits that area to the screen.
+BarBlitter draws bars as one collection instead of a Rectangle each, which takes seconds to make in the thousands.
+BarRaster draws them as columns of an image the size of the axes, for more bars than there are pixels.
+"""
+
+
+from abc import ABC, abstractmethod
+from time import perf_counter
+import numpy as np
+from matplotlib.axes import Axes
+from matplotlib.collections import PolyCollection
+from matplotlib.colors import to_rgba
+from matplotlib.image import AxesImage
+from matplotlib.path import Path
+from matplotlib.transforms import Affine2D, IdentityTransform
+from src.trace import TraceWriter
+
+
+FRAME_INTERVAL = 1 / 30  # Shortest time between frames. Changes in between are drawn together.
+BAR_WIDTH = 0.8  # Same as plt.bar, centered on the index
+
+
+class _Bar:
+    """One bar, with the Rectangle methods the algorithms use"""
+
+    __slots__ = ("_bars", "_index")
+
+    def __init__(self, bars: "_Bars", index: int) -> None:
+        self._bars = bars
+        self._index = index
+
+    def get_height(self) -> float:
+        return self._bars.get_height(self._index)
+
+    def set_height(self, height: float) -> None:
+        self._bars.set_height(self._index, height)
+
+    def set_color(self, color: str) -> None:
+        self._bars.set_color(self._index, color)
+
+
+class _Bars(ABC):
+    """Pacing and indexing shared by the bar graphs. They draw in update and _on_draw."""
+
+    def __init__(self, ax: Axes) -> None:
+        self.ax = ax
+        self.canvas = ax.figure.canvas
+        self._background = None  # Axes without the bars, copied after every full draw
+        self._pending: float = 0  # Pause asked for since the last frame
+        self._last_frame: float = perf_counter()
+        self.trace: TraceWriter | None = None  # Records changes and frames while set
+        self._cid = self.canvas.mpl_connect("draw_event", self._on_draw)
+
+    def __getitem__(self, index: int) -> _Bar:
+        if index < 0:
+            index += len(self)  # Counts from the end like a list of bars
+        return _Bar(self, index)
+
+    @abstractmethod
+    def __len__(self) -> int:
+        """Number of bars"""
+
+    @abstractmethod
+    def get_height(self, index: int) -> float:
+        """Height of the bar at index"""
+
+    @abstractmethod
+    def set_height(self, index: int, height: float) -> None:
+        """Changes the height of the bar at index, drawn on the next update"""
+
+    @abstractmethod
+    def set_color(self, index: int, color: str) -> None:
+        """Changes the color of the bar at index, drawn on the next update"""
+
+    def pause(self, interval: float) -> None:
+        """Like plt.pause, but pauses shorter than a frame add up until there is a frame's worth to show"""
+        self._pending += interval
+        if self._pending < FRAME_INTERVAL:
+            return
+
+        self.update()
+        # Handles GUI events for whatever is left of the pauses after drawing
+        remaining = self._pending - (perf_counter() - self._last_frame)
+        self.canvas.start_event_loop(max(remaining, 0.001))
+        self._pending = 0
+        self._last_frame = perf_counter()
+
+    def draw(self) -> None:
+        """Shows every change left, like plt.draw at the end of an algorithm"""
+        self.update()
+        self.canvas.flush_events()
+
+    @abstractmethod
+    def update(self) -> None:
+        """Draws the bars changed since the last frame"""
+
+    @abstractmethod
+    def _on_draw(self, event) -> None:
+        """Keeps the background and draws every bar after a full draw"""
+
+
+class BarBlitter(_Bars):
+    """Bars at each index of heights. Indexing gives a bar to change, pause shows the changes like plt.pause."""
+
+    def __init__(self, ax: Axes, heights, color: str) -> None:
+        num_bars = len(heights)
+
+        # Corners of each bar, bottom left first, and their colors as rgba
+        x = np.arange(num_bars, dtype=float)
+        self._verts = np.zeros((num_bars, 4, 2))
+        self._verts[:, :2, 0] = (x - BAR_WIDTH / 2)[:, None]
+        self._verts[:, 2:, 0] = (x + BAR_WIDTH / 2)[:, None]
+        self._verts[:, 1:3, 1] = np.asarray(heights, dtype=float)[:, None]
+        self._colors = np.tile(to_rgba(color), (num_bars, 1))
+        self._rgba: dict[str, tuple] = {}  # Cache of to_rgba
+
+        # Animated artists are skipped by full draws, so _on_draw draws them over the background
+        self._collection = PolyCollection(self._verts, facecolors=self._colors, edgecolors="none", animated=True)
+        self._collection.sticky_edges.y.append(0)
+        ax.add_collection(self._collection)
+        ax.autoscale_view()
+        self._strip = PolyCollection([], edgecolors="none", animated=True)  # Bars redrawn in a frame
+        ax.add_collection(self._strip, autolim=False)
+
+        self._changed: set[int] = set()
+        super().__init__(ax)
+
+    def __len__(self) -> int:
+        return len(self._verts)
+
+    def get_height(self, index: int) -> float:
+        return self._verts[index, 1, 1]
+
+    def set_height(self, index: int, height: float) -> None:
+        self._verts[index, 1:3, 1] = height
+        self._changed.add(index)
+        if self.trace is not None:
+            self.trace.set_height(index, height)
+
+    def set_color(self, index: int, color: str) -> None:
+        if color not in self._rgba:
+            self._rgba[color] = to_rgba(color)
+        self._colors[index] = self._rgba[color]
+        self._changed.add(index)
+        if self.trace is not None:
+            self.trace.set_color(index, color)
+
+    def update(self) -> None:
+        """Redraws the changed bars over the background and blits them"""
+        if not self._changed:
+            return
+        if self.trace is not None:
+            self.trace.frame()
+        if self._background is None or not self.canvas.supports_blit:
+            self.canvas.draw_idle()
+            return
+
+        # Background is put back in whole pixel columns, which can also hold parts of bars next to the changed ones.
+        # Every bar in them is then drawn at once, clipped to the columns.
+        x1, y1, _, y2 = self._background.get_extents()
+        columns = self._get_columns()
+        for left, right in columns:
+            self.canvas.restore_region(self._background, bbox=(left, y1, right - 1, y2), xy=(x1, y1))  # Right inclusive
+        self._draw_bars(columns)
+        self.canvas.blit(self.ax.bbox)
+        self._changed.clear()
+
+    def _on_draw(self, event) -> None:
+        """Takes the background after a full draw and draws every bar over it"""
+        if self._collection.get_figure() is None:  # Cleared by a new graph on the same canvas
+            self.canvas.mpl_disconnect(self._cid)
+            return
+
+        self._background = self.canvas.copy_from_bbox(self.ax.bbox)
+        self._collection.set_verts(self._verts)
+        self._collection.set_facecolor(self._colors)
+        self.ax.draw_artist(self._collection)
+        self._changed.clear()
+
+    def _get_columns(self) -> list[tuple[int, int]]:
+        """Pixel columns to redraw as (left, right), with the columns of nearby changed bars joined"""
+        indices = np.fromiter(sorted(self._changed), dtype=float, count=len(self._changed))
+        lefts = np.floor(self._to_pixel_x(indices - BAR_WIDTH / 2)) - 1  # A pixel past each side for antialiasing
+        rights = np.ceil(self._to_pixel_x(indices + BAR_WIDTH / 2)) + 1
+
+        columns: list[list[int]] = []
+        for left, right in zip(lefts.tolist(), rights.tolist()):
+            if columns and left <= columns[-1][1]:
+                columns[-1][1] = max(columns[-1][1], int(right))
+            else:
+                columns.append([int(left), int(right)])
+        return [(left, right) for left, right in columns]
+
+    def _draw_bars(self, columns: list[tuple[int, int]]) -> None:
+        """Draws every bar reaching into the pixel columns, clipped to them"""
+        # Bars within a pixel count too, as snapping to pixels can move their edges that far
+        lefts, rights = np.array(columns, dtype=float).T
+        firsts = np.maximum(np.ceil(self._to_data_x(lefts - 1) - BAR_WIDTH / 2), 0).astype(int)
+        lasts = np.minimum(np.floor(self._to_data_x(rights + 1) + BAR_WIDTH / 2), len(self._verts) - 1).astype(int)
+        indices = np.unique(np.concatenate([np.arange(first, last + 1) for first, last in zip(firsts, lasts)]))
+
+        bottom, top = self.ax.bbox.y0, self.ax.bbox.y1
+        clip = Path.make_compound_path(*(Path.unit_rectangle().transformed(
+            Affine2D().scale(right - left, top - bottom).translate(left, bottom)) for left, right in columns))
+        self._strip.set_verts(self._verts[indices])
+        self._strip.set_facecolor(self._colors[indices])
+        self._strip.set_clip_path(clip, IdentityTransform())
+        self.ax.draw_artist(self._strip)
+
+    def _to_pixel_x(self, x: np.ndarray) -> np.ndarray:
+        """Display x of data x"""
+        return self.ax.transData.transform(np.column_stack((x, np.zeros_like(x))))[:, 0]
+
+    def _to_data_x(self, x: np.ndarray) -> np.ndarray:
+        """Data x of display x"""
+        return self.ax.transData.inverted().transform(np.column_stack((x, np.zeros_like(x))))[:, 0]
+
+
+class _ColumnImage(AxesImage):
+    """Image already a pixel per pixel of the axes. Drawn as it is, resampling takes longer than the rest of a frame."""
+
+    pixels: np.ndarray = np.zeros((0, 0, 4), dtype=np.uint8)  # Rows from the bottom as the renderer takes them, rgba
+
+    def make_image(self, renderer, magnification=1.0, unsampled=False):
+        return self.pixels, self.axes.bbox.x0, self.axes.bbox.y0, IdentityTransform()
+
+
+class BarRaster(_Bars):
+    """Same as BarBlitter, drawn as an image with a column per pixel across the axes.
+    A column shows the tallest of the bars under it, in the first of colors any of them has.
+    Frames only rewrite the columns that changed, so their cost follows the axes size, not the number of bars.
+    Replace it with a new one on the same axes to show another array, remove takes the old image off.
+    """
+
+    def __init__(self, ax: Axes, heights, color: str, colors: tuple[str, ...] = ()) -> None:
+        self._heights = np.array(heights, dtype=float)
+        self._top: float = max(self._heights.max(initial=0) * 1.05, 1)  # Same margin as autoscaling bars
+
+        # Colors are codes into the palette, ordered by which a column shows first
+        self._palette: list[str] = list(colors) if color in colors else [*colors, color]
+        self._codes: dict[str, int] = {name: code for code, name in enumerate(self._palette)}
+        self._rgba = np.array([to_rgba(name, 1) for name in self._palette]) * 255
+        self._color_codes = np.full(len(self._heights), self._codes[color], dtype=np.intp)
+
+        # What each pixel column shows. Sized with the image on the first full draw.
+        self._column_heights = np.zeros(0, dtype=np.intp)
+        self._column_codes = np.zeros(0, dtype=np.intp)
+        self._changed: bool = False
+
+        # Animated artists are skipped by full draws, so _on_draw draws them over the background
+        self._image = _ColumnImage(ax, extent=(0, 1, 0, 1), transform=ax.transAxes, animated=True)
+        ax.add_image(self._image)
+        ax.set_xlim(-0.5, len(self._heights) - 0.5)
+        ax.set_ylim(0, self._top)
+        super().__init__(ax)
+
+    def __len__(self) -> int:
+        return len(self._heights)
+
+    def get_height(self, index: int) -> float:
+        return self._heights[index]
+
+    def set_height(self, index: int, height: float) -> None:
+        self._heights[index] = height
+        self._changed = True
+        if self.trace is not None:
+            self.trace.set_height(index, height)
+
+    def set_color(self, index: int, color: str) -> None:
+        if color not in self._codes:
+            self._codes[color] = len(self._palette)
+            self._palette.append(color)
+            self._rgba = np.vstack((self._rgba, np.array(to_rgba(color, 1)) * 255))
+        self._color_codes[index] = self._codes[color]
+        self._changed = True
+        if self.trace is not None:
+            self.trace.set_color(index, color)
+
+    def remove(self) -> None:
+        """Takes the image off the axes and stops drawing it"""
+        self._image.remove()
+        self.canvas.mpl_disconnect(self._cid)
+
+    def update(self) -> None:
+        """Rewrites the changed columns and blits the image"""
+        if not self._changed:
+            return
+        if self.trace is not None:
+            self.trace.frame()
+        if self._background is None or not self.canvas.supports_blit or self._is_resized():
+            self.canvas.draw_idle()
+            return
+
+        self._changed = False
+        if self._set_columns():
+            self.canvas.restore_region(self._background)
+            self.ax.draw_artist(self._image)
+            self.canvas.blit(self.ax.bbox)
+
+    def _on_draw(self, event) -> None:
+        """Takes the background after a full draw and draws the image over it, remade if the axes changed size"""
+        if self._image.get_figure() is None:  # Cleared by a new graph on the same canvas
+            self.canvas.mpl_disconnect(self._cid)
+            return
+
+        self._background = self.canvas.copy_from_bbox(self.ax.bbox)
+        if self._is_resized():
+            width, height = self._get_size()
+            self._image.pixels = np.zeros((height, width, 4), dtype=np.uint8)
+            self._image.set_data(self._image.pixels)  # Only tells the image it isn't empty
+            self._column_heights = np.zeros(width, dtype=np.intp)
+            self._column_codes = np.full(width, -1, dtype=np.intp)  # Matches nothing, so every column is written
+        self._set_columns()
+        self.ax.draw_artist(self._image)
+        self._changed = False
+
+    def _set_columns(self) -> bool:
+        """Writes the columns whose height or color changed into the image. Returns if any did."""
+        pixels = self._image.pixels
+        height, width = pixels.shape[:2]
+        if not width or not len(self._heights):
+            return False
+
+        # Bars under each column run from its start to the next one's. With fewer bars than columns, bars span several.
+        starts = np.arange(width) * len(self._heights) // width
+        column_heights = np.rint(np.maximum.reduceat(self._heights, starts) / self._top * height).astype(np.intp)
+        column_codes = np.minimum.reduceat(self._color_codes, starts)
+
+        changed = np.flatnonzero((column_heights != self._column_heights) | (column_codes != self._column_codes))
+        if not len(changed):
+            return False
+        is_bar = np.arange(height)[:, None] < column_heights[changed]
+        pixels[:, changed] = np.where(is_bar[..., None], self._rgba[column_codes[changed]], 0)
+        self._column_heights, self._column_codes = column_heights, column_codes
+        return True
+
+    def _get_size(self) -> tuple[int, int]:
+        """Width and height of the axes in pixels"""
+        return max(round(self.ax.bbox.width), 1), max(round(self.ax.bbox.height), 1)
+
+    def _is_resized(self) -> bool:
+        """Whether the image no longer has a pixel per pixel of the axes"""
+        return self._image.pixels.shape[1::-1] != self._get_size()
@@ -4,6 +4,7 @@
 #include <cstdlib>
 #include <queue>
 #include <random>
+#include <thread>
 #include <unordered_set>
 
 
@@ -16,11 +17,25 @@ void AlgoState::run_options(Square& start, Square& mid, Square& end, Square& ign
     m_ignore_square_ptr = &ignore_square;
 }
 
-void AlgoState::run(int phase, int algo)
+void AlgoState::run(int phase, int algo, bool /* replan */)
 {
-    _set_phase(phase);
-    _set_algo(algo);
-    _set_finished(false);
+    {
+        std::scoped_lock lock{ m_lock };
+        m_phase = phase;
+        m_algo = algo;
+        m_finished = false;
+    }
+    m_job_changed.notify_all();
+}
+
+void AlgoState::cancel()
+{
+    std::unique_lock lock{ m_lock };
+    if (m_running)
+    {
+        m_cancelled = true;
+        m_job_changed.wait(lock, [this] { return !m_running; });
+    }
 }
 
 void AlgoState::reset()
@@ -35,6 +50,7 @@ void AlgoState::reset()
     m_finished = false;
     m_best_path_delay_ms = DEFAULT_BEST_PATH_DELAY_MS;
     m_recursive_maze_delay_us = DEFAULT_RECURSIVE_MAZE_DELAY_US;
+    m_flood_fill_delay_us = DEFAULT_FLOOD_FILL_DELAY_US;
 }
 
 void AlgoState::timer_end(bool count)
@@ -74,16 +90,48 @@ void AlgoState::algo_loop()
 {
     while (true)
     {
-        if (check_phase() == PHASE_ALGO && !check_finished())
+        // Sleep until there is a job to do
+        {
+            std::unique_lock lock{ m_lock };
+            m_job_changed.wait(lock, [this] { return m_phase != NONE && !m_finished; });
+            m_running = true;
+            m_cancelled = false;
+        }
+
+        try
+        {
+            run_job();
+        }
+        catch (const AlgoCancelled&)
+        {
+            // Leave the graph editable, whoever cancelled will submit the next job
+            std::scoped_lock lock{ m_lock };
+            m_finished = true;
+            m_phase = NONE;
+        }
+
+        {
+            std::scoped_lock lock{ m_lock };
+            m_running = false;
+        }
+        m_job_changed.notify_all();
+    }
+}
+
+void AlgoState::run_job()
+{
+    if (check_phase() == PHASE_ALGO)
+    {
+        int previous_algo = check_algo();
+        try
         {
-            int previous_algo = check_algo();
             if (!*m_mid_ptr)
             {
                 if (check_algo() == ALGO_DIJKSTRA)
                 {
                     dijkstra(this, m_start_ptr, m_end_ptr, m_ignore_square_ptr, true);
                 }
-                else if (check_algo() == ALGO_A_STAR)
+                else if (check_algo() == ALGO_A_STAR || check_algo() == ALGO_HPA)
                 {
                     a_star(this, m_start_ptr, m_end_ptr, m_ignore_square_ptr, true);
                 }
@@ -91,27 +139,51 @@ void AlgoState::algo_loop()
                 {
                     bi_dijkstra(this, m_start_ptr, m_end_ptr, m_ignore_square_ptr, true);
                 }
+                else if (check_algo() == ALGO_JPS)
+                {
+                    jps(this, m_start_ptr, m_end_ptr, m_ignore_square_ptr, true);
+                }
+                else if (check_algo() == ALGO_BI_A_STAR)
+                {
+                    bi_a_star(this, m_start_ptr, m_end_ptr, m_ignore_square_ptr, true);
+                }
             }
             else
             {
                 start_mid_end(this, m_start_ptr, m_mid_ptr, m_end_ptr);
             }
+        }
+        catch (const AlgoCancelled&)
+        {
             set_best_path_delay(DEFAULT_BEST_PATH_DELAY_MS);
+            set_flood_fill_delay(DEFAULT_FLOOD_FILL_DELAY_US);
             _set_algo(previous_algo);
-            _set_finished(true);
-            _set_phase(NONE);
+            throw;
         }
+        set_best_path_delay(DEFAULT_BEST_PATH_DELAY_MS);
+        set_flood_fill_delay(DEFAULT_FLOOD_FILL_DELAY_US);
+        _set_algo(previous_algo);
+        _set_finished(true);
+        _set_phase(NONE);
+    }
 
-        else if (check_phase() == PHASE_MAZE && !check_finished())
+    else if (check_phase() == PHASE_MAZE)
+    {
+        if (check_algo() == ALGO_RECURSIVE_MAZE)
         {
-            if (check_algo() == ALGO_RECURSIVE_MAZE)
+            try
             {
                 recursive_maze(this);
+            }
+            catch (const AlgoCancelled&)
+            {
                 set_recursive_maze_delay(DEFAULT_RECURSIVE_MAZE_DELAY_US);
+                throw;
             }
-            _set_finished(true);
-            _set_phase(NONE);
+            set_recursive_maze_delay(DEFAULT_RECURSIVE_MAZE_DELAY_US);
         }
+        _set_finished(true);
+        _set_phase(NONE);
     }
 }
 
@@ -151,6 +223,7 @@ std::unordered_map<Square*, Square*> dijkstra(
     while (!open_set.empty())
     {
         // Time increments for each square being checked
+        algo->_check_cancelled();
         algo->timer_start();
 
         // Gets the square currently being checked
@@ -174,7 +247,7 @@ std::unordered_map<Square*, Square*> dijkstra(
             {
                 continue;
             }
-            int temp_g_score{ g_score.at(curr_square_ptr) - 1 };
+            int temp_g_score{ g_score.at(curr_square_ptr) - nei_ptr->get_cost() };
             if (temp_g_score > g_score.at(nei_ptr))
             {
                 came_from[nei_ptr] = curr_square_ptr;
@@ -229,7 +302,17 @@ std::unordered_map<Square*, Square*> a_star(
         }
     }
     g_score[start_ptr] = 0;
-    f_score[start_ptr] = heuristic(start_ptr->get_pos(), end_ptr->get_pos());
+
+    // Every step costs at least the cheapest square, scaling by it keeps the heuristic admissible
+    int min_cost{ std::numeric_limits<int>::max() };
+    for (int row{ 0 }; row < Square::s_get_num_rows(); ++row)
+    {
+        for (int col{ 0 }; col < Square::s_get_num_cols(); ++col)
+        {
+            min_cost = std::min(min_cost, Square::s_get_square(row, col)->get_cost());
+        }
+    }
+    f_score[start_ptr] = heuristic(start_ptr->get_pos(), end_ptr->get_pos()) * min_cost;
 
     // Keeps track of next square for every square in graph. A linked list basically.
     std::unordered_map<Square*, Square*> came_from{};
@@ -241,6 +324,7 @@ std::unordered_map<Square*, Square*> a_star(
     while (!open_set.empty())
     {
         // Time increments for each square being checked
+        algo->_check_cancelled();
         algo->timer_start();
 
         // Gets the square currently being checked
@@ -264,12 +348,12 @@ std::unordered_map<Square*, Square*> a_star(
             {
                 continue;
             }
-            int temp_g_score{ g_score.at(curr_square_ptr) - 1 };
+            int temp_g_score{ g_score.at(curr_square_ptr) - nei_ptr->get_cost() };
             if (temp_g_score > g_score.at(nei_ptr))
             {
                 came_from[nei_ptr] = curr_square_ptr;
                 g_score[nei_ptr] = temp_g_score;
-                f_score[nei_ptr] = temp_g_score - heuristic(nei_ptr->get_pos(), end_ptr->get_pos());
+                f_score[nei_ptr] = temp_g_score - heuristic(nei_ptr->get_pos(), end_ptr->get_pos()) * min_cost;
                 --queue_pos;
                 std::tuple<int, int, Square*> queue_tuple{ std::make_tuple(f_score.at(nei_ptr), queue_pos, nei_ptr) };
                 open_set.push(queue_tuple);
@@ -300,6 +384,211 @@ int heuristic(const std::array<int, 2>& pos1, const std::array<int, 2>& pos2)
     return std::abs(x1 - x2) + std::abs(y1 - y2);
 }
 
+std::unordered_map<Square*, Square*> jps(
+    AlgoState* algo, Square* start_ptr, Square* end_ptr,
+    Square* ignore_square_ptr, bool draw_best_path)
+{
+    // Jump points rely on every square costing the same
+    for (int row{ 0 }; row < Square::s_get_num_rows(); ++row)
+    {
+        for (int col{ 0 }; col < Square::s_get_num_cols(); ++col)
+        {
+            if (Square::s_get_square(row, col)->is_highway())
+            {
+                return a_star(algo, start_ptr, end_ptr, ignore_square_ptr, draw_best_path);
+            }
+        }
+    }
+
+    // Clear preivious and start timer here
+    algo->timer_reset();
+    algo->timer_start();
+
+    // Only jump points are put in the open set. Order of args helper decide the priority.
+    std::priority_queue<std::tuple<int, int, Square*>> open_set{};
+    int queue_pos{ 0 };
+    std::tuple<int, int, Square*> queue_tuple{ std::make_tuple(0, queue_pos, start_ptr) };
+    open_set.push(queue_tuple);
+
+    // Determine what is the best square to check
+    std::unordered_map<Square*, int> g_score{};
+    g_score[start_ptr] = 0;
+
+    // Keeps track of the previous jump point of every jump point
+    std::unordered_map<Square*, Square*> came_from_jump_point{};
+
+    // End timer here to start it again in loop
+    algo->timer_end(false);
+
+    // Continues until every jump point has been checked or best path found
+    while (!open_set.empty())
+    {
+        // Time increments for each jump point being checked
+        algo->_check_cancelled();
+        algo->timer_start();
+
+        // Gets the jump point currently being checked
+        Square* curr_square_ptr{ std::get<2>(open_set.top()) };
+        open_set.pop();
+
+        // Terminates if found the best path. Fills in the squares between jump points to draw it.
+        if (curr_square_ptr == end_ptr)
+        {
+            std::unordered_map<Square*, Square*> came_from{};
+            Square* square_ptr{ end_ptr };
+            while (came_from_jump_point.contains(square_ptr))
+            {
+                Square* jump_point_ptr{ came_from_jump_point.at(square_ptr) };
+                auto [row, col] = square_ptr->get_pos();
+                auto [jump_point_row, jump_point_col] = jump_point_ptr->get_pos();
+                int d_row{ (jump_point_row > row) - (jump_point_row < row) };
+                int d_col{ (jump_point_col > col) - (jump_point_col < col) };
+                while (square_ptr != jump_point_ptr)
+                {
+                    row += d_row;
+                    col += d_col;
+                    came_from[square_ptr] = Square::s_get_square(row, col);
+                    square_ptr = came_from.at(square_ptr);
+                }
+            }
+            if (draw_best_path)
+            {
+                best_path(algo, came_from, end_ptr);
+            }
+            return came_from;
+        }
+
+        // Jumps along each direction that isn't pruned
+        Square* parent_ptr{ came_from_jump_point.contains(curr_square_ptr) ? came_from_jump_point.at(curr_square_ptr) : nullptr };
+        for (Square* nei_ptr : jps_successors(curr_square_ptr, parent_ptr, end_ptr))
+        {
+            // Jump points are in a straight line so the distance is the number of squares between
+            int temp_g_score{ g_score.at(curr_square_ptr) + heuristic(curr_square_ptr->get_pos(), nei_ptr->get_pos()) };
+            if (!g_score.contains(nei_ptr) || temp_g_score < g_score.at(nei_ptr))
+            {
+                came_from_jump_point[nei_ptr] = curr_square_ptr;
+                g_score[nei_ptr] = temp_g_score;
+                --queue_pos;
+                std::tuple<int, int, Square*> queue_tuple{
+                    std::make_tuple(-temp_g_score - heuristic(nei_ptr->get_pos(), end_ptr->get_pos()), queue_pos, nei_ptr) };
+                open_set.push(queue_tuple);
+
+                if (!nei_ptr->is_closed() && nei_ptr != end_ptr && nei_ptr != ignore_square_ptr)
+                {
+                    std::scoped_lock{ algo->m_lock };
+                    nei_ptr->set_open();
+                }
+            }
+        }
+        // Sets square to closed after finished checking
+        if (curr_square_ptr != start_ptr && curr_square_ptr != ignore_square_ptr)
+        {
+            std::scoped_lock{ algo->m_lock };
+            curr_square_ptr->set_closed();
+        }
+        // End timer to increment count
+        algo->timer_end();
+    }
+    return std::unordered_map<Square*, Square*>{};
+}
+
+std::vector<Square*> jps_successors(Square* square_ptr, Square* parent_ptr, Square* end_ptr)
+{
+    auto [row, col] = square_ptr->get_pos();
+    std::vector<std::array<int, 2>> directions{};
+    if (!parent_ptr)
+    {
+        directions = { { 0, -1 }, { -1, 0 }, { 0, 1 }, { 1, 0 } };  // Same order as Square neighbours
+    }
+    else
+    {
+        auto [parent_row, parent_col] = parent_ptr->get_pos();
+        int d_row{ (row > parent_row) - (row < parent_row) };
+        int d_col{ (col > parent_col) - (col < parent_col) };
+
+        // Going back, or sideways then back, is never shorter than a path not through this square
+        if (d_col)
+        {
+            directions = { { -1, 0 }, { 1, 0 }, { 0, d_col } };
+        }
+        else
+        {
+            directions = { { 0, -1 }, { 0, 1 }, { d_row, 0 } };
+        }
+    }
+
+    std::vector<Square*> successors{};
+    for (auto [d_row, d_col] : directions)
+    {
+        Square* jump_point_ptr{ d_col ? jump_horizontal(row, col, d_col, end_ptr) : jump_vertical(row, col, d_row, end_ptr) };
+        if (jump_point_ptr)
+        {
+            successors.push_back(jump_point_ptr);
+        }
+    }
+    return successors;
+}
+
+Square* jump_horizontal(int row, int col, int d_col, Square* end_ptr)
+{
+    while (true)
+    {
+        col += d_col;
+        if (!is_walkable(row, col))
+        {
+            return nullptr;
+        }
+        Square* square_ptr{ Square::s_get_square(row, col) };
+        if (square_ptr == end_ptr)
+        {
+            return square_ptr;
+        }
+
+        // A wall behind opening up above or below forces a turn here
+        if ((is_walkable(row - 1, col) && !is_walkable(row - 1, col - d_col))
+            || (is_walkable(row + 1, col) && !is_walkable(row + 1, col - d_col)))
+        {
+            return square_ptr;
+        }
+    }
+}
+
+Square* jump_vertical(int row, int col, int d_row, Square* end_ptr)
+{
+    while (true)
+    {
+        row += d_row;
+        if (!is_walkable(row, col))
+        {
+            return nullptr;
+        }
+        Square* square_ptr{ Square::s_get_square(row, col) };
+        if (square_ptr == end_ptr)
+        {
+            return square_ptr;
+        }
+
+        // A wall behind opening up to the left or right forces a turn here
+        if ((is_walkable(row, col - 1) && !is_walkable(row - d_row, col - 1))
+            || (is_walkable(row, col + 1) && !is_walkable(row - d_row, col + 1)))
+        {
+            return square_ptr;
+        }
+
+        // Turning onto a row that leads to a jump point also makes this one
+        if (jump_horizontal(row, col, -1, end_ptr) || jump_horizontal(row, col, 1, end_ptr))
+        {
+            return square_ptr;
+        }
+    }
+}
+
+bool is_walkable(int row, int col)
+{
+    return row >= 0 && row < Square::s_get_num_rows() && col >= 0 && col < Square::s_get_num_cols()
+        && !Square::s_get_square(row, col)->is_wall();
+}
+
 std::tuple<std::unordered_map<Square*, Square*>, Square*, Square*> bi_dijkstra(
     AlgoState* algo, Square* start_ptr, Square* end_ptr,
     Square* ignore_square_ptr, bool draw_best_path)
@@ -358,6 +647,7 @@ std::tuple<std::unordered_map<Square*, Square*>, Square*, Square*> bi_dijkstra(
         }
 
         // Time increments for each square being checked
+        algo->_check_cancelled();
         algo->timer_start();
 
         // Gets the square currently being checked
@@ -440,6 +730,175 @@ void best_path_bi_dijkstra(
 }
 
 
+std::unordered_map<Square*, Square*> bi_a_star(
+    AlgoState* algo, Square* start_ptr, Square* end_ptr,
+    Square* ignore_square_ptr, bool draw_best_path)
+{
+    // Clear preivious and start timer here
+    algo->timer_reset();
+    algo->timer_start();
+
+    // Every step costs at least the cheapest square, scaling by it keeps the heuristic admissible
+    int min_cost{ std::numeric_limits<int>::max() };
+    for (int row{ 0 }; row < Square::s_get_num_rows(); ++row)
+    {
+        for (int col{ 0 }; col < Square::s_get_num_cols(); ++col)
+        {
+            min_cost = std::min(min_cost, Square::s_get_square(row, col)->get_cost());
+        }
+    }
+
+    // Everything is kept per swarm. The first swarm heads for end, the second for start.
+    const int FIRST_SWARM{ 0 };
+    const int SECOND_SWARM{ 1 };
+    std::array<Square*, 2> targets{ end_ptr, start_ptr };
+
+    // Ordered by f_score, ties go to the square closer to its target so the swarms meet early and pruning starts
+    std::array<std::priority_queue<std::tuple<int, int, int, Square*>>, 2> open_sets{};
+    int queue_pos{ 0 };
+    int h_score{ heuristic(start_ptr->get_pos(), end_ptr->get_pos()) * min_cost };
+    open_sets[FIRST_SWARM].push(std::make_tuple(-h_score, -h_score, queue_pos, start_ptr));
+    open_sets[SECOND_SWARM].push(std::make_tuple(-h_score, -h_score, queue_pos, end_ptr));
+    std::array<int, 2> lowest_f_scores{ h_score, h_score };
+
+    // Squares not in a swarm's g_score haven't been reached by it
+    std::array<std::unordered_map<Square*, int>, 2> g_scores{};
+    g_scores[FIRST_SWARM][start_ptr] = 0;
+    g_scores[SECOND_SWARM][end_ptr] = 0;
+
+    // Keeps track of the previous square of each swarm
+    std::array<std::unordered_map<Square*, Square*>, 2> came_from_swarm{};
+
+    // Squares either swarm is done with, and the shortest path through a square both swarms reached
+    std::unordered_set<Square*> closed{};
+    int best_length{ std::numeric_limits<int>::max() };
+    Square* meet_square_ptr{ nullptr };
+
+    // End timer here to start it again in loop
+    algo->timer_end(false);
+
+    // Continues until a swarm has no squares left, the best path is known by then
+    int swarm{ SECOND_SWARM };
+    while (!open_sets[FIRST_SWARM].empty() && !open_sets[SECOND_SWARM].empty())
+    {
+        // Time increments for each square being checked
+        algo->_check_cancelled();
+        algo->timer_start();
+
+        // Swarms take turns
+        int other_swarm{ swarm };
+        swarm = 1 - swarm;
+        auto& open_set{ open_sets[swarm] };
+        auto& g_score{ g_scores[swarm] };
+
+        // Gets the square currently being checked. Skipped if the other swarm is done with it.
+        Square* curr_square_ptr{ std::get<3>(open_set.top()) };
+        open_set.pop();
+        if (!closed.contains(curr_square_ptr))
+        {
+            closed.insert(curr_square_ptr);
+
+            // Only spread from squares that could still be on a shorter path
+            int curr_g_score{ g_score.at(curr_square_ptr) };
+            int f_score{ curr_g_score + heuristic(curr_square_ptr->get_pos(), targets[swarm]->get_pos()) * min_cost };
+            int other_bound{ curr_g_score + lowest_f_scores[other_swarm]
+                - heuristic(curr_square_ptr->get_pos(), targets[other_swarm]->get_pos()) * min_cost };
+            if (f_score < best_length && other_bound < best_length)
+            {
+                for (Square* nei_ptr : curr_square_ptr->get_neighbours())
+                {
+                    // Ignore walls and squares either swarm is done with
+                    if (nei_ptr->is_wall() || closed.contains(nei_ptr))
+                    {
+                        continue;
+                    }
+
+                    // Second swarm walks edges backwards so pays for the square it leaves
+                    int step_cost{ swarm == FIRST_SWARM ? nei_ptr->get_cost() : curr_square_ptr->get_cost() };
+                    int temp_g_score{ curr_g_score + step_cost };
+                    if (!g_score.contains(nei_ptr) || temp_g_score < g_score.at(nei_ptr))
+                    {
+                        came_from_swarm[swarm][nei_ptr] = curr_square_ptr;
+                        g_score[nei_ptr] = temp_g_score;
+                        h_score = heuristic(nei_ptr->get_pos(), targets[swarm]->get_pos()) * min_cost;
+                        --queue_pos;
+                        open_set.push(std::make_tuple(-(temp_g_score + h_score), -h_score, queue_pos, nei_ptr));
+
+                        // Swarms meet wherever both have reached
+                        auto other_g_score{ g_scores[other_swarm].find(nei_ptr) };
+                        if (other_g_score != g_scores[other_swarm].end() && temp_g_score + other_g_score->second < best_length)
+                        {
+                            best_length = temp_g_score + other_g_score->second;
+                            meet_square_ptr = nei_ptr;
+                        }
+
+                        // Set nei to open under certain conditions
+                        if (!nei_ptr->is_closed() && nei_ptr != start_ptr && nei_ptr != end_ptr && nei_ptr != ignore_square_ptr)
+                        {
+                            std::scoped_lock{ algo->m_lock };
+                            if (swarm == FIRST_SWARM)
+                            {
+                                nei_ptr->set_open();
+                            }
+                            else
+                            {
+                                nei_ptr->set_open2();
+                            }
+                        }
+                    }
+                }
+            }
+            // Sets square to closed after finished checking
+            if (curr_square_ptr != start_ptr && curr_square_ptr != end_ptr && curr_square_ptr != ignore_square_ptr)
+            {
+                std::scoped_lock{ algo->m_lock };
+                if (swarm == FIRST_SWARM)
+                {
+                    curr_square_ptr->set_closed();
+                }
+                else
+                {
+                    curr_square_ptr->set_closed2();
+                }
+            }
+        }
+        // Stale squares left on top only make the bound lower, which is still safe
+        if (!open_set.empty())
+        {
+            lowest_f_scores[swarm] = -std::get<0>(open_set.top());
+        }
+        // End timer to increment count
+        algo->timer_end();
+    }
+
+    // Joins both halves at the meet square, only the squares on the best path are needed to draw it
+    std::unordered_map<Square*, Square*> came_from{};
+    if (meet_square_ptr)
+    {
+        std::vector<Square*> path{ meet_square_ptr };
+        while (came_from_swarm[FIRST_SWARM].contains(path.back()))
+        {
+            path.push_back(came_from_swarm[FIRST_SWARM].at(path.back()));
+        }
+        std::reverse(path.begin(), path.end());
+        while (came_from_swarm[SECOND_SWARM].contains(path.back()))
+        {
+            path.push_back(came_from_swarm[SECOND_SWARM].at(path.back()));
+        }
+        for (int i{ 1 }; i < static_cast<int>(path.size()); ++i)
+        {
+            came_from[path[i]] = path[i - 1];
+        }
+    }
+
+    if (draw_best_path)
+    {
+        best_path(algo, came_from, end_ptr);
+    }
+    return came_from;
+}
+
+
 void best_path(
     AlgoState* algo, std::unordered_map<Square*, Square*>& came_from,
     Square* curr_square_ptr, bool reverse)
@@ -460,6 +919,7 @@ void best_path(
     {
         for (int i{ 0 }; i < static_cast<int>(path.size()) - 1; ++i)
         {
+            algo->_check_cancelled();
             sleep(algo->m_best_path_delay_ms, "ms");
             Square* square = path[i];
             std::scoped_lock{ algo->m_lock };
@@ -470,6 +930,7 @@ void best_path(
     {
         for (int i{ static_cast<int>(path.size()) - 2 }; i >= 0; --i)
         {
+            algo->_check_cancelled();
             sleep(algo->m_best_path_delay_ms, "ms");
             Square* square = path[i];
             std::scoped_lock{ algo->m_lock };
@@ -498,7 +959,7 @@ void start_mid_end(
         best_path(algo, start_to_mid, mid_ptr);
         best_path(algo, mid_to_end, end_ptr);
     }
-    else if (algo->check_algo() == algo->ALGO_A_STAR)
+    else if (algo->check_algo() == algo->ALGO_A_STAR || algo->check_algo() == algo->ALGO_HPA)
     {
         std::unordered_map<Square*, Square*> start_to_mid = a_star(algo, start_ptr, mid_ptr, end_ptr, false);
         std::unordered_map<Square*, Square*> mid_to_end = a_star(algo, mid_ptr, end_ptr, start_ptr, false);
@@ -513,6 +974,36 @@ void start_mid_end(
         best_path(algo, start_to_mid, mid_ptr);
         best_path(algo, mid_to_end, end_ptr);
     }
+    else if (algo->check_algo() == algo->ALGO_JPS)
+    {
+        std::unordered_map<Square*, Square*> start_to_mid = jps(algo, start_ptr, mid_ptr, end_ptr, false);
+        std::unordered_map<Square*, Square*> mid_to_end = jps(algo, mid_ptr, end_ptr, start_ptr, false);
+
+        // Fixes square disappearing when dragging
+        {
+            std::scoped_lock{ algo->m_lock };
+            start_ptr->set_start();
+            mid_ptr->set_mid();
+            end_ptr->set_end();
+        }
+        best_path(algo, start_to_mid, mid_ptr);
+        best_path(algo, mid_to_end, end_ptr);
+    }
+    else if (algo->check_algo() == algo->ALGO_BI_A_STAR)
+    {
+        std::unordered_map<Square*, Square*> start_to_mid = bi_a_star(algo, start_ptr, mid_ptr, end_ptr, false);
+        std::unordered_map<Square*, Square*> mid_to_end = bi_a_star(algo, mid_ptr, end_ptr, start_ptr, false);
+
+        // Fixes square disappearing when dragging
+        {
+            std::scoped_lock{ algo->m_lock };
+            start_ptr->set_start();
+            mid_ptr->set_mid();
+            end_ptr->set_end();
+        }
+        best_path(algo, start_to_mid, mid_ptr);
+        best_path(algo, mid_to_end, end_ptr);
+    }
     else if (algo->check_algo() == algo->ALGO_BI_DIJKSTRA)
     {
         auto temp_first_swarm = bi_dijkstra(algo, start_ptr, mid_ptr, end_ptr, false);
@@ -585,6 +1076,7 @@ void recursive_maze(AlgoState* algo, std::array<int, 4>* chamber_ptr, int divisi
                 std::scoped_lock{ algo->m_lock };
                 square->set_wall();
             }
+            algo->_check_cancelled();
             sleep(algo->m_recursive_maze_delay_us, "us");
             algo->timer_end();
         }
@@ -601,6 +1093,7 @@ void recursive_maze(AlgoState* algo, std::array<int, 4>* chamber_ptr, int divisi
                 std::scoped_lock{ algo->m_lock };
                 square->set_wall();
             }
+            algo->_check_cancelled();
             sleep(algo->m_recursive_maze_delay_us, "us");
             algo->timer_end();
         }
@@ -752,5 +1245,14 @@ void sleep(int delay, std::string unit)
         throw "NotImplementedError: Invalid time for sleep";
     }
 
-    while (std::chrono::high_resolution_clock::now() < end) {}
+    // Let the OS sleep for most of the delay, only spin the tail for accuracy
+    auto spin_start = end - std::chrono::microseconds(SLEEP_SPIN_THRESHOLD_US);
+    if (std::chrono::high_resolution_clock::now() < spin_start)
+    {
+        std::this_thread::sleep_until(spin_start);
+    }
+    while (std::chrono::high_resolution_clock::now() < end)
+    {
+        std::this_thread::yield();
+    }
 }
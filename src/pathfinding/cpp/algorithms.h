@@ -2,7 +2,9 @@
 
 #include "square.h"
 
+#include <atomic>
 #include <chrono>
+#include <condition_variable>
 #include <limits>
 #include <mutex>
 #include <string>
@@ -11,6 +13,10 @@
 #include <vector>
 
 
+// Thrown inside an algorithm when AlgoState::cancel() stops it partway
+struct AlgoCancelled {};
+
+
 struct AlgoState
 {
 public:
@@ -22,6 +28,9 @@ public:
         ALGO_DIJKSTRA = generate_unique_int();
         ALGO_A_STAR = generate_unique_int();
         ALGO_BI_DIJKSTRA = generate_unique_int();
+        ALGO_JPS = generate_unique_int();
+        ALGO_BI_A_STAR = generate_unique_int();
+        ALGO_HPA = generate_unique_int();
         ALGO_BEST_PATH = generate_unique_int();
         ALGO_RECURSIVE_MAZE = generate_unique_int();
         reset();
@@ -38,6 +47,9 @@ public:
     int ALGO_DIJKSTRA;
     int ALGO_A_STAR;
     int ALGO_BI_DIJKSTRA;
+    int ALGO_JPS;
+    int ALGO_BI_A_STAR;
+    int ALGO_HPA;  // Runs A* here, the clusters are only kept by the python algorithms
     int ALGO_BEST_PATH;
     int ALGO_RECURSIVE_MAZE;
 
@@ -45,6 +57,7 @@ public:
 
     int NONE;  // Value is 0 which returns false when casted to bool
     std::mutex m_lock;
+    std::condition_variable m_job_changed;  // Wakes the algo loop on run(), and cancel() when the job stops
 
     // Control the speed of algorithms. Keep 3x faster than python to maintain speed difference.
 
@@ -52,6 +65,8 @@ public:
     int m_best_path_delay_ms;
     int DEFAULT_RECURSIVE_MAZE_DELAY_US = 80;
     int m_recursive_maze_delay_us;
+    int DEFAULT_FLOOD_FILL_DELAY_US = 5;  // Unused, dijkstra here has no flood fill to replay
+    int m_flood_fill_delay_us;
 
     // Timer for algorithms
 
@@ -65,13 +80,15 @@ public:
 
     void start_loop() { algo_loop(); }
     void run_options(Square& start, Square& mid, Square& end, Square& ignore_square);
-    void run(int phase, int algo);
+    void run(int phase, int algo, bool replan = false);  // Replan is unused, searches always start over
+    void cancel();
     int check_phase() { std::scoped_lock{ m_lock }; return m_phase; }
     int check_algo() { std::scoped_lock{ m_lock }; return m_algo; }
     bool check_finished() { std::scoped_lock{ m_lock }; return m_finished; }
     void reset();
     void set_best_path_delay(int ms) { std::scoped_lock{ m_lock }; m_best_path_delay_ms = ms; }
     void set_recursive_maze_delay(int us) { std::scoped_lock{ m_lock }; m_recursive_maze_delay_us = us; }
+    void set_flood_fill_delay(int us) { std::scoped_lock{ m_lock }; m_flood_fill_delay_us = us; }
 
     // Timer functions
 
@@ -89,6 +106,7 @@ public:
     void _set_phase(int phase) { std::scoped_lock{ m_lock }; m_phase = phase; }
     void _set_algo(int algo) { std::scoped_lock{ m_lock }; m_algo = algo; }
     void _set_finished(bool x) { std::scoped_lock{ m_lock }; m_finished = x; }
+    void _check_cancelled() const { if (m_cancelled) { throw AlgoCancelled{}; } }
 
 private:
     // The current phase and current/last algorithm
@@ -96,6 +114,8 @@ private:
     int m_phase;
     int m_algo;
     int m_finished;  // Combination with ALGO preserves the past
+    bool m_running = false;  // Algo loop is currently running a job
+    std::atomic<bool> m_cancelled = false;  // Running job should stop as soon as possible
 
     // Special variables
 
@@ -115,6 +135,7 @@ private:
     // Functions
 
     void algo_loop();
+    void run_job();
     int generate_unique_int() { return ++m_unique_int; }
 };
 
@@ -145,6 +166,21 @@ std::unordered_map<Square*, Square*> a_star(
 // Used by A* to prioritize traveling towards next square
 int heuristic(const std::array<int, 2>& pos1, const std::array<int, 2>& pos2);
 
+// Code for Jump Point Search. A* that only expands the squares where the best path can turn.
+std::unordered_map<Square*, Square*> jps(
+    AlgoState* algo, Square* start_ptr, Square* end_ptr,
+    Square* ignore_square_ptr, bool draw_best_path);
+
+// Jump points reachable in a straight line from a square, pruned by the direction it was reached from
+std::vector<Square*> jps_successors(Square* square_ptr, Square* parent_ptr, Square* end_ptr);
+
+// Scans along a row or column until a jump point, nullptr on hitting a wall or the edge
+Square* jump_horizontal(int row, int col, int d_col, Square* end_ptr);
+Square* jump_vertical(int row, int col, int d_row, Square* end_ptr);
+
+// Inside the graph and not a wall
+bool is_walkable(int row, int col);
+
 // Code for Bi-directional dijkstra. Custom algorithm.
 std::tuple<std::unordered_map<Square*, Square*>, Square*, Square*> bi_dijkstra(
     AlgoState* algo, Square* start_ptr, Square* end_ptr,
@@ -155,6 +191,11 @@ void best_path_bi_dijkstra(
     AlgoState* algo, std::unordered_map<Square*, Square*>& came_from,
     Square* first_swarm_meet_square_ptr, Square* second_swarm_meet_square_ptr);
 
+// Code for Bi-directional A*, the NBA* variant. Drops squares that can't lead to a shorter path than the best so far.
+std::unordered_map<Square*, Square*> bi_a_star(
+    AlgoState* algo, Square* start_ptr, Square* end_ptr,
+    Square* ignore_square_ptr, bool draw_best_path);
+
 
 // Main algo for reconstructing path
 void best_path(
@@ -175,5 +216,8 @@ std::vector<std::array<int, 4>> get_random_sample(std::array<std::array<int, 4>,
 // Return a random int within a range
 int get_randrange(int start, int stop);
 
-// Sleep for an exact amout of time using a no-op loop
+// How close to the deadline sleep stops using the OS and starts spinning
+constexpr int SLEEP_SPIN_THRESHOLD_US = 1000;
+
+// Sleep for an exact amout of time. The OS sleeps for most of it, the tail is spun.
 void sleep(int delay, std::string unit = "s");
@@ -53,6 +53,7 @@ PYBIND11_MODULE(modules, m)
         .def("is_path", &Square::is_path, py::return_value_policy::automatic_reference)
         .def("is_history", &Square::is_history, py::return_value_policy::automatic_reference)
         .def("is_highway", &Square::is_highway, py::return_value_policy::automatic_reference)
+        .def("get_cost", &Square::get_cost, py::return_value_policy::automatic_reference)
         .def("reset", &Square::reset, py::return_value_policy::automatic_reference)
         .def("set_open", &Square::set_open, py::return_value_policy::automatic_reference)
         .def("set_open2", &Square::set_open2, py::return_value_policy::automatic_reference)
@@ -108,6 +109,9 @@ PYBIND11_MODULE(modules, m)
         .def_readonly("ALGO_DIJKSTRA", &AlgoState::ALGO_DIJKSTRA)
         .def_readonly("ALGO_A_STAR", &AlgoState::ALGO_A_STAR)
         .def_readonly("ALGO_BI_DIJKSTRA", &AlgoState::ALGO_BI_DIJKSTRA)
+        .def_readonly("ALGO_JPS", &AlgoState::ALGO_JPS)
+        .def_readonly("ALGO_BI_A_STAR", &AlgoState::ALGO_BI_A_STAR)
+        .def_readonly("ALGO_HPA", &AlgoState::ALGO_HPA)
         .def_readonly("ALGO_BEST_PATH", &AlgoState::ALGO_BEST_PATH)
         .def_readonly("ALGO_RECURSIVE_MAZE", &AlgoState::ALGO_RECURSIVE_MAZE)
         .def_readonly("NONE", &AlgoState::NONE)
@@ -118,13 +122,15 @@ PYBIND11_MODULE(modules, m)
         .def_readonly("timer_count", &AlgoState::m_timer_count)
         .def("start_loop", &AlgoState::start_loop, py::return_value_policy::automatic_reference, py::call_guard<py::gil_scoped_release>())
         .def("run_options", &AlgoState::run_options, py::return_value_policy::automatic_reference)
-        .def("run", &AlgoState::run, py::return_value_policy::automatic_reference)
+        .def("run", &AlgoState::run, "phase"_a, "algo"_a, "replan"_a = false, py::return_value_policy::automatic_reference)
+        .def("cancel", &AlgoState::cancel, py::return_value_policy::automatic_reference, py::call_guard<py::gil_scoped_release>())
         .def("check_phase", &AlgoState::check_phase, py::return_value_policy::automatic_reference)
         .def("check_algo", &AlgoState::check_algo, py::return_value_policy::automatic_reference)
         .def("check_finished", &AlgoState::check_finished, py::return_value_policy::automatic_reference)
         .def("reset", &AlgoState::reset, py::return_value_policy::automatic_reference)
         .def("set_best_path_delay", &AlgoState::set_best_path_delay, py::return_value_policy::automatic_reference)
         .def("set_recursive_maze_delay", &AlgoState::set_recursive_maze_delay, py::return_value_policy::automatic_reference)
+        .def("set_flood_fill_delay", &AlgoState::set_flood_fill_delay, py::return_value_policy::automatic_reference)
         .def("timer_start", &AlgoState::timer_start, py::return_value_policy::automatic_reference)
         .def("timer_end", &AlgoState::timer_end, "count"_a = true, py::return_value_policy::automatic_reference)
         .def("timer_reset", &AlgoState::timer_reset, py::return_value_policy::automatic_reference)
@@ -68,7 +68,6 @@ void Square::reset()
 
     discard_square();
     m_color = s_default_color;
-    m_is_highway = false;
     s_squares_to_update.insert(this);
     s_all_empty_squares.insert(this);
 }
@@ -490,6 +489,12 @@ void Square::s_reset_all_squares()
             square->reset();
         }
     }
+
+    // Highways are kept when squares are reset so clearing the algorithm keeps them
+    for (Square& square : s_graph)
+    {
+        square.set_highway(false);
+    }
 }
 
 void Square::s_set_square_color_by_group(std::vector<Square*>& squares, std::string square_type)
@@ -637,14 +642,12 @@ void Square::s_set_square_color_by_array(
         if (rgb_avg < ROAD_CUTOFF)
         {
             square.set_wall();
+            square.set_highway(false);
         }
         else
         {
             square.reset();
-            if (blue_avg < HIGHWAY_CUTOFF)
-            {
-                square.set_highway(true);
-            }
+            square.set_highway(blue_avg < HIGHWAY_CUTOFF);
         }
     }
 }
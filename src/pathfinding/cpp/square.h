@@ -65,6 +65,7 @@ public:
     bool is_path() const { return m_color == s_path_color; }
     bool is_history() const { return m_color == s_history_color; }
     bool is_highway() const { return m_is_highway; }
+    int get_cost() const { return m_is_highway ? s_highway_cost : s_road_cost; }
 
     // Set square type
 
@@ -198,6 +199,10 @@ private:
     static constexpr std::array<int, 3> s_path_color{ 255, 255, 0 };
     static constexpr std::array<int, 3> s_history_color{ 106, 13, 173 };
 
+    // Cost of stepping onto a square, highways are cheaper
+    static constexpr int s_road_cost{ 2 };
+    static constexpr int s_highway_cost{ 1 };
+
     // Class containers for square types
 
     static inline std::unordered_set<Square*> s_all_empty_squares;
@@ -37,6 +37,9 @@ except (FileNotFoundError, json.JSONDecodeError):
         }
         json.dump(_use_cpp, json_file, indent=4)
 
+# Overrides the file for a single process, e.g. the benchmark runs each choice in its own process
+_use_cpp["#include"] = os.getenv("PATHFINDING_INCLUDE", _use_cpp["#include"])
+
 # Setup imports across program.
 use_square_h = False
 use_algorithms_h = False
@@ -7,15 +7,25 @@ if use_square_h:
     from src.pathfinding.cpp.modules import Square
 else:
     from src.pathfinding.py.square import Square
+from src.pathfinding.py.flood_fill import flood_fill, get_path
+from src.pathfinding.py.frontier import HeapFrontier
+from src.pathfinding.py.incremental import IncrementalPlanner
+from src.pathfinding.py.distance_field import DistanceField
+from src.pathfinding.py.jump_point import get_successors, fill_path
+from src.pathfinding.py.hierarchical import HierarchicalPlanner
 from lib.timer import sleep
 
-from threading import Lock
+from threading import Lock, Condition
 from dataclasses import dataclass, field
-from queue import PriorityQueue
 from time import perf_counter_ns
+import numpy as np
 import random
 
 
+class AlgoCancelled(Exception):
+    """Raised inside an algorithm when AlgoState.cancel() stops it partway"""
+
+
 @dataclass(slots=True)
 class AlgoState:
     """Stores the state of the algorithms, whether they are finished or not"""
@@ -27,6 +37,9 @@ class AlgoState:
     ALGO_DIJKSTRA: int = field(init=False)
     ALGO_A_STAR: int = field(init=False)
     ALGO_BI_DIJKSTRA: int = field(init=False)
+    ALGO_JPS: int = field(init=False)
+    ALGO_BI_A_STAR: int = field(init=False)
+    ALGO_HPA: int = field(init=False)
     ALGO_BEST_PATH: int = field(init=False)
     ALGO_RECURSIVE_MAZE: int = field(init=False)
     
@@ -40,17 +53,35 @@ class AlgoState:
     NONE: int = _unique_int  # Value is 0 which returns false when casted to bool
     lock: Lock  = Lock()
 
+    # Wakes the algo loop when a job is submitted, and cancel() when the job stops
+    _job_changed: Condition = field(init=False)
+    _running: bool = False  # Algo loop is currently running a job
+    _cancelled: bool = False  # Running job should stop as soon as possible
+
     # Run options
     _start: Square = None
     _mid: Square = None
     _end: Square = None
     _ignore_square: Square = None
+
+    # Open set used by the algorithms. BucketFrontier suits the small integer costs.
+    _frontier_type: type = HeapFrontier
+
+    # Kept between instant reruns so edits only repair the last search
+    _planner: IncrementalPlanner = None
+    _distance_field: DistanceField = None  # Answers moving start while walls and end stay put
+    _rerun_walls: bytes = None  # Walls at the last instant rerun
+    _hierarchical: HierarchicalPlanner = None  # Clusters of hpa, rebuilt only where walls were edited since its last run
+    _searched_end: int = None  # Index of end in the last search without mid
+    _replan: bool = False  # Job may repair the last search instead of starting over
     
     # Control the speed of algorithms
     _DEFAULT_BEST_PATH_DELAY_MS: int = 3
     _best_path_delay_ms: int = field(init=False)
     _DEFAULT_RECURSIVE_MAZE_DELAY_US: int = 250
     _recursive_maze_delay_us: int = field(init=False)
+    _DEFAULT_FLOOD_FILL_DELAY_US: int = 15
+    _flood_fill_delay_us: int = field(init=False)
 
     # Timer for algorithms
     timer_total: float = 0
@@ -67,8 +98,12 @@ class AlgoState:
         self.ALGO_DIJKSTRA = self._generate_unique_int()
         self.ALGO_A_STAR = self._generate_unique_int()
         self.ALGO_BI_DIJKSTRA = self._generate_unique_int()
+        self.ALGO_JPS = self._generate_unique_int()
+        self.ALGO_BI_A_STAR = self._generate_unique_int()
+        self.ALGO_HPA = self._generate_unique_int()
         self.ALGO_BEST_PATH = self._generate_unique_int()
         self.ALGO_RECURSIVE_MAZE = self._generate_unique_int()
+        self._job_changed = Condition(self.lock)
         self.reset()
 
     def start_loop(self) -> None:
@@ -83,11 +118,24 @@ class AlgoState:
             self._end = end
             self._ignore_square = ignore_square
 
-    def run(self, phase, algo) -> None:
-        """Start an algorithm using PHASE and ALGO, NULL where applicable."""
-        self._set_phase(phase)
-        self._set_algo(algo)
-        self._set_finished(False)
+    def run(self, phase, algo, replan: bool = False) -> None:
+        """Start an algorithm using PHASE and ALGO, NULL where applicable.
+        Replan repairs the last dijkstra or A* search when end has not moved, otherwise it is ignored.
+        """
+        with self._job_changed:
+            self._phase = phase
+            self._algo = algo
+            self._replan = replan
+            self._finished = False
+            self._job_changed.notify_all()
+
+    def cancel(self) -> None:
+        """Stops the running algorithm and waits until it has. Does nothing if idle."""
+        with self._job_changed:
+            if self._running:
+                self._cancelled = True
+                while self._running:
+                    self._job_changed.wait()
     
     def check_phase(self) -> int:
         """Checks the phase"""
@@ -116,6 +164,7 @@ class AlgoState:
             self._finished = False
             self._best_path_delay_ms = self._DEFAULT_BEST_PATH_DELAY_MS
             self._recursive_maze_delay_us = self._DEFAULT_RECURSIVE_MAZE_DELAY_US
+            self._flood_fill_delay_us = self._DEFAULT_FLOOD_FILL_DELAY_US
 
     def set_best_path_delay(self, ms: int) -> None:
         """Change the delay for the next best path"""
@@ -127,6 +176,16 @@ class AlgoState:
         with self.lock:
             self._recursive_maze_delay_us = us
 
+    def set_flood_fill_delay(self, us: int) -> None:
+        """Change the delay per square for the next flood fill replay"""
+        with self.lock:
+            self._flood_fill_delay_us = us
+
+    def set_frontier_type(self, frontier_type: type) -> None:
+        """Change the open set used by the algorithms. HeapFrontier or BucketFrontier."""
+        with self.lock:
+            self._frontier_type = frontier_type
+
     def _set_phase(self, phase: int) -> None:
         """Change the phase. Use PHASE constants."""
         with self.lock:
@@ -142,33 +201,85 @@ class AlgoState:
         with self.lock:
             self._finished = x
 
+    def _can_replan(self) -> bool:
+        """Checks if the job can repair the last search. Distances of the other algos are not kept."""
+        return (
+            self._replan
+            and not use_square_h
+            and self.check_algo() in (self.ALGO_DIJKSTRA, self.ALGO_A_STAR)
+            and self._end.get_index() == self._searched_end
+        )
+
     def _algo_loop(self) -> None:
-        """This loop is placed on a daemon thread and watches for updates."""
+        """This loop is placed on a daemon thread and waits for jobs from run()."""
         while True:
-            # Check if algo
-            if self.check_phase() == self.PHASE_ALGO and not self.check_finished():
-                previous_algo = self.check_algo()
+            # Sleep until there is a job to do
+            with self._job_changed:
+                while self._phase == self.NONE or self._finished:
+                    self._job_changed.wait()
+                self._running = True
+                self._cancelled = False
+
+            try:
+                self._run_job()
+            except AlgoCancelled:
+                # Leave the graph editable, whoever cancelled will submit the next job
+                with self.lock:
+                    self._finished = True
+                    self._phase = self.NONE
+            finally:
+                # Also when the job crashed, else cancel() would wait forever
+                with self._job_changed:
+                    self._running = False
+                    self._job_changed.notify_all()
+
+    def _run_job(self) -> None:
+        """Runs the job submitted by run()"""
+        # Check if algo
+        if self.check_phase() == self.PHASE_ALGO:
+            previous_algo = self.check_algo()
+            try:
                 if not self._mid:
-                    if self.check_algo() == self.ALGO_DIJKSTRA:
+                    if self._can_replan():
+                        replan(self, self._start, self._end)
+                    elif self.check_algo() == self.ALGO_DIJKSTRA:
                         dijkstra(self, self._start, self._end, self._ignore_square, draw_best_path=True)
                     elif self.check_algo() == self.ALGO_A_STAR:
                         a_star(self, self._start, self._end, self._ignore_square, draw_best_path=True)
                     elif self.check_algo() == self.ALGO_BI_DIJKSTRA:
                         bi_dijkstra(self, self._start, self._end, self._ignore_square, draw_best_path=True)
+                    elif self.check_algo() == self.ALGO_JPS:
+                        jps(self, self._start, self._end, self._ignore_square, draw_best_path=True)
+                    elif self.check_algo() == self.ALGO_BI_A_STAR:
+                        bi_a_star(self, self._start, self._end, self._ignore_square, draw_best_path=True)
+                    elif self.check_algo() == self.ALGO_HPA:
+                        hpa(self, self._start, self._end, self._ignore_square, draw_best_path=True)
+                    if not use_square_h:
+                        self._searched_end = self._end.get_index()
                 else:
                     start_mid_end(self, self._start, self._mid, self._end)
+                    self._searched_end = None
+            finally:
                 self.set_best_path_delay(self._DEFAULT_BEST_PATH_DELAY_MS)  # Set to 0 with no vis
+                self.set_flood_fill_delay(self._DEFAULT_FLOOD_FILL_DELAY_US)
                 self._set_algo(previous_algo)  # Preserves more info
-                self._set_finished(True)
-                self._set_phase(self.NONE)
+            self._set_finished(True)
+            self._set_phase(self.NONE)
 
-            # Check if maze
-            elif self.check_phase() == self.PHASE_MAZE and not self.check_finished():
+        # Check if maze
+        elif self.check_phase() == self.PHASE_MAZE:
+            try:
                 if self.check_algo() == self.ALGO_RECURSIVE_MAZE:
                     recursive_maze(self)
-                    self.set_recursive_maze_delay(self._DEFAULT_RECURSIVE_MAZE_DELAY_US)
-                self._set_finished(True)
-                self._set_phase(self.NONE)
+            finally:
+                self.set_recursive_maze_delay(self._DEFAULT_RECURSIVE_MAZE_DELAY_US)
+            self._set_finished(True)
+            self._set_phase(self.NONE)
+
+    def _check_cancelled(self) -> None:
+        """Called by the algorithms between steps. Not for general use."""
+        if self._cancelled:
+            raise AlgoCancelled
 
     def _timer_start(self) -> None:
         """Start timer for algo. Not for general use."""
@@ -213,18 +324,25 @@ class AlgoState:
 
 def dijkstra(algo: AlgoState, start: Square, end: Square, ignore_square: Square, draw_best_path: bool) -> dict:
     """Code for the dijkstra algorithm"""
+    # Without highways every edge costs 1 so a flood fill over the wall mask finds the same paths
+    if not use_square_h and not Square.has_highways():
+        return _flood_fill_dijkstra(algo, start, end, ignore_square, draw_best_path)
+
     # Clear previous and start timer here to include setup of algo into timer
     algo._timer_reset()
     algo._timer_start()
 
-    # Used to determine the order of squares to check. Order of args helper decide the priority.
-    open_set = PriorityQueue()
-    queue_pos = 0
-    open_set.put((0, queue_pos, start))
+    # Used to determine the order of squares to check. Squares are stored by their index in the graph.
+    graph = _get_graph()
+    indptr, indices, walls = _get_adjacency(graph)
+    costs = _get_costs(graph)
+    open_set = algo._frontier_type(len(graph))
+    start_index = _get_index(start)
+    open_set.put(start_index, 0)
 
     # Determine what is the best square to check
-    g_score = {Square.get_square(row, col): float("inf") for row in range(Square.get_num_rows()) for col in range(Square.get_num_cols())}
-    g_score[start] = 0
+    g_score = [float("inf")] * len(graph)
+    g_score[start_index] = 0
 
     # Keeps track of next square for every square in graph. A linked list basically.
     came_from = {}
@@ -236,10 +354,12 @@ def dijkstra(algo: AlgoState, start: Square, end: Square, ignore_square: Square,
     while not open_set.empty():
 
         # Time increments for each square being checked
+        algo._check_cancelled()
         algo._timer_start()
 
         # Gets the square currently being checked
-        curr_square: Square = open_set.get()[2]
+        curr_index = open_set.get()
+        curr_square: Square = graph[curr_index]
 
         # Terminates if found the best path
         if curr_square == end:
@@ -249,18 +369,18 @@ def dijkstra(algo: AlgoState, start: Square, end: Square, ignore_square: Square,
 
         # Decides the order of neighbours to check
         nei: Square
-        for nei in curr_square.get_neighbours():
+        for nei_index in indices[indptr[curr_index]:indptr[curr_index + 1]]:
             # Ignore walls
-            if nei.is_wall():
+            if walls[nei_index]:
                 continue
 
             # Only check square if not already checked.
-            temp_g_score = g_score[curr_square] + 1
-            if temp_g_score < g_score[nei]:
+            nei = graph[nei_index]
+            temp_g_score = g_score[curr_index] + costs[nei_index]
+            if temp_g_score < g_score[nei_index]:
                 came_from[nei] = curr_square
-                g_score[nei] = temp_g_score
-                queue_pos += 1
-                open_set.put((g_score[nei], queue_pos, nei))
+                g_score[nei_index] = temp_g_score
+                open_set.put(nei_index, temp_g_score)
 
                 # Set nei to open under certain conditions
                 if not nei.is_closed() and nei != end and nei != ignore_square:
@@ -278,22 +398,70 @@ def dijkstra(algo: AlgoState, start: Square, end: Square, ignore_square: Square,
     return came_from
 
 
+def _flood_fill_dijkstra(algo: AlgoState, start: Square, end: Square, ignore_square: Square, draw_best_path: bool) -> dict:
+    """Dijkstra using the vectorized flood fill, then replays each wave onto the squares"""
+    # Time the search itself, replaying is only for visualization
+    algo._timer_reset()
+    algo._timer_start()
+    dist, came_from_index, waves = flood_fill(Square.get_walls(), start.get_index(), end.get_index())
+    algo._timer_end(count=False)
+    # Every square reached through the end's wave, so the whole last wave rather than up to the end
+    algo.timer_count = sum(len(wave) for wave in waves)
+
+    # Each wave closes and opens the next. The last wave is still open when the end is found.
+    ignore_index = ignore_square.get_index() if ignore_square else -1
+    closed = [wave[(wave != start.get_index()) & (wave != ignore_index)] for wave in waves[:-1]]
+    opened = [wave[(wave != end.get_index()) & (wave != ignore_index)] for wave in waves[1:]]
+
+    # Replays waves at about the per square pace of the other algorithms. Without a delay only the end result is drawn.
+    if not algo._flood_fill_delay_us:
+        algo._check_cancelled()
+        with algo.lock:
+            if closed:
+                Square.set_square_color_by_indices(np.concatenate(closed), "closed")
+                Square.set_square_color_by_indices(opened[-1], "open")
+    else:
+        for wave_num, wave in enumerate(waves):
+            algo._check_cancelled()
+            sleep(len(wave) * algo._flood_fill_delay_us, unit="us")
+            with algo.lock:
+                if wave_num < len(closed):
+                    Square.set_square_color_by_indices(closed[wave_num], "closed")
+                    Square.set_square_color_by_indices(opened[wave_num], "open")
+
+    # Only the squares on the best path are needed to reconstruct it
+    came_from = {}
+    if dist[end.get_index()] >= 0:
+        path = [Square.graph[index] for index in get_path(came_from_index, end.get_index()).tolist()]
+        for prev_square, square in zip(path, path[1:]):
+            came_from[square] = prev_square
+
+    if draw_best_path:
+        _best_path(algo, came_from, end)
+    return came_from
+
+
 def a_star(algo: AlgoState, start: Square, end: Square, ignore_square: Square, draw_best_path: bool) -> dict:
     """Code for the A* algorithm"""
     # Clear previous and start timer here to include setup of algo into timer
     algo._timer_reset()
     algo._timer_start()
 
-    # Used to determine the order of squares to check. Order of args helper decide the priority.
-    open_set = PriorityQueue()
-    queue_pos = 0
-    open_set.put((0, queue_pos, start))
+    # Used to determine the order of squares to check. Squares are stored by their index in the graph.
+    graph = _get_graph()
+    indptr, indices, walls = _get_adjacency(graph)
+    costs = _get_costs(graph)
+    open_set = algo._frontier_type(len(graph))
+    start_index = _get_index(start)
+    end_pos = end.get_pos()
 
-    # Determine what is the best square to check
-    g_score = {Square.get_square(row, col): float("inf") for row in range(Square.get_num_rows()) for col in range(Square.get_num_cols())}
-    g_score[start] = 0
-    f_score = {Square.get_square(row, col): float("inf") for row in range(Square.get_num_rows()) for col in range(Square.get_num_cols())}
-    f_score[start] = _heuristic(start.get_pos(), end.get_pos())
+    # Every step costs at least the cheapest square, scaling by it keeps the heuristic admissible
+    min_cost = min(costs)
+    open_set.put(start_index, _heuristic(start.get_pos(), end_pos) * min_cost)
+
+    # Determine what is the best square to check. f_score is the priority held by open_set.
+    g_score = [float("inf")] * len(graph)
+    g_score[start_index] = 0
 
     # Keeps track of next square for every square in graph. A linked list basically.
     came_from = {}
@@ -305,10 +473,12 @@ def a_star(algo: AlgoState, start: Square, end: Square, ignore_square: Square, d
     while not open_set.empty():
 
         # Time increments for each square being checked
+        algo._check_cancelled()
         algo._timer_start()
 
         # Gets the square currently being checked
-        curr_square: Square = open_set.get()[2]
+        curr_index = open_set.get()
+        curr_square: Square = graph[curr_index]
 
         # Terminates if found the best path
         if curr_square == end:
@@ -318,19 +488,18 @@ def a_star(algo: AlgoState, start: Square, end: Square, ignore_square: Square, d
 
         # Decides the order of neighbours to check
         nei: Square
-        for nei in curr_square.get_neighbours():
+        for nei_index in indices[indptr[curr_index]:indptr[curr_index + 1]]:
             # Ignore walls
-            if nei.is_wall():
+            if walls[nei_index]:
                 continue
 
             # Only check square if not already checked.
-            temp_g_score = g_score[curr_square] + 1
-            if temp_g_score < g_score[nei]:
+            nei = graph[nei_index]
+            temp_g_score = g_score[curr_index] + costs[nei_index]
+            if temp_g_score < g_score[nei_index]:
                 came_from[nei] = curr_square
-                g_score[nei] = temp_g_score
-                f_score[nei] = temp_g_score + _heuristic(nei.get_pos(), end.get_pos())
-                queue_pos += 1
-                open_set.put((f_score[nei], queue_pos, nei))
+                g_score[nei_index] = temp_g_score
+                open_set.put(nei_index, temp_g_score + _heuristic(nei.get_pos(), end_pos) * min_cost)
 
                 # Set nei to open under certain conditions
                 if not nei.is_closed() and nei != end and nei != ignore_square:
@@ -355,25 +524,141 @@ def _heuristic(pos1: tuple, pos2: tuple) -> int:
     return abs(x1 - x2) + abs(y1 - y2)
 
 
+def jps(algo: AlgoState, start: Square, end: Square, ignore_square: Square, draw_best_path: bool) -> dict:
+    """Code for jump point search. A* that only expands the squares where the best path can turn."""
+    # Jump points rely on every square costing the same
+    graph = _get_graph()
+    costs = _get_costs(graph)
+    if min(costs) != max(costs):
+        return a_star(algo, start, end, ignore_square, draw_best_path)
+
+    # Clear previous and start timer here to include setup of algo into timer
+    algo._timer_reset()
+    algo._timer_start()
+
+    # Only jump points are put in the open set. Squares are stored by their index in the graph.
+    walls = _get_walls(graph)
+    num_rows, num_cols = Square.get_num_rows(), Square.get_num_cols()
+    open_set = algo._frontier_type(len(graph))
+    start_index = _get_index(start)
+    end_index = _get_index(end)
+    end_pos = end.get_pos()
+    open_set.put(start_index, _heuristic(start.get_pos(), end_pos))
+
+    # Determine what is the best square to check. f_score is the priority held by open_set.
+    g_score = {start_index: 0}
+
+    # Keeps track of the previous jump point of every jump point
+    came_from_index = {}
+
+    # End timer here to start it again in loop
+    algo._timer_end(count=False)
+
+    # Continues until every jump point has been checked or best path found
+    while not open_set.empty():
+
+        # Time increments for each jump point being checked
+        algo._check_cancelled()
+        algo._timer_start()
+
+        # Gets the jump point currently being checked
+        curr_index = open_set.get()
+        curr_square: Square = graph[curr_index]
+
+        # Terminates if found the best path. Fills in the squares between jump points to draw it.
+        if curr_index == end_index:
+            jump_points = [curr_index]
+            while jump_points[-1] in came_from_index:
+                jump_points.append(came_from_index[jump_points[-1]])
+            path = [graph[index] for index in fill_path(jump_points[::-1], num_cols)]
+            came_from = {square: prev_square for prev_square, square in zip(path, path[1:])}
+            if draw_best_path:
+                _best_path(algo, came_from, end)
+            return came_from
+
+        # Jumps along each direction that isn't pruned
+        nei: Square
+        curr_pos = curr_square.get_pos()
+        for nei_index in get_successors(walls, num_rows, num_cols, curr_index, came_from_index.get(curr_index, -1), end_index):
+            # Jump points are in a straight line so the distance is the number of squares between
+            nei = graph[nei_index]
+            nei_pos = nei.get_pos()
+            temp_g_score = g_score[curr_index] + _heuristic(curr_pos, nei_pos)
+            if temp_g_score < g_score.get(nei_index, temp_g_score + 1):
+                came_from_index[nei_index] = curr_index
+                g_score[nei_index] = temp_g_score
+                open_set.put(nei_index, temp_g_score + _heuristic(nei_pos, end_pos))
+
+                # Set nei to open under certain conditions
+                if not nei.is_closed() and nei != end and nei != ignore_square:
+                    with algo.lock:
+                        nei.set_open()
+
+        # Sets square to closed after finished checking
+        if curr_square != start and curr_square != ignore_square:
+            with algo.lock:
+                curr_square.set_closed()
+
+        # End timer to increment count
+        algo._timer_end()
+
+    return {}
+
+
+def hpa(algo: AlgoState, start: Square, end: Square, ignore_square: Square, draw_best_path: bool) -> dict:
+    """Code for hierarchical A* (HPA*). Searches between clusters kept on algo, then fills in the path within them.
+    Wall edits since the last run only rebuild the clusters they are in. Paths can be longer than the shortest.
+    """
+    # Distances within clusters assume every step costs the same
+    graph = _get_graph()
+    costs = _get_costs(graph)
+    if min(costs) != max(costs):
+        return a_star(algo, start, end, ignore_square, draw_best_path)
+
+    # Clear previous and start timer here to include updating the clusters into timer
+    algo._timer_reset()
+    algo._timer_start()
+
+    walls = np.frombuffer(_get_walls(graph), dtype=np.bool_).reshape(Square.get_num_rows(), Square.get_num_cols())
+    if algo._hierarchical is None or not algo._hierarchical.fits(walls):
+        algo._hierarchical = HierarchicalPlanner(walls, check_cancelled=algo._check_cancelled)
+    path = algo._hierarchical.get_path(walls, _get_index(start), _get_index(end), algo._check_cancelled)
+    path = [graph[index] for index in path]
+
+    # Only the abstract nodes are searched, one per transition between clusters
+    algo.timer_count = algo._hierarchical.expanded
+    algo._timer_end(count=False)
+
+    came_from = {square: prev_square for prev_square, square in zip(path, path[1:])}
+    if draw_best_path:
+        _best_path(algo, came_from, end)
+    return came_from
+
+
 def bi_dijkstra(algo: AlgoState, start: Square, end: Square, ignore_square: Square, draw_best_path: bool) -> dict | Square:
     """Code for Bi-directional Dijkstra algorithm. Custom algorithm made by me."""
     # Clear previous and start timer here to include setup of algo into timer
     algo._timer_reset()
     algo._timer_start()
 
-    # Used to determine the order of squares to check. Order of args helper decide the priority.
-    open_set = PriorityQueue()
-    queue_pos = 0
+    # Used to determine the order of squares to check. Squares are stored by their index in the graph.
+    graph = _get_graph()
+    indptr, indices, walls = _get_adjacency(graph)
+    open_set = algo._frontier_type(len(graph))
+    start_index = _get_index(start)
+    end_index = _get_index(end)
+    open_set.put(start_index, 0)
+    open_set.put(end_index, 0)
+
+    # Which swarm last reached each square
     FIRST_SWARM = "FIRST_SWARM"
-    open_set.put((0, queue_pos, start, FIRST_SWARM))
-    queue_pos += 1
     SECOND_SWARM = "SECOND_SWARM"
-    open_set.put((0, queue_pos, end, SECOND_SWARM))
+    swarm_of = {start_index: FIRST_SWARM, end_index: SECOND_SWARM}
 
     # Determine what is the best square to check
-    g_score = {Square.get_square(row, col): float("inf") for row in range(Square.get_num_rows()) for col in range(Square.get_num_cols())}
-    g_score[start] = 0
-    g_score[end] = 0
+    g_score = [float("inf")] * len(graph)
+    g_score[start_index] = 0
+    g_score[end_index] = 0
 
     # Keeps track of next square for every square in graph. A linked list basically.
     came_from = {}
@@ -398,26 +683,28 @@ def bi_dijkstra(algo: AlgoState, start: Square, end: Square, ignore_square: Squa
             return came_from, first_swarm_meet_square, second_swarm_meet_square
 
         # Time increments for each square being checked
+        algo._check_cancelled()
         algo._timer_start()
         
         # Gets the square currently being checked.
-        temp = open_set.get()
-        curr_square: Square = temp[2]
-        swarm = temp[3]
+        curr_index = open_set.get()
+        curr_square: Square = graph[curr_index]
+        swarm = swarm_of[curr_index]
 
         # Decides the order of neighbours to check for both swarms.
-        for nei in curr_square.get_neighbours():
+        for nei_index in indices[indptr[curr_index]:indptr[curr_index + 1]]:
             # Ignore walls
-            if nei.is_wall():
+            if walls[nei_index]:
                 continue
 
             # Only check square if not already checked.
-            temp_g_score = g_score[curr_square] + 1
-            if temp_g_score < g_score[nei]:
+            nei: Square = graph[nei_index]
+            temp_g_score = g_score[curr_index] + 1
+            if temp_g_score < g_score[nei_index]:
                 came_from[nei] = curr_square
-                g_score[nei] = temp_g_score
-                queue_pos += 1
-                open_set.put((g_score[nei], queue_pos, nei, swarm))
+                g_score[nei_index] = temp_g_score
+                swarm_of[nei_index] = swarm
+                open_set.put(nei_index, temp_g_score)
 
                 # Set nei to open under certain conditions
                 if not nei.is_closed() and nei != ignore_square:
@@ -461,6 +748,133 @@ def _best_path_bi_dijkstra(algo: AlgoState, came_from: dict,
     _best_path(algo, came_from, second_swarm_meet_square, reverse=True)
 
 
+def bi_a_star(algo: AlgoState, start: Square, end: Square, ignore_square: Square, draw_best_path: bool) -> dict:
+    """Code for Bi-directional A*, the NBA* variant.
+    Swarms search from start and backwards from end, and squares that can't lead to a
+    shorter path than the best one found so far are dropped. Stops when either swarm runs out.
+    """
+    # Clear previous and start timer here to include setup of algo into timer
+    algo._timer_reset()
+    algo._timer_start()
+
+    # Used to determine the order of squares to check. Squares are stored by their index in the graph.
+    graph = _get_graph()
+    indptr, indices, walls = _get_adjacency(graph)
+    costs = _get_costs(graph)
+    min_cost = min(costs)
+    start_index = _get_index(start)
+    end_index = _get_index(end)
+
+    # Ties on f_score go to the square closer to its target so the swarms meet early and pruning starts.
+    # Priorities are f_score * tie_scale + h_score, too spread out for buckets so a heap is always used.
+    tie_scale = (Square.get_num_rows() + Square.get_num_cols()) * max(costs) + 1
+
+    # Everything is kept per swarm. The first swarm heads for end, the second for start.
+    FIRST_SWARM, SECOND_SWARM = 0, 1
+    targets = (end.get_pos(), start.get_pos())
+    open_sets = (HeapFrontier(len(graph)), HeapFrontier(len(graph)))
+    g_scores = ([float("inf")] * len(graph), [float("inf")] * len(graph))
+    g_scores[FIRST_SWARM][start_index] = 0
+    g_scores[SECOND_SWARM][end_index] = 0
+    h_score = _heuristic(start.get_pos(), end.get_pos()) * min_cost
+    open_sets[FIRST_SWARM].put(start_index, h_score * tie_scale + h_score)
+    open_sets[SECOND_SWARM].put(end_index, h_score * tie_scale + h_score)
+    lowest_f_scores = [h_score, h_score]
+
+    # Keeps track of the previous square of each swarm, by index
+    came_from_index = ({}, {})
+
+    # Squares either swarm is done with, and the shortest path through a square both swarms reached
+    closed = bytearray(len(graph))
+    best_length = float("inf")
+    meet_index = None
+
+    # End timer here to start it again in loop
+    algo._timer_end(count=False)
+
+    # Continues until a swarm has no squares left, the best path is known by then
+    swarm = SECOND_SWARM
+    while not open_sets[FIRST_SWARM].empty() and not open_sets[SECOND_SWARM].empty():
+
+        # Time increments for each square being checked
+        algo._check_cancelled()
+        algo._timer_start()
+
+        # Swarms take turns
+        swarm, other_swarm = 1 - swarm, swarm
+        open_set, g_score = open_sets[swarm], g_scores[swarm]
+
+        # Gets the square currently being checked. Skipped if the other swarm is done with it.
+        curr_index = open_set.get()
+        curr_square: Square = graph[curr_index]
+        if not closed[curr_index]:
+            closed[curr_index] = True
+            curr_pos = curr_square.get_pos()
+
+            # Only spread from squares that could still be on a shorter path
+            f_score = g_score[curr_index] + _heuristic(curr_pos, targets[swarm]) * min_cost
+            other_bound = (g_score[curr_index] + lowest_f_scores[other_swarm]
+                - _heuristic(curr_pos, targets[other_swarm]) * min_cost)
+            if f_score < best_length and other_bound < best_length:
+                for nei_index in indices[indptr[curr_index]:indptr[curr_index + 1]]:
+                    # Ignore walls and squares either swarm is done with
+                    if walls[nei_index] or closed[nei_index]:
+                        continue
+
+                    # Second swarm walks edges backwards so pays for the square it leaves
+                    nei: Square = graph[nei_index]
+                    step_cost = costs[nei_index] if swarm == FIRST_SWARM else costs[curr_index]
+                    temp_g_score = g_score[curr_index] + step_cost
+                    if temp_g_score < g_score[nei_index]:
+                        came_from_index[swarm][nei_index] = curr_index
+                        g_score[nei_index] = temp_g_score
+                        h_score = _heuristic(nei.get_pos(), targets[swarm]) * min_cost
+                        open_set.put(nei_index, (temp_g_score + h_score) * tie_scale + h_score)
+
+                        # Swarms meet wherever both have reached
+                        if temp_g_score + g_scores[other_swarm][nei_index] < best_length:
+                            best_length = temp_g_score + g_scores[other_swarm][nei_index]
+                            meet_index = nei_index
+
+                        # Set nei to open under certain conditions
+                        if not nei.is_closed() and nei != start and nei != end and nei != ignore_square:
+                            with algo.lock:
+                                if swarm == FIRST_SWARM:
+                                    nei.set_open()
+                                else:
+                                    nei.set_open2()
+
+            # Sets square to closed after finished checking
+            if curr_square != start and curr_square != end and curr_square != ignore_square:
+                with algo.lock:
+                    if swarm == FIRST_SWARM:
+                        curr_square.set_closed()
+                    else:
+                        curr_square.set_closed2()
+
+        if not open_set.empty():
+            lowest_f_scores[swarm] = open_set.peek_priority() // tie_scale
+
+        # End timer to increment count
+        algo._timer_end()
+
+    # Joins both halves at the meet square, only the squares on the best path are needed to draw it
+    came_from = {}
+    if meet_index is not None:
+        path = [meet_index]
+        while path[-1] in came_from_index[FIRST_SWARM]:
+            path.append(came_from_index[FIRST_SWARM][path[-1]])
+        path.reverse()
+        while path[-1] in came_from_index[SECOND_SWARM]:
+            path.append(came_from_index[SECOND_SWARM][path[-1]])
+        for prev_index, index in zip(path, path[1:]):
+            came_from[graph[index]] = graph[prev_index]
+
+    if draw_best_path:
+        _best_path(algo, came_from, end)
+    return came_from
+
+
 def _best_path(algo: AlgoState, came_from: dict, curr_square: Square, reverse: bool = False) -> None:
     """Main algo for reconstructing path"""
     # Update info
@@ -476,16 +890,60 @@ def _best_path(algo: AlgoState, came_from: dict, curr_square: Square, reverse: b
     square: Square
     if reverse:
         for square in path[:-1]:
+            algo._check_cancelled()
             sleep(algo._best_path_delay_ms, unit="ms")
             with algo.lock:
                 square.set_path()
     else:
         for square in path[len(path) - 2 :: -1]:
+            algo._check_cancelled()
             sleep(algo._best_path_delay_ms, unit="ms")
             with algo.lock:
                 square.set_path()
 
 
+def replan(algo: AlgoState, start: Square, end: Square) -> None:
+    """Draws the best path again after an edit without searching from scratch.
+    Moving start walks the distance field of end. Editing walls repairs the last search with D* Lite.
+    Squares the repair expanded are drawn closed, walking an existing field expands none.
+    """
+    algo._timer_reset()
+    algo._timer_start()
+    walls, costs = Square.get_walls(), Square.get_costs()
+    walls_edited = algo._rerun_walls is not None and algo._rerun_walls != Square.walls
+    algo._rerun_walls = bytes(Square.walls)
+
+    field = algo._distance_field
+    if field is not None and field.fits(walls, costs, end.get_index()):
+        path = field.get_path(start.get_index())
+        expanded = []
+        algo.timer_count = len(path)
+    elif walls_edited and not Square.has_highways():
+        # D* Lite assumes every edge costs 1
+        settled = []
+        if algo._planner is None or not algo._planner.fits(walls, end.get_index()):
+            algo._planner = IncrementalPlanner(walls, end.get_index())
+            settled = algo._planner.get_settled()  # Flooded once to start from
+        path = algo._planner.get_path(walls, start.get_index())
+        expanded = settled + algo._planner.expanded_squares
+        algo.timer_count = len(settled) + algo._planner.expanded
+    else:
+        # End moved, a weighted graph was edited, or start is dragged again after an edit
+        algo._distance_field = DistanceField(walls, costs, end.get_index())
+        path = algo._distance_field.get_path(start.get_index())
+        expanded = algo._distance_field.get_settled().tolist()
+        algo.timer_count = len(expanded)
+    algo._timer_end(count=False)
+
+    with algo.lock:
+        for index in expanded:
+            square: Square = Square.graph[index]
+            if square != start and square != end and not square.is_wall():
+                square.set_closed()
+        for index in path[1:-1]:
+            Square.graph[index].set_path()
+
+
 def start_mid_end(algo: AlgoState, start: Square, mid: Square, end: Square) -> None:
     """Used if algos need to reach mid square first"""
     # Selects the correct algo to use
@@ -505,6 +963,42 @@ def start_mid_end(algo: AlgoState, start: Square, mid: Square, end: Square) -> N
         start_to_mid = a_star(algo, start, mid, end, draw_best_path=False)
         mid_to_end = a_star(algo, mid, end, start, draw_best_path=False)
 
+        # Fixes squares disappearing when dragging
+        with algo.lock:
+            start.set_start()
+            mid.set_mid()
+            end.set_end()
+
+        _best_path(algo, start_to_mid, mid)
+        _best_path(algo, mid_to_end, end)
+    elif algo.check_algo() == algo.ALGO_JPS:
+        start_to_mid = jps(algo, start, mid, end, draw_best_path=False)
+        mid_to_end = jps(algo, mid, end, start, draw_best_path=False)
+
+        # Fixes squares disappearing when dragging
+        with algo.lock:
+            start.set_start()
+            mid.set_mid()
+            end.set_end()
+
+        _best_path(algo, start_to_mid, mid)
+        _best_path(algo, mid_to_end, end)
+    elif algo.check_algo() == algo.ALGO_HPA:
+        start_to_mid = hpa(algo, start, mid, end, draw_best_path=False)
+        mid_to_end = hpa(algo, mid, end, start, draw_best_path=False)
+
+        # Fixes squares disappearing when dragging
+        with algo.lock:
+            start.set_start()
+            mid.set_mid()
+            end.set_end()
+
+        _best_path(algo, start_to_mid, mid)
+        _best_path(algo, mid_to_end, end)
+    elif algo.check_algo() == algo.ALGO_BI_A_STAR:
+        start_to_mid = bi_a_star(algo, start, mid, end, draw_best_path=False)
+        mid_to_end = bi_a_star(algo, mid, end, start, draw_best_path=False)
+
         # Fixes squares disappearing when dragging
         with algo.lock:
             start.set_start()
@@ -565,6 +1059,7 @@ def recursive_maze(algo: AlgoState, chamber: tuple = None,
     # Draws vertical maze line within chamber
     if chamber_width >= division_limit:
         for y in range(chamber_height):
+            algo._check_cancelled()
             algo._timer_start()
             square: Square = Square.get_square(chamber_left + x_divide, chamber_top + y)
             with algo.lock:
@@ -575,6 +1070,7 @@ def recursive_maze(algo: AlgoState, chamber: tuple = None,
     # Draws horizontal maze line within chamber
     if chamber_height >= division_limit:
         for x in range(chamber_width):
+            algo._check_cancelled()
             algo._timer_start()
             square: Square = Square.get_square(chamber_left + x, chamber_top + y_divide)
             with algo.lock:
@@ -675,6 +1171,50 @@ def recursive_maze(algo: AlgoState, chamber: tuple = None,
         recursive_maze(algo, chamber)
 
 
+def _get_graph() -> list:
+    """Returns every square in row-major order so they can be looked up by index"""
+    if use_square_h:
+        return [Square.get_square(row, col) for row in range(Square.get_num_rows()) for col in range(Square.get_num_cols())]
+    return Square.graph
+
+
+def _get_adjacency(graph: list) -> tuple[list[int], list[int], bytearray]:
+    """Returns the CSR neighbours (indptr, indices) of the graph and its wall mask"""
+    if not use_square_h:
+        return *Square.get_adjacency_lists(), Square.walls
+
+    # The C++ Square has no bulk getters
+    indptr = [0]
+    indices = []
+    for square in graph:
+        indices.extend(_get_index(nei) for nei in square.get_neighbours())
+        indptr.append(len(indices))
+    return indptr, indices, _get_walls(graph)
+
+
+def _get_walls(graph: list) -> bytearray:
+    """Returns the wall mask of the graph"""
+    if not use_square_h:
+        return Square.walls
+
+    # Walls can't change during a search so a snapshot is fine
+    return bytearray(square.is_wall() for square in graph)
+
+
+def _get_costs(graph: list) -> bytearray:
+    """Returns the cost of stepping onto each square of the graph"""
+    if not use_square_h:
+        return Square.costs
+
+    return bytearray(square.get_cost() for square in graph)
+
+
+def _get_index(square: Square) -> int:
+    """Returns the index of the square in the row-major graph"""
+    row, col = square.get_pos()
+    return row * Square.get_num_cols() + col
+
+
 def _get_random_sample(population: tuple, k: int) -> list:
     """Returns a k length list of unique elements from population"""
     return random.sample(population, k)
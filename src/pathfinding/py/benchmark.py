@@ -0,0 +1,321 @@
+"""Reproducible benchmarks of the pathfinding and maze algorithms without the GUI.
+The backend from cpp_or_py is chosen on import, so each one runs in its own process
+with PATHFINDING_INCLUDE set. Every size gets the same seeded maze on every backend.
+Results are JSON and can be checked against a stored baseline to catch regressions.
+Reports also hold the jitter of the sleep that paces the visualizations on this machine.
+The python algorithms can run on each open set in frontier.py to compare them.
+"""
+
+
+import os
+import sys
+import json
+import random
+import argparse
+import subprocess
+import tracemalloc
+from dataclasses import dataclass, asdict
+from time import perf_counter_ns, sleep as os_sleep
+from lib.timer import calibrate_sleep
+
+try:
+    import resource  # Not on Windows
+except ImportError:
+    resource = None
+
+
+BACKENDS = (".py", "square.h", "algorithms.h")
+ALGOS = ("dijkstra", "a_star", "bi_dijkstra", "start_mid_end", "recursive_maze")
+SIZES = {"small": 22, "medium": 46, "large": 95, "max": 400}  # Same as LogicState.GRAPH_*
+FRONTIERS = ("heap", "bucket")  # HeapFrontier and BucketFrontier. The C++ algorithms have their own.
+MAZE_SIZES = ("small", "medium", "large")  # Recursive division breaks on max, the visualizer shrinks to large first
+BASELINE_PATH = os.path.join("lib", "benchmark_baseline.json")
+
+_GRAPH_WIDTH = 800  # Only sets the pixel size of squares, which nothing here draws
+_PERCENTILES = (50, 90, 99)
+
+
+@dataclass(slots=True)
+class CaseResult:
+    """Stats of one algorithm on one graph size with one backend"""
+
+    backend: str
+    size: str
+    algo: str
+    frontier: str | None  # Open set of the python algorithms. None for algorithms.h.
+    repeats: int
+    nodes: int  # Squares checked, as counted by the algorithm timer. Both legs added for start_mid_end.
+    wall_time_ns: dict[str, int]  # p50, p90, p99, min and max over the repeats
+    nodes_per_sec: float  # From the median wall time
+    peak_python_bytes: int  # Peak python allocations over one extra run. C++ allocations aren't seen.
+    max_rss_bytes: int | None  # Peak memory of the whole worker process so far. None where unsupported.
+
+
+def run(backends=BACKENDS, sizes=tuple(SIZES), algos=ALGOS, repeats: int = 5, seed: int = 0,
+    frontiers=("heap",)) -> dict:
+    """Runs every case, one process per backend. Backends that fail to import are listed under errors."""
+    report = {"seed": seed, "repeats": repeats, "results": [], "errors": {}}
+    report["sleep_calibration"] = asdict(calibrate_sleep())  # Paces visualizations, shown for comparing machines
+    spec = json.dumps({"sizes": list(sizes), "algos": list(algos), "repeats": repeats, "seed": seed,
+        "frontiers": list(frontiers)})
+    for backend in backends:
+        process = subprocess.run(
+            [sys.executable, "-m", "src.pathfinding.py.benchmark", "--worker"],
+            input=spec, capture_output=True, text=True, env={**os.environ, "PATHFINDING_INCLUDE": backend}
+        )
+        if process.returncode != 0:
+            report["errors"][backend] = process.stderr.strip().splitlines()[-1] if process.stderr.strip() else "Failed"
+            continue
+        report["results"].extend(json.loads(process.stdout))
+    return report
+
+
+def compare(report: dict, baseline: dict, tolerance: float = 0.25) -> tuple[list[str], list[str]]:
+    """Returns (regressions, improvements) of the median wall time against the baseline, as readable lines.
+    Only cases in both are compared. A change counts past tolerance, e.g. 0.25 for 25% slower.
+    """
+    baseline_results = {_get_key(result): result for result in baseline["results"]}
+    regressions, improvements = [], []
+    for result in report["results"]:
+        key = _get_key(result)
+        if key not in baseline_results:
+            continue
+        old = baseline_results[key]["wall_time_ns"]["p50"]
+        new = result["wall_time_ns"]["p50"]
+        line = f"{key}: {old / 10**6:.3f}ms -> {new / 10**6:.3f}ms ({new / max(old, 1):.2f}x)"
+        if new > old * (1 + tolerance):
+            regressions.append(line)
+        elif new < old * (1 - tolerance):
+            improvements.append(line)
+    return regressions, improvements
+
+
+def main(argv=None) -> int:
+    """Command line entry. Returns 1 if any case regressed against the baseline."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--backends", nargs="+", default=list(BACKENDS), choices=BACKENDS)
+    parser.add_argument("--sizes", nargs="+", default=list(SIZES), choices=list(SIZES))
+    parser.add_argument("--algos", nargs="+", default=list(ALGOS), choices=ALGOS)
+    parser.add_argument("--frontier", nargs="+", default=["heap"], choices=FRONTIERS,
+        help="Open sets for the python algorithms, each one is a separate case")
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="Write the JSON report here instead of stdout")
+    parser.add_argument("--baseline", default=BASELINE_PATH, help="Report to compare against, if it exists")
+    parser.add_argument("--save-baseline", action="store_true", help="Store this report as the baseline")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="Allowed change in median wall time")
+    parser.add_argument("--worker", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.worker:
+        spec = json.load(sys.stdin)
+        results = _run_cases(spec["sizes"], spec["algos"], spec["repeats"], spec["seed"], spec["frontiers"])
+        json.dump([asdict(result) for result in results], sys.stdout)
+        return 0
+
+    report = run(args.backends, args.sizes, args.algos, args.repeats, args.seed, args.frontier)
+    for backend, error in report["errors"].items():
+        print(f"Skipped {backend}: {error}", file=sys.stderr)
+
+    text = json.dumps(report, indent=4)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as file:
+            file.write(text)
+    else:
+        print(text)
+
+    if args.save_baseline:
+        with open(args.baseline, "w", encoding="utf-8") as file:
+            file.write(text)
+        return 0
+
+    if not os.path.exists(args.baseline):
+        return 0
+    with open(args.baseline, encoding="utf-8") as file:
+        regressions, improvements = compare(report, json.load(file), args.tolerance)
+    for line in improvements:
+        print(f"Faster  {line}", file=sys.stderr)
+    for line in regressions:
+        print(f"SLOWER  {line}", file=sys.stderr)
+    return 1 if regressions else 0
+
+
+def _run_cases(sizes, algos, repeats: int, seed: int, frontiers=("heap",)) -> list[CaseResult]:
+    """Runs in a worker process. Everything backend specific is imported here as the environment picks it."""
+    from src.pathfinding.cpp_or_py import use_square_h, use_algorithms_h
+    if use_algorithms_h:
+        from src.pathfinding.cpp.modules import Square, AlgoState
+    elif use_square_h:
+        from src.pathfinding.cpp.modules import Square
+        from src.pathfinding.py.algorithms import AlgoState
+    else:
+        from src.pathfinding.py.square import Square
+        from src.pathfinding.py.algorithms import AlgoState
+    from src.pathfinding.py import algorithms as py_algorithms
+    from src.pathfinding.py.frontier import HeapFrontier, BucketFrontier
+    from threading import Thread
+
+    backend = ".py"
+    if use_square_h:
+        backend = "square.h"
+    elif use_algorithms_h:
+        backend = "algorithms.h"
+
+    # The C++ algorithms are only reachable through the algo loop, the python ones are called directly
+    algo = AlgoState()
+    if use_algorithms_h:
+        Thread(target=algo.start_loop, daemon=True).start()
+    algo_ids = {
+        "dijkstra": algo.ALGO_DIJKSTRA,
+        "a_star": algo.ALGO_A_STAR,
+        "bi_dijkstra": algo.ALGO_BI_DIJKSTRA,
+        "start_mid_end": algo.ALGO_A_STAR
+    }
+
+    def run_once(algo_name: str, start, mid, end) -> None:
+        """Runs one algorithm to completion, best path included but without delays"""
+        if algo_name == "recursive_maze":
+            Square.reset_all_squares()
+            algo.set_recursive_maze_delay(0)
+            if use_algorithms_h:
+                submit(algo.PHASE_MAZE, algo.ALGO_RECURSIVE_MAZE)
+            else:
+                py_algorithms.recursive_maze(algo)
+            return
+
+        Square.reset_algo_squares()  # Walls stay
+        algo.set_best_path_delay(0)
+        algo.set_flood_fill_delay(0)
+        if use_algorithms_h:
+            algo.run_options(start, mid if algo_name == "start_mid_end" else Square.get_null_square(), end,
+                Square.get_null_square())
+            submit(algo.PHASE_ALGO, algo_ids[algo_name])
+        elif algo_name == "start_mid_end":
+            algo._set_algo(algo_ids[algo_name])
+            py_algorithms.start_mid_end(algo, start, mid, end)
+        else:
+            getattr(py_algorithms, algo_name)(algo, start, end, Square.get_null_square(), draw_best_path=True)
+
+    def count_legs(start, mid, end) -> int:
+        """Squares checked by start_mid_end. Each leg restarts the count, so they run apart and are added."""
+        nodes = 0
+        for leg_start, leg_end, ignore_square in ((start, mid, end), (mid, end, start)):
+            Square.reset_algo_squares()
+            algo.set_best_path_delay(0)
+            algo.set_flood_fill_delay(0)
+            if use_algorithms_h:
+                algo.run_options(leg_start, Square.get_null_square(), leg_end, ignore_square)
+                submit(algo.PHASE_ALGO, algo_ids["start_mid_end"])
+            else:
+                py_algorithms.a_star(algo, leg_start, leg_end, ignore_square, draw_best_path=False)
+            nodes += algo.timer_count
+        return nodes
+
+    frontier_types = {"heap": HeapFrontier, "bucket": BucketFrontier}
+    if use_algorithms_h:
+        frontiers = (None,)
+
+    def submit(phase: int, algo_id: int) -> None:
+        """Starts a job on the C++ algo loop and waits for it"""
+        algo.run(phase, algo_id)
+        while not algo.check_finished():
+            os_sleep(0.0001)
+
+    results = []
+    for size in sizes:
+        walls = _get_walls(py_algorithms, size, seed)
+        positions = _get_start_mid_end(walls, SIZES[size])
+        for algo_name in algos:
+            if algo_name == "recursive_maze" and size not in MAZE_SIZES:
+                continue
+
+            # Mazes don't use an open set
+            for frontier in (None,) if algo_name == "recursive_maze" else frontiers:
+                if frontier is not None:
+                    algo.set_frontier_type(frontier_types[frontier])
+
+                # A new graph for every algorithm as recursive_maze clears the walls
+                Square.update_num_rows_cols(SIZES[size])
+                Square.init(_GRAPH_WIDTH)
+                for row, col in walls:
+                    Square.get_square(row, col).set_wall()
+                start, mid, end = (Square.get_square(*pos) for pos in positions)
+
+                times = []
+                for _ in range(repeats):
+                    time_start = perf_counter_ns()
+                    run_once(algo_name, start, mid, end)
+                    times.append(perf_counter_ns() - time_start)
+                nodes = count_legs(start, mid, end) if algo_name == "start_mid_end" else algo.timer_count
+
+                # Tracing slows the run down too much to time, so memory gets a run of its own
+                tracemalloc.start()
+                run_once(algo_name, start, mid, end)
+                peak_python_bytes = tracemalloc.get_traced_memory()[1]
+                tracemalloc.stop()
+
+                times.sort()
+                wall_time_ns = {f"p{percentile}": _get_percentile(times, percentile) for percentile in _PERCENTILES}
+                wall_time_ns["min"], wall_time_ns["max"] = times[0], times[-1]
+                results.append(CaseResult(
+                    backend, size, algo_name, frontier, repeats, nodes, wall_time_ns,
+                    nodes / max(wall_time_ns["p50"], 1) * 10**9, peak_python_bytes, _get_max_rss_bytes()
+                ))
+    return results
+
+
+def _get_walls(py_algorithms, size: str, seed: int) -> list[tuple[int, int]]:
+    """Walls of a recursive maze, or a quarter of squares at random past MAZE_SIZES. The same for a seed on every backend.
+    Mazes are always made by the python recursive_maze on the Square it uses, as only python's random can be seeded.
+    """
+    random.seed(seed)
+    num_rows_cols = SIZES[size]
+    if size not in MAZE_SIZES:
+        return sorted(random.sample([(row, col) for row in range(num_rows_cols) for col in range(num_rows_cols)],
+            num_rows_cols**2 // 4))
+
+    Square = py_algorithms.Square
+    Square.update_num_rows_cols(num_rows_cols)
+    Square.init(_GRAPH_WIDTH)
+    maze_algo = py_algorithms.AlgoState()
+    maze_algo.set_recursive_maze_delay(0)
+    py_algorithms.recursive_maze(maze_algo)
+    return sorted(tuple(square.get_pos()) for square in Square.get_all_wall_squares())
+
+
+def _get_start_mid_end(walls: list[tuple[int, int]], num_rows_cols: int) -> tuple[tuple[int, int], ...]:
+    """Free squares closest to the top left corner, the center and the bottom right corner"""
+    wall_set = set(walls)
+    free = [(row, col) for row in range(num_rows_cols) for col in range(num_rows_cols) if (row, col) not in wall_set]
+    center = num_rows_cols // 2
+    return (
+        free[0],
+        min(free, key=lambda pos: abs(pos[0] - center) + abs(pos[1] - center)),
+        free[-1]
+    )
+
+
+def _get_percentile(sorted_values: list[int], percentile: int) -> int:
+    """Nearest rank percentile"""
+    rank = -(-percentile * len(sorted_values) // 100)
+    return sorted_values[max(rank, 1) - 1]
+
+
+def _get_max_rss_bytes() -> int | None:
+    """Peak resident memory of this process"""
+    if resource is None:
+        return None
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return max_rss if sys.platform == "darwin" else max_rss * 1024  # Bytes on macOS, KiB elsewhere
+
+
+def _get_key(result: dict) -> str:
+    """Identifies a case across reports as backend/size/algo, with /frontier added if it isn't the default heap"""
+    key = f"{result['backend']}/{result['size']}/{result['algo']}"
+    if result.get("frontier") not in (None, "heap"):
+        key += f"/{result['frontier']}"
+    return key
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,95 @@
+"""Distance of every square to a fixed end.
+Built once with a vectorized dial's algorithm running backwards from end, then
+any start is answered by walking downhill in O(path length). Costs are those of
+Square.costs, the cost of stepping onto a square. Works on flat row-major indices like flood_fill.
+"""
+
+
+import numpy as np
+
+
+# Larger than any distance on a graph
+_INF = np.iinfo(np.int64).max
+
+
+class DistanceField:
+    """Answers paths to end from any start until the walls, costs or end change"""
+
+    __slots__ = ("num_rows", "num_cols", "end", "dist", "_walls", "_costs")
+
+    def __init__(self, walls: np.ndarray, costs: np.ndarray, end: int) -> None:
+        self.num_rows, self.num_cols = walls.shape
+        self.end = end
+        self._walls = walls.ravel().copy()
+        self._costs = costs.ravel().copy()
+        self.dist: np.ndarray = _get_distances(self._walls, self._costs, self.num_rows, self.num_cols, end)
+
+    def fits(self, walls: np.ndarray, costs: np.ndarray, end: int) -> bool:
+        """Whether the field still holds for this graph and end"""
+        return (end == self.end and walls.shape == (self.num_rows, self.num_cols)
+                and np.array_equal(walls.ravel(), self._walls) and np.array_equal(costs.ravel(), self._costs))
+
+    def get_settled(self) -> np.ndarray:
+        """Indices of every square given a distance, which is every square that can reach end"""
+        return np.flatnonzero(self.dist != _INF)
+
+    def get_path(self, start: int) -> list[int]:
+        """Indices from start to end. Empty if unreachable."""
+        dist = self.dist
+        if self._walls[start] or dist[start] == _INF:
+            return []
+
+        # Each step goes to the neighbour it is cheapest to reach end through, in Square neighbour order on ties
+        num_cols, last_col, last_row = self.num_cols, self.num_cols - 1, self.num_rows - 1
+        costs = self._costs
+        path = [start]
+        curr = start
+        while curr != self.end:
+            row, col = divmod(curr, num_cols)
+            best, best_dist = -1, _INF
+            for nei, inside in ((curr - 1, col > 0), (curr - num_cols, row > 0),
+                                (curr + 1, col < last_col), (curr + num_cols, row < last_row)):
+                if inside and dist[nei] != _INF and int(costs[nei]) + int(dist[nei]) < best_dist:
+                    best, best_dist = nei, int(costs[nei]) + int(dist[nei])
+            curr = best
+            path.append(curr)
+        return path
+
+
+def _get_distances(walls: np.ndarray, costs: np.ndarray, num_rows: int, num_cols: int, end: int) -> np.ndarray:
+    """Cheapest cost from every square to end, _INF if unreachable.
+    Squares are settled one distance at a time like flood_fill, with a bucket per pending distance.
+    """
+    size = num_rows * num_cols
+    cols = np.tile(np.arange(num_cols), num_rows)
+    rows = np.repeat(np.arange(num_rows), num_cols)
+    can_move = (cols > 0, rows > 0, cols < num_cols - 1, rows < num_rows - 1)
+    offsets = (-1, -num_cols, 1, num_cols)
+    free = ~walls.astype(np.bool_)
+    costs = costs.astype(np.int64)
+
+    dist = np.full(size, _INF, dtype=np.int64)
+    if not free[end]:
+        return dist
+    dist[end] = 0
+    buckets: dict[int, list[np.ndarray]] = {0: [np.array([end])]}
+
+    while buckets:
+        curr_dist = min(buckets)
+        frontier = np.unique(np.concatenate(buckets.pop(curr_dist)))
+        frontier = frontier[dist[frontier] == curr_dist]  # Skip squares since reached more cheaply
+        if not frontier.size:
+            continue
+
+        # Reaching end through a square costs the square's cost on top of its own distance
+        new_dist = curr_dist + costs[frontier]
+        for in_graph, offset in zip(can_move, offsets):
+            movable = in_graph[frontier]
+            neighbours = frontier[movable] + offset
+            neighbour_dist = new_dist[movable]
+            better = free[neighbours] & (neighbour_dist < dist[neighbours])
+            neighbours, neighbour_dist = neighbours[better], neighbour_dist[better]
+            np.minimum.at(dist, neighbours, neighbour_dist)
+            for value in np.unique(neighbour_dist).tolist():
+                buckets.setdefault(value, []).append(neighbours[neighbour_dist == value])
+    return dist
@@ -0,0 +1,112 @@
+"""Vectorized breadth first search over a grid of walls.
+Every edge costs 1, so expanding a whole frontier at a time gives the
+same distances as dijkstra without a priority queue or per square objects.
+Numpy only pays off on wide frontiers. Narrow ones, as in mazes, are expanded
+one square at a time in the same order.
+"""
+
+
+import numpy as np
+
+
+# Offsets are applied in the same order as Square._update_neighbours
+_LEFT, _UP, _RIGHT, _DOWN = range(4)
+
+# Frontiers up to this size are expanded without numpy, whose overhead per wave is larger
+_NARROW_WAVE = 24
+
+
+def flood_fill(walls: np.ndarray, start: int, end: int = -1) -> tuple[np.ndarray, np.ndarray, list[np.ndarray]]:
+    """Expands from start one wave at a time until end is reached or nothing is left.
+    walls is a (num_rows, num_cols) bool array, start and end are flat row-major indices.
+    Returns the distance and predecessor of every square (-1 if unreached),
+    and the flat indices of the squares in each wave for replaying the search.
+    """
+    num_rows, num_cols = walls.shape
+    size = num_rows * num_cols
+
+    # Which squares can step in each direction without leaving the graph
+    cols = np.tile(np.arange(num_cols), num_rows)
+    rows = np.repeat(np.arange(num_rows), num_cols)
+    can_move = (cols > 0, rows > 0, cols < num_cols - 1, rows < num_rows - 1)
+    can_move_bytes = [movable.tobytes() for movable in can_move]  # Faster to index one at a time
+    offsets = (-1, -num_cols, 1, num_cols)
+
+    dist = np.full(size, -1, dtype=np.int32)
+    came_from = np.full(size, -1, dtype=np.int32)
+    visited_bytes = bytearray(walls.tobytes())
+    visited = np.frombuffer(visited_bytes, dtype=np.bool_)  # Same memory, for whole waves at once
+
+    dist[start] = 0
+    visited[start] = True
+    frontier = np.array([start], dtype=np.int32)
+    waves = []
+
+    wave_dist = 0
+    while frontier.size:
+        waves.append(frontier)
+        if end >= 0 and dist[end] >= 0:
+            break
+
+        wave_dist += 1
+        if frontier.size <= _NARROW_WAVE:
+            frontier = _expand_narrow(frontier.tolist(), can_move_bytes, offsets, visited_bytes, dist, came_from,
+                wave_dist)
+            continue
+
+        next_frontier = []
+        for direction in (_LEFT, _UP, _RIGHT, _DOWN):
+            src = frontier[can_move[direction][frontier]]
+            dst = src + offsets[direction]
+            unvisited = ~visited[dst]
+            src, dst = src[unvisited], dst[unvisited]
+
+            # Two squares in the frontier can share a neighbour, first one wins
+            dst, first = np.unique(dst, return_index=True)
+            src = src[first]
+
+            visited[dst] = True
+            dist[dst] = wave_dist
+            came_from[dst] = src
+            next_frontier.append(dst)
+
+        frontier = np.concatenate(next_frontier)
+
+    return dist, came_from, waves
+
+
+def _expand_narrow(frontier: list[int], can_move_bytes: list[bytes], offsets: tuple[int, ...], visited: bytearray,
+    dist: np.ndarray, came_from: np.ndarray, wave_dist: int) -> np.ndarray:
+    """One wave of flood_fill without numpy. Gives the next frontier in the same order as the vectorized wave."""
+    next_frontier = []
+    next_came_from = []
+    for direction in (_LEFT, _UP, _RIGHT, _DOWN):
+        movable, offset = can_move_bytes[direction], offsets[direction]
+        dst_src: dict[int, int] = {}
+        for src in frontier:
+            if movable[src]:
+                dst = src + offset
+                # Two squares in the frontier can share a neighbour, first one wins
+                if not visited[dst] and dst not in dst_src:
+                    dst_src[dst] = src
+        for dst in sorted(dst_src):
+            visited[dst] = True
+            next_frontier.append(dst)
+            next_came_from.append(dst_src[dst])
+
+    next_frontier = np.array(next_frontier, dtype=np.int32)
+    dist[next_frontier] = wave_dist
+    came_from[next_frontier] = next_came_from
+    return next_frontier
+
+
+def get_path(came_from: np.ndarray, end: int) -> np.ndarray:
+    """Follows the predecessors back from end. Returns flat indices from start to end.
+    Only meaningful if end was reached by flood_fill.
+    """
+    path = []
+    curr = end
+    while curr >= 0:
+        path.append(curr)
+        curr = came_from[curr]
+    return np.array(path[::-1], dtype=np.int32)
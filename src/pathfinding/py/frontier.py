@@ -0,0 +1,114 @@
+"""Priority queues for the open set of the pathfinding algorithms.
+Only the algorithm thread touches them so no locking is done, unlike queue.PriorityQueue.
+Squares are stored by their flat row-major index in the graph.
+Instead of decreasing keys, a square is pushed again and stale entries are skipped on get.
+Ties are broken first in first out, same as the queue_pos counter used before.
+"""
+
+
+from collections import deque
+from heapq import heappush, heappop
+
+
+class HeapFrontier:
+    """Binary heap of squares. Each entry is a single int packing priority, insertion order and index."""
+
+    __slots__ = ("_heap", "_priorities", "_closed", "_count", "_index_bits", "_order_bits")
+
+    _ORDER_BITS = 32  # Max number of puts per search
+
+    def __init__(self, size: int) -> None:
+        self._heap: list[int] = []
+        self._priorities = [None] * size  # Latest priority of each square
+        self._closed = bytearray(size)  # Squares already returned by get
+        self._count = 0
+        self._index_bits = max(size - 1, 1).bit_length()
+        self._order_bits = self._index_bits + HeapFrontier._ORDER_BITS
+
+    def put(self, index: int, priority: int) -> None:
+        """Adds a square or lowers its priority. Reopens it if already returned."""
+        self._priorities[index] = priority
+        self._closed[index] = False
+        heappush(self._heap, (priority << self._order_bits) | (self._count << self._index_bits) | index)
+        self._count += 1
+
+    def get(self) -> int:
+        """Removes and returns the square with the lowest priority"""
+        self._skip_stale()
+        index = heappop(self._heap) & ((1 << self._index_bits) - 1)
+        self._closed[index] = True
+        return index
+
+    def peek_priority(self) -> int:
+        """Priority of the square get would return next. The frontier must not be empty."""
+        self._skip_stale()
+        return self._heap[0] >> self._order_bits
+
+    def empty(self) -> bool:
+        """Checks if there are no squares left to get"""
+        self._skip_stale()
+        return not self._heap
+
+    def _skip_stale(self) -> None:
+        """Pops entries of squares that were already returned or have since been put with a lower priority"""
+        heap = self._heap
+        index_mask = (1 << self._index_bits) - 1
+        while heap:
+            entry = heap[0]
+            index = entry & index_mask
+            if not self._closed[index] and entry >> self._order_bits == self._priorities[index]:
+                return
+            heappop(heap)
+
+
+class BucketFrontier:
+    """Dial's algorithm. One bucket per integer priority, scanned upwards.
+    Priorities must be small non-negative ints. Fastest when they never go below the
+    last one returned, which holds for dijkstra and for A* with a consistent heuristic.
+    """
+
+    __slots__ = ("_buckets", "_priorities", "_closed", "_curr")
+
+    def __init__(self, size: int) -> None:
+        self._buckets: list[deque] = []
+        self._priorities = [None] * size  # Latest priority of each square
+        self._closed = bytearray(size)  # Squares already returned by get
+        self._curr = 0  # Lowest bucket that can still hold squares
+
+    def put(self, index: int, priority: int) -> None:
+        """Adds a square or lowers its priority. Reopens it if already returned."""
+        self._priorities[index] = priority
+        self._closed[index] = False
+        while len(self._buckets) <= priority:
+            self._buckets.append(deque())
+        self._buckets[priority].append(index)
+        self._curr = min(self._curr, priority)
+
+    def get(self) -> int:
+        """Removes and returns the square with the lowest priority"""
+        self._skip_stale()
+        index = self._buckets[self._curr].popleft()
+        self._closed[index] = True
+        return index
+
+    def peek_priority(self) -> int:
+        """Priority of the square get would return next. The frontier must not be empty."""
+        self._skip_stale()
+        return self._curr
+
+    def empty(self) -> bool:
+        """Checks if there are no squares left to get"""
+        self._skip_stale()
+        return self._curr >= len(self._buckets)
+
+    def _skip_stale(self) -> None:
+        """Moves to the first bucket with a square that is not closed or superseded"""
+        buckets = self._buckets
+        while self._curr < len(buckets):
+            bucket = buckets[self._curr]
+            while bucket:
+                index = bucket[0]
+                if not self._closed[index] and self._priorities[index] == self._curr:
+                    return
+                bucket.popleft()
+            self._curr += 1
@@ -12,8 +12,12 @@ elif use_square_h:
 else:
     from src.pathfinding.py.square import Square
     from src.pathfinding.py.algorithms import AlgoState
+from src.pathfinding.py.square import Square as PySquare
 from lib.cpp_py_lock import CppPyLock
+from lib.timer import SleepCalibration
+from src.trace import TraceWriter, TracePlayer
 
+import os
 import pygame
 from dataclasses import dataclass
 
@@ -38,6 +42,14 @@ pygame.font.init()
 CENTER_GRAPH = HEIGHT // 2
 CENTER_LEGEND_AREA = HEIGHT + (WINDOW_HEIGHT - HEIGHT) // 2
 
+# Traces store squares by the python Square's state codes. The C++ Square only gives its color, so codes come from that.
+TRACE_PATH = os.path.join("lib", "pathfinding.trace")
+_TRACE_STATES = {color: state for state, color in enumerate(PySquare._STATE_COLORS)}
+_TRACE_SETTERS = (  # Square method for each code. History is never drawn, so never recorded.
+    "reset", "set_open", "set_open2", "set_open3", "set_closed", "set_closed2", "set_closed3",
+    "set_start", "set_mid", "set_end", "set_wall", "set_path"
+)
+
 
 @dataclass(slots=True)
 class GraphState:
@@ -52,6 +64,18 @@ class GraphState:
     img: bytes = None
     visualize_square_history: bool = False
 
+    # Grid lines pre-rendered once per graph size, blitted over squares after they are filled
+    lines_surface: pygame.Surface = None
+    lines_num_rows: int = 0
+
+    # Graphs with at least this many rows are painted from Square.get_colors() in one blit.
+    # Needs the python Square as the C++ one has no bulk getters.
+    SCALE_RENDER_MIN_ROWS: int = 200
+    cells_surface: pygame.Surface = None  # One pixel per square, scaled up onto the graph
+
+    # Records every drawn change to the squares while set. Toggled with 'R'.
+    trace: TraceWriter = None
+
     # These control the speed of the program. The last is used for speeding up certain parts when necessary.
     FPS: int = 60
 
@@ -97,9 +121,11 @@ class VisText:
         "Press 'S', 'M', 'L' - Change graph size", True, LEGEND_COLOR
     )
     legend_dijkstra = FONT.render("Dijkstra - Press 'D'", True, LEGEND_COLOR)
-    legend_a_star = FONT.render("A* - Press 'A'", True, LEGEND_COLOR)
+    legend_a_star = FONT.render(
+        "A* - Press 'A', Jump Point Search - Press 'J', Hierarchical A* - Press 'H'", True, LEGEND_COLOR
+    )
     legend_bi_dijkstra = FONT.render(
-        "Bi-directional Dijkstra - Press 'B'", True, LEGEND_COLOR
+        "Bi-directional Dijkstra - Press 'B', Bi-directional A* - Press 'N'", True, LEGEND_COLOR
     )
     legend_recursive_maze = FONT.render("Generate maze - Press 'G'", True, LEGEND_COLOR)
     legend_instant_recursive_maze = FONT.render(
@@ -111,8 +137,11 @@ class VisText:
     legend_convert_map = FONT.render(
         "Press 'C' to convert location into the graph", True, LEGEND_COLOR
     )
+    legend_replay = FONT.render(
+        "Left/Right - Step, 'SPACE' - Play/Pause, Home/End, Click here - Jump", True, LEGEND_COLOR
+    )
     legend_square_history = FONT.render(
-        "Track changes on graph - Press 'V'", True, LEGEND_COLOR
+        "Track changes on graph - Press 'V', Record - Press 'R'", True, LEGEND_COLOR
     )
     legend_square_history_show = FONT.render(
         "Storing changes for square history... Press 'V' to show", True, VIS_COLOR
@@ -120,9 +149,14 @@ class VisText:
 
     vis_text_dijkstra = FONT.render("Visualizing Dijkstra...", True, VIS_COLOR)
     vis_text_a_star = FONT.render("Visualizing A*...", True, VIS_COLOR)
+    vis_text_jps = FONT.render("Visualizing Jump Point Search...", True, VIS_COLOR)
     vis_text_bi_dijkstra = FONT.render(
         "Visualizing Bi-directional Dijkstra...", True, VIS_COLOR
     )
+    vis_text_hpa = FONT.render("Visualizing Hierarchical A*...", True, VIS_COLOR)
+    vis_text_bi_a_star = FONT.render(
+        "Visualizing Bi-directional A*...", True, VIS_COLOR
+    )
     vis_text_best_path = FONT.render("Laying best path...", True, VIS_COLOR)
     vis_text_recursive_maze = FONT.render(
         "Generating recursive maze...", True, VIS_COLOR
@@ -135,6 +169,7 @@ class VisText:
     vis_text_base_img = FONT.render(f"Getting base image...", True, VIS_COLOR)
     vis_text_clean_img = FONT.render(f"Getting clean image...", True, VIS_COLOR)
     vis_text_converting_img = FONT.render(f"Converting image...", True, VIS_COLOR)
+    vis_text_not_cached = FONT.render("Offline and this address is not cached", True, VIS_COLOR)
     vis_text_algo_timer = FONT.render(f"{algo_timer}", True, LEGEND_COLOR)
 
     def update_vis_text_address(self) -> None:
@@ -151,6 +186,13 @@ class VisText:
         """Gets values from timer to display on screen"""
         self.algo_timer = f"Time: {timer_total:.3f}s - # squares: {timer_count:,}"
 
+    def sleep_calibration_to_string(self, calibration: SleepCalibration) -> None:
+        """Shows how accurately visualizations are paced in place of the timer until an algo runs"""
+        self.algo_timer = (
+            f"Sleep jitter: {calibration.jitter_median / 10**3:.1f}us median"
+            f" - {calibration.jitter_max / 10**3:.1f}us max"
+        )
+
 
 def set_graph(gph: GraphState) -> None:
     """Creates the graph object that stores the location of all the squares"""
@@ -160,6 +202,9 @@ def set_graph(gph: GraphState) -> None:
     # technically created upon a set_* method from the graph's prespective.
     gph.update_entire_screen = True
 
+    # Recordings hold a single graph size
+    stop_recording(gph)
+
     # Everything square related is handle in here
     Square.init(WIDTH)
 
@@ -200,7 +245,6 @@ def draw(gph: GraphState, algo: AlgoState, txt: VisText, legend=False, clear_leg
         _draw_legend(gph, txt)
 
     # Get squares to draw
-    graph = []
     with CppPyLock(algo.thread_lock, algo.thread_unlock):
         if gph.visualize_square_history:
             gph.visualize_square_history = False
@@ -215,25 +259,36 @@ def draw(gph: GraphState, algo: AlgoState, txt: VisText, legend=False, clear_leg
             Square.set_square_color_by_group(history_squares, "history_rollback")
             Square.clear_history_squares()
 
+        # Paints the whole graph at once if any square changed
+        elif _use_scale_render(gph):
+            if Square.get_squares_to_update():
+                _draw_scaled_squares(gph)
+                _record_squares(gph)
+            Square.clear_squares_to_update()
+
         # Queues all changed squares to update
         else:
             square: Square
             for square in Square.get_squares_to_update():
-                graph.append(square)
                 gph.add_to_update_queue(square)
+            _record_squares(gph)
             Square.clear_squares_to_update()
 
 
     # Update the pygame display
-    # It's faster to update entire screen if number of rects is greater than 20
-    # 40x speedup
-    if len(gph.rects_to_update) > 20 or gph.update_entire_screen:
+    # Changed squares are merged into spans and tiles so the cost follows the changed area.
+    # Past half the window a single flip is cheaper than many rects.
+    # Lines are never drawn over a map image, its pixels are read when converting it into squares.
+    rects = _coalesce_rects(gph.rects_to_update)
+    if gph.update_entire_screen or sum(rect.w * rect.h for rect in rects) > WINDOW_WIDTH * WINDOW_HEIGHT // 2:
         gph.update_entire_screen = False
-        _draw_lines(gph)
+        if not gph.has_img:
+            _draw_lines(gph)
         pygame.display.flip()
-    else:
-        _draw_square_borders(gph, graph)
-        pygame.display.update(gph.rects_to_update)
+    elif rects:
+        if not gph.has_img:
+            _draw_square_borders(gph, rects)
+        pygame.display.update(rects)
     gph.rects_to_update.clear()
 
 
@@ -242,38 +297,119 @@ def _draw_square(gph: GraphState, square_color, square_pos) -> pygame.Rect:
     return pygame.draw.rect(gph.window, square_color, square_pos)
 
 
-def _draw_square_borders(gph: GraphState, graph) -> None:
-    """Draws the lines surrounding the updating squares"""
+def _use_scale_render(gph: GraphState) -> bool:
+    """Whether the graph is painted from the state array instead of square by square"""
+    return not use_square_h and not gph.has_img and Square.get_num_rows() >= gph.SCALE_RENDER_MIN_ROWS
 
-    square: Square
-    square_length = Square.get_square_length()
-    for square in graph:
-        x, y, *_ = square.draw_square()
-        top_left = x, y
-        top_right = x, y + square_length
-        bottom_left = x + square_length, y
-        bottom_right = x + square_length, y + square_length
 
-        # Top
-        pygame.draw.line(gph.window, LINE_COLOR, top_left, top_right)
-        # Right
-        pygame.draw.line(gph.window, LINE_COLOR, top_right, bottom_right)
-        # Bottom
-        pygame.draw.line(gph.window, LINE_COLOR, bottom_left, bottom_right)
-        # Left
-        pygame.draw.line(gph.window, LINE_COLOR, top_left, bottom_left)
+def _draw_scaled_squares(gph: GraphState) -> None:
+    """Writes every square's color into a small surface and scales it over the graph"""
+    if gph.cells_surface is None or gph.cells_surface.get_size() != (Square.get_num_rows(), Square.get_num_cols()):
+        gph.cells_surface = pygame.Surface((Square.get_num_rows(), Square.get_num_cols()))
 
+    # Rows run along x, same as Square.draw_square()
+    pygame.surfarray.blit_array(gph.cells_surface, Square.get_colors())
+    pygame.transform.scale(gph.cells_surface, GRAPH_RECT.size, gph.window.subsurface(GRAPH_RECT))
+    gph.add_to_update_queue(GRAPH_RECT.copy())
+
+
+def start_recording(gph: GraphState, path: str = TRACE_PATH) -> None:
+    """Records the squares as they are now, then every change drawn, as a trace"""
+    states = [
+        [_get_trace_state(Square.get_square(row, col)) for col in range(Square.get_num_cols())]
+        for row in range(Square.get_num_rows())
+    ]
+    gph.trace = TraceWriter(path, "pathfinding", states)
+    pygame.display.set_caption(pygame.display.get_caption()[0] + " - Recording")
+
+
+def stop_recording(gph: GraphState) -> None:
+    """Finishes the trace being recorded, if any"""
+    if gph.trace is None:
+        return
+    gph.trace.close()
+    gph.trace = None
+    pygame.display.set_caption(pygame.display.get_caption()[0].removesuffix(" - Recording"))
 
-def _draw_lines(gph: GraphState) -> None:
-    """Helper function to define the properties of the horizontal and vertical graph lines"""
 
-    for i in range(Square.get_num_rows()):
-        row = col = i * Square.get_square_length()
+def set_squares_from_trace(player: TracePlayer, indices) -> None:
+    """Sets the squares at flat indices to their state in the trace"""
+    num_cols = Square.get_num_cols()
+    for index in indices:
+        getattr(Square.get_square(*divmod(index, num_cols)), _TRACE_SETTERS[player.values[index]])()
 
-        # Horizonatal lines
-        pygame.draw.line(gph.window, LINE_COLOR, (0, row), (WIDTH, row))
-        # Vertical lines
-        pygame.draw.line(gph.window, LINE_COLOR, (col, 0), (col, WIDTH))
+
+def _record_squares(gph: GraphState) -> None:
+    """Adds the squares about to be drawn to the trace as one frame"""
+    squares = Square.get_squares_to_update()
+    if gph.trace is None or not squares:
+        return
+    num_cols = Square.get_num_cols()
+    for square in squares:
+        row, col = square.get_pos()
+        gph.trace.set_state(row * num_cols + col, _get_trace_state(square))
+    gph.trace.frame()
+
+
+def _get_trace_state(square: Square) -> int:
+    """State code of a square in traces"""
+    return _TRACE_STATES[tuple(square.get_color())]
+
+
+def _coalesce_rects(rects: list) -> list[pygame.Rect]:
+    """Merges rects into horizontal spans, then stacks equal spans into tiles.
+    The merged rects cover exactly the same area as the originals.
+    """
+    # Merge touching rects on the same row into spans
+    spans = []
+    for rect in sorted(rects, key=lambda rect: (rect.y, rect.h, rect.x)):
+        last = spans[-1] if spans else None
+        if last and last.y == rect.y and last.h == rect.h and rect.x <= last.right:
+            last.w = max(last.right, rect.right) - last.x
+        else:
+            spans.append(pygame.Rect(rect))
+
+    # Stack spans covering the same columns on consecutive rows into tiles
+    tiles = []
+    open_tiles = {}  # Tile below which the next span with the same columns can be stacked
+    for span in spans:
+        tile = open_tiles.get((span.x, span.w))
+        if tile and tile.bottom == span.y:
+            tile.h += span.h
+        else:
+            tile = pygame.Rect(span)
+            tiles.append(tile)
+            open_tiles[(span.x, span.w)] = tile
+    return tiles
+
+
+def _get_lines_surface(gph: GraphState) -> pygame.Surface:
+    """Transparent surface with only the graph lines. Rebuilt when the graph size changes."""
+    if gph.lines_surface is None or gph.lines_num_rows != Square.get_num_rows():
+        gph.lines_surface = pygame.Surface((WIDTH, HEIGHT), pygame.SRCALPHA)
+        for i in range(Square.get_num_rows()):
+            row = col = i * Square.get_square_length()
+
+            # Horizonatal lines
+            pygame.draw.line(gph.lines_surface, LINE_COLOR, (0, row), (WIDTH, row))
+            # Vertical lines
+            pygame.draw.line(gph.lines_surface, LINE_COLOR, (col, 0), (col, WIDTH))
+        gph.lines_num_rows = Square.get_num_rows()
+    return gph.lines_surface
+
+
+def _draw_square_borders(gph: GraphState, rects: list[pygame.Rect]) -> None:
+    """Restores the lines over the updated areas of the graph"""
+    lines_surface = _get_lines_surface(gph)
+    for rect in rects:
+        rect = rect.clip(GRAPH_RECT)
+        if rect:
+            gph.window.blit(lines_surface, rect, rect)
+
+
+def _draw_lines(gph: GraphState) -> None:
+    """Draws the horizontal and vertical graph lines over the whole graph"""
+    gph.window.blit(_get_lines_surface(gph), (0, 0))
 
 
 def _draw_img(gph: GraphState) -> None:
@@ -283,6 +419,11 @@ def _draw_img(gph: GraphState) -> None:
 
 def pygame_image_to_squares(gph: GraphState) -> None:
     """Converts the mapped image to squares. 2D array"""
+    # The python Square reduces the pixels in place, the C++ one takes lists
+    if not use_square_h:
+        Square.set_square_color_by_array(pygame.surfarray.pixels3d(gph.window))
+        return
+
     pixels_r = pygame.surfarray.pixels_red(gph.window).tolist()
     pixels_g = pygame.surfarray.pixels_green(gph.window).tolist()
     pixels_b = pygame.surfarray.pixels_blue(gph.window).tolist()
@@ -395,6 +536,7 @@ def draw_vis_text(
     is_base_img=False,
     is_clean_img=False,
     is_converting_img=False,
+    is_not_cached=False,
 ) -> None:
     """Special text indicating some operation is being performed. No inputs are registered."""
 
@@ -429,6 +571,17 @@ def draw_vis_text(
                 ),
             )
         )
+    elif algo.check_algo() == algo.ALGO_JPS:
+        text_rects.append(draw_algo_timer(gph, txt))
+        text_rects.append(
+            gph.window.blit(
+                txt.vis_text_jps,
+                (
+                    WIDTH // 2 - txt.vis_text_jps.get_width() // 2,
+                    CENTER_LEGEND_AREA - txt.vis_text_jps.get_height() // 2 - 10,
+                ),
+            )
+        )
     elif algo.check_algo() == algo.ALGO_BI_DIJKSTRA:
         text_rects.append(draw_algo_timer(gph, txt))
         text_rects.append(
@@ -442,6 +595,30 @@ def draw_vis_text(
                 ),
             )
         )
+    elif algo.check_algo() == algo.ALGO_HPA:
+        text_rects.append(draw_algo_timer(gph, txt))
+        text_rects.append(
+            gph.window.blit(
+                txt.vis_text_hpa,
+                (
+                    WIDTH // 2 - txt.vis_text_hpa.get_width() // 2,
+                    CENTER_LEGEND_AREA - txt.vis_text_hpa.get_height() // 2 - 10,
+                ),
+            )
+        )
+    elif algo.check_algo() == algo.ALGO_BI_A_STAR:
+        text_rects.append(draw_algo_timer(gph, txt))
+        text_rects.append(
+            gph.window.blit(
+                txt.vis_text_bi_a_star,
+                (
+                    WIDTH // 2 - txt.vis_text_bi_a_star.get_width() // 2,
+                    CENTER_LEGEND_AREA
+                    - txt.vis_text_bi_a_star.get_height() // 2
+                    - 10,
+                ),
+            )
+        )
     elif algo.check_algo() == algo.ALGO_BEST_PATH:
         text_rects.append(draw_algo_timer(gph, txt))
         text_rects.append(
@@ -531,11 +708,44 @@ def draw_vis_text(
                 ),
             )
         )
+    elif is_not_cached:
+        text_rects.append(
+            gph.window.blit(
+                txt.vis_text_not_cached,
+                (
+                    WIDTH // 2 - txt.vis_text_not_cached.get_width() // 2,
+                    CENTER_LEGEND_AREA - txt.vis_text_not_cached.get_height() // 2,
+                ),
+            )
+        )
 
     # Updates the portion of the screen that contains changing text
     pygame.display.update(text_rects)
 
 
+def draw_replay_text(gph: GraphState, txt: VisText, position: int, num_events: int) -> None:
+    """Shows where a replay is and its controls in the legend"""
+    vis_text_replay = txt.FONT.render(f"Replay - Event {position:,} of {num_events:,}", True, LEGEND_COLOR)
+    text_rects = [
+        gph.window.fill(LEGEND_AREA_COLOR, LEGEND_RECT),
+        gph.window.blit(
+            vis_text_replay,
+            (
+                WIDTH // 2 - vis_text_replay.get_width() // 2,
+                CENTER_LEGEND_AREA - vis_text_replay.get_height() // 2 - 15,
+            ),
+        ),
+        gph.window.blit(
+            txt.legend_replay,
+            (
+                WIDTH // 2 - txt.legend_replay.get_width() // 2,
+                CENTER_LEGEND_AREA - txt.legend_replay.get_height() // 2 + 15,
+            ),
+        ),
+    ]
+    pygame.display.update(text_rects)
+
+
 def draw_algo_timer(gph: GraphState, txt: VisText) -> pygame.Rect:
     """Draws timer of algo"""
     txt.update_vis_text_algo_timer()
@@ -0,0 +1,294 @@
+"""Runs the pathfinding algorithms on plain wall arrays.
+Nothing here touches pygame, Square, AlgoState, locks or timers, so many
+start/end queries can be answered against stored grids, e.g. from a service.
+"""
+
+
+from src.pathfinding.py.flood_fill import flood_fill, get_path
+from src.pathfinding.py.frontier import HeapFrontier
+from src.pathfinding.py.jump_point import get_successors, fill_path
+from src.pathfinding.py.hierarchical import HierarchicalPlanner
+
+import numpy as np
+from dataclasses import dataclass
+from time import perf_counter_ns
+
+
+ALGOS = ("dijkstra", "a_star", "bi_dijkstra", "jps", "hpa")
+
+
+@dataclass(slots=True)
+class SolveResult:
+    """Path found by a query and stats about the search"""
+
+    path: list[tuple[int, int]]  # (row, col) of every square from start to end. Empty if unreachable.
+    expanded: int  # Number of squares checked
+    time_ns: int  # Time spent searching, shared searches are split evenly between their queries
+
+    @property
+    def found(self) -> bool:
+        """Whether end was reachable from start"""
+        return bool(self.path)
+
+    @property
+    def length(self) -> int:
+        """Number of steps from start to end"""
+        return len(self.path) - 1 if self.path else -1
+
+
+class Grid:
+    """A wall array with its neighbours precomputed. Reuse it across queries on the same walls."""
+
+    __slots__ = ("walls", "wall_bytes", "num_rows", "num_cols", "size", "rows", "cols", "neighbours", "_hierarchical")
+
+    def __init__(self, walls) -> None:
+        self.walls = np.ascontiguousarray(walls, dtype=np.bool_)
+        self.wall_bytes = self.walls.tobytes()  # Indexed by flat index without numpy overhead
+        self.num_rows, self.num_cols = self.walls.shape
+        self.size = self.num_rows * self.num_cols
+
+        rows = np.repeat(np.arange(self.num_rows), self.num_cols)
+        cols = np.tile(np.arange(self.num_cols), self.num_rows)
+        self.rows: list[int] = rows.tolist()
+        self.cols: list[int] = cols.tolist()
+
+        # Neighbours in the same order as Square._update_neighbours, with walls left out
+        index = np.arange(self.size)
+        free = ~self.walls.ravel()
+        directions = (
+            (cols > 0, -1),
+            (rows > 0, -self.num_cols),
+            (cols < self.num_cols - 1, 1),
+            (rows < self.num_rows - 1, self.num_cols)
+        )
+        table = np.full((self.size, 4), -1, dtype=np.int64)
+        for direction, (in_graph, offset) in enumerate(directions):
+            nei = np.where(in_graph, index + offset, 0)
+            table[:, direction] = np.where(in_graph & free[nei], nei, -1)
+        self.neighbours: list[list[int]] = [[nei for nei in row if nei >= 0] for row in table.tolist()]
+        self._hierarchical: HierarchicalPlanner = None
+
+    def get_index(self, pos: tuple[int, int]) -> int:
+        """Flat row-major index of a (row, col) position. Raises ValueError if it is outside the grid."""
+        row, col = check_pos(pos, self.num_rows, self.num_cols)
+        return row * self.num_cols + col
+
+    def get_pos(self, index: int) -> tuple[int, int]:
+        """(row, col) position of a flat index"""
+        return self.rows[index], self.cols[index]
+
+    def get_hierarchical_planner(self) -> HierarchicalPlanner:
+        """Clusters used by hpa, built on first use then shared by every query"""
+        if self._hierarchical is None:
+            self._hierarchical = HierarchicalPlanner(self.walls)
+        return self._hierarchical
+
+
+def check_pos(pos: tuple[int, int], num_rows: int, num_cols: int) -> tuple[int, int]:
+    """Returns pos as python ints. Raises ValueError if it is outside a num_rows by num_cols grid."""
+    row, col = int(pos[0]), int(pos[1])  # numpy ints would leak into the searches and jump_point
+    if not (0 <= row < num_rows and 0 <= col < num_cols):
+        raise ValueError(f"{tuple(pos)} is outside the {num_rows}x{num_cols} grid")
+    return row, col
+
+
+def solve(grid, start: tuple[int, int], end: tuple[int, int], algo: str = "a_star") -> SolveResult:
+    """Finds a path from start to end. grid is a Grid or a (num_rows, num_cols) bool wall array."""
+    if not isinstance(grid, Grid):
+        grid = Grid(grid)
+    return _solve_index(grid, grid.get_index(start), grid.get_index(end), algo)
+
+
+def solve_batch(grid, queries: list[tuple[tuple[int, int], tuple[int, int]]], algo: str = "a_star") -> list[SolveResult]:
+    """Solves many (start, end) queries on the same walls.
+    Neighbours are computed once. With dijkstra, queries sharing a start share one flood fill,
+    and each reports the squares solve would expand for it alone.
+    """
+    if not isinstance(grid, Grid):
+        grid = Grid(grid)
+
+    if algo != "dijkstra":
+        return [_solve_index(grid, grid.get_index(start), grid.get_index(end), algo) for start, end in queries]
+
+    # A full flood fill from a start answers every end at once
+    queries_by_start: dict[int, list[int]] = {}
+    for query_num, (start, _) in enumerate(queries):
+        queries_by_start.setdefault(grid.get_index(start), []).append(query_num)
+
+    results: list[SolveResult] = [None] * len(queries)
+    for start, query_nums in queries_by_start.items():
+        if grid.walls.flat[start]:
+            for query_num in query_nums:
+                results[query_num] = SolveResult([], 0, 0)
+            continue
+
+        time_start = perf_counter_ns()
+        dist, came_from, waves = flood_fill(grid.walls, start)
+        time_per_query = (perf_counter_ns() - time_start) // len(query_nums)
+
+        # Squares solve would have expanded, every wave up to the one end is in
+        expanded_by_wave = np.cumsum([len(wave) for wave in waves]).tolist()
+
+        for query_num in query_nums:
+            end = grid.get_index(queries[query_num][1])
+            if grid.walls.flat[end]:
+                path, expanded = [], 0
+            elif dist[end] >= 0:
+                path = _to_positions(grid, get_path(came_from, end).tolist())
+                expanded = expanded_by_wave[dist[end]]
+            else:
+                path, expanded = [], expanded_by_wave[-1]
+            results[query_num] = SolveResult(path, expanded, time_per_query)
+    return results
+
+
+def compare(grid, queries: list[tuple[tuple[int, int], tuple[int, int]]], algos=ALGOS) -> dict[str, list[SolveResult]]:
+    """Solves the same queries with each algorithm, e.g. to compare squares expanded by a_star and jps"""
+    if not isinstance(grid, Grid):
+        grid = Grid(grid)
+    return {algo: solve_batch(grid, queries, algo) for algo in algos}
+
+
+def _solve_index(grid: Grid, start: int, end: int, algo: str) -> SolveResult:
+    """Runs a single query using flat indices"""
+    time_start = perf_counter_ns()
+    if grid.walls.flat[start] or grid.walls.flat[end]:
+        path, expanded = [], 0
+    elif algo == "dijkstra":
+        path, expanded = _dijkstra(grid, start, end)
+    elif algo == "a_star":
+        path, expanded = _a_star(grid, start, end)
+    elif algo == "bi_dijkstra":
+        path, expanded = _bi_dijkstra(grid, start, end)
+    elif algo == "jps":
+        path, expanded = _jps(grid, start, end)
+    elif algo == "hpa":
+        planner = grid.get_hierarchical_planner()
+        path = planner.get_path(grid.walls, start, end)
+        expanded = planner.expanded
+    else:
+        raise NotImplementedError(f"Invalid algorithm. Choose from {ALGOS}")
+    time_ns = perf_counter_ns() - time_start
+    return SolveResult(_to_positions(grid, path), expanded, time_ns)
+
+
+def _dijkstra(grid: Grid, start: int, end: int) -> tuple[list[int], int]:
+    """Every edge costs 1 so dijkstra is a flood fill"""
+    dist, came_from, waves = flood_fill(grid.walls, start, end)
+    expanded = sum(len(wave) for wave in waves)
+    if dist[end] < 0:
+        return [], expanded
+    return get_path(came_from, end).tolist(), expanded
+
+
+def _a_star(grid: Grid, start: int, end: int) -> tuple[list[int], int]:
+    """A* with the manhattan distance, same as the visualized one"""
+    neighbours = grid.neighbours
+    rows, cols = grid.rows, grid.cols
+    end_row, end_col = rows[end], cols[end]
+
+    open_set = HeapFrontier(grid.size)
+    open_set.put(start, abs(rows[start] - end_row) + abs(cols[start] - end_col))
+    g_score = {start: 0}
+    came_from = {}
+
+    expanded = 0
+    while not open_set.empty():
+        curr = open_set.get()
+        expanded += 1
+        if curr == end:
+            return _reconstruct(came_from, end), expanded
+
+        temp_g_score = g_score[curr] + 1
+        for nei in neighbours[curr]:
+            if temp_g_score < g_score.get(nei, temp_g_score + 1):
+                came_from[nei] = curr
+                g_score[nei] = temp_g_score
+                open_set.put(nei, temp_g_score + abs(rows[nei] - end_row) + abs(cols[nei] - end_col))
+
+    return [], expanded
+
+
+def _bi_dijkstra(grid: Grid, start: int, end: int) -> tuple[list[int], int]:
+    """Bi-directional dijkstra, stops as soon as the two swarms touch like the visualized one"""
+    if start == end:
+        return [start], 1
+
+    neighbours = grid.neighbours
+    FIRST_SWARM, SECOND_SWARM = 1, 2
+
+    open_set = HeapFrontier(grid.size)
+    open_set.put(start, 0)
+    open_set.put(end, 0)
+    g_score = {start: 0, end: 0}
+    swarm_of = {start: FIRST_SWARM, end: SECOND_SWARM}
+    came_from = {}
+
+    expanded = 0
+    while not open_set.empty():
+        curr = open_set.get()
+        expanded += 1
+        swarm = swarm_of[curr]
+
+        temp_g_score = g_score[curr] + 1
+        for nei in neighbours[curr]:
+            if temp_g_score < g_score.get(nei, temp_g_score + 1):
+                came_from[nei] = curr
+                g_score[nei] = temp_g_score
+                swarm_of[nei] = swarm
+                open_set.put(nei, temp_g_score)
+            elif swarm_of[nei] != swarm:
+                # Swarms met, each half of the path leads back to its own origin
+                first, second = (curr, nei) if swarm == FIRST_SWARM else (nei, curr)
+                path = _reconstruct(came_from, first)
+                path.extend(reversed(_reconstruct(came_from, second)))
+                return path, expanded
+
+    return [], expanded
+
+
+def _jps(grid: Grid, start: int, end: int) -> tuple[list[int], int]:
+    """Jump point search, only jump points are expanded like the visualized one"""
+    walls = grid.wall_bytes
+    num_rows, num_cols = grid.num_rows, grid.num_cols
+    rows, cols = grid.rows, grid.cols
+    end_row, end_col = rows[end], cols[end]
+
+    open_set = HeapFrontier(grid.size)
+    open_set.put(start, abs(rows[start] - end_row) + abs(cols[start] - end_col))
+    g_score = {start: 0}
+    came_from = {}
+
+    expanded = 0
+    while not open_set.empty():
+        curr = open_set.get()
+        expanded += 1
+        if curr == end:
+            return fill_path(_reconstruct(came_from, end), num_cols), expanded
+
+        curr_row, curr_col = rows[curr], cols[curr]
+        for nei in get_successors(walls, num_rows, num_cols, curr, came_from.get(curr, -1), end):
+            nei_row, nei_col = rows[nei], cols[nei]
+            temp_g_score = g_score[curr] + abs(nei_row - curr_row) + abs(nei_col - curr_col)
+            if temp_g_score < g_score.get(nei, temp_g_score + 1):
+                came_from[nei] = curr
+                g_score[nei] = temp_g_score
+                open_set.put(nei, temp_g_score + abs(nei_row - end_row) + abs(nei_col - end_col))
+
+    return [], expanded
+
+
+def _reconstruct(came_from: dict, curr: int) -> list[int]:
+    """Follows came_from back to the origin. Returns indices from origin to curr."""
+    path = [curr]
+    while curr in came_from:
+        curr = came_from[curr]
+        path.append(curr)
+    path.reverse()
+    return path
+
+
+def _to_positions(grid: Grid, path: list[int]) -> list[tuple[int, int]]:
+    """Turns flat indices into (row, col) positions"""
+    rows, cols = grid.rows, grid.cols
+    return [(rows[index], cols[index]) for index in path]
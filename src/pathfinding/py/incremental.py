@@ -0,0 +1,157 @@
+"""D* Lite for replanning after the graph is edited.
+The search runs backwards from end so start can move freely. Distances are kept
+between calls and only squares whose walls changed, and what depends on them,
+are expanded again. Works on flat row-major indices like flood_fill.
+"""
+
+
+from src.pathfinding.py.flood_fill import flood_fill
+
+import numpy as np
+from heapq import heappush, heappop
+
+
+# Larger than any distance on a graph, keeps everything as ints
+_INF = 1 << 60
+
+
+class IncrementalPlanner:
+    """Keeps the distance of every square to end between searches and repairs it after edits"""
+
+    __slots__ = ("num_rows", "num_cols", "size", "end", "expanded", "expanded_squares",
+                 "_walls", "_g", "_rhs", "_queue", "_keys", "_last_start", "_km")
+
+    def __init__(self, walls: np.ndarray, end: int) -> None:
+        self.num_rows, self.num_cols = walls.shape
+        self.size = self.num_rows * self.num_cols
+        self.end = end
+        self.expanded = 0  # Squares expanded by the last search
+        self.expanded_squares: list[int] = []  # Same squares in order except walls, one may repeat
+
+        # A full flood fill leaves every square consistent, so there is nothing queued to start with
+        self._walls = walls.ravel().copy()
+        dist = flood_fill(walls, end)[0].astype(np.int64)
+        self._g: list[int] = np.where(dist >= 0, dist, _INF).tolist()
+        self._rhs: list[int] = list(self._g)
+        self._queue: list[tuple[int, int, int]] = []
+        self._keys: list[tuple[int, int]] = [None] * self.size  # Latest key of each queued square
+        self._last_start: int = None
+        self._km = 0  # Heuristic offset accumulated as start moves
+
+    def fits(self, walls: np.ndarray, end: int) -> bool:
+        """Whether the planner can be reused for this graph and end"""
+        return walls.shape == (self.num_rows, self.num_cols) and end == self.end
+
+    def get_settled(self) -> list[int]:
+        """Indices of every square with a distance, which is every square that could reach end"""
+        return [index for index, dist in enumerate(self._g) if dist < _INF]
+
+    def get_path(self, walls: np.ndarray, start: int) -> list[int]:
+        """Applies wall edits since the last call and returns indices from start to end. Empty if unreachable."""
+        self.expanded = 0
+        self.expanded_squares = []
+        if self._last_start is not None:
+            self._km += self._heuristic(self._last_start, start)
+        self._last_start = start
+
+        walls = walls.ravel()
+        changed = np.flatnonzero(walls != self._walls).tolist()
+        if changed:
+            self._walls = walls.copy()
+            for index in changed:
+                self._update_vertex(index, start)
+                for nei in self._neighbours(index):
+                    self._update_vertex(nei, start)
+
+        self._compute_shortest_path(start)
+        return self._extract_path(start)
+
+    def _compute_shortest_path(self, start: int) -> None:
+        """Expands inconsistent squares until start is consistent and nothing queued can lower it"""
+        g, rhs, keys, queue = self._g, self._rhs, self._keys, self._queue
+        while queue:
+            k1, k2, index = queue[0]
+            if keys[index] != (k1, k2):  # Stale entry
+                heappop(queue)
+                continue
+            if (k1, k2) >= self._key(start, start) and rhs[start] == g[start]:
+                return
+
+            heappop(queue)
+            keys[index] = None
+            self.expanded += 1
+            if not self._walls[index]:  # New walls are expanded to raise them, but they aren't searched squares
+                self.expanded_squares.append(index)
+
+            new_key = self._key(index, start)
+            if (k1, k2) < new_key:
+                self._push(index, new_key)
+            elif g[index] > rhs[index]:
+                g[index] = rhs[index]
+                for nei in self._neighbours(index):
+                    self._update_vertex(nei, start)
+            else:
+                g[index] = _INF
+                self._update_vertex(index, start)
+                for nei in self._neighbours(index):
+                    self._update_vertex(nei, start)
+
+    def _update_vertex(self, index: int, start: int) -> None:
+        """Recomputes the one step lookahead of a square and queues it if inconsistent"""
+        g, rhs = self._g, self._rhs
+        if index != self.end:
+            best = _INF
+            if not self._walls[index]:
+                for nei in self._neighbours(index):
+                    if not self._walls[nei] and g[nei] + 1 < best:
+                        best = g[nei] + 1
+            rhs[index] = best
+
+        self._keys[index] = None
+        if g[index] != rhs[index]:
+            self._push(index, self._key(index, start))
+
+    def _extract_path(self, start: int) -> list[int]:
+        """Walks downhill on the distances from start to end"""
+        g = self._g
+        if g[start] >= _INF or self._walls[start]:
+            return []
+
+        path = [start]
+        curr = start
+        while curr != self.end:
+            curr = min((nei for nei in self._neighbours(curr) if not self._walls[nei]), key=g.__getitem__)
+            path.append(curr)
+        return path
+
+    def _push(self, index: int, key: tuple[int, int]) -> None:
+        """Queues a square, older entries for it become stale"""
+        self._keys[index] = key
+        heappush(self._queue, (key[0], key[1], index))
+
+    def _key(self, index: int, start: int) -> tuple[int, int]:
+        """Priority of a square. Lower is expanded first."""
+        best = min(self._g[index], self._rhs[index])
+        if best >= _INF:
+            return _INF, _INF
+        return best + self._heuristic(start, index) + self._km, best
+
+    def _heuristic(self, index1: int, index2: int) -> int:
+        """Manhattan distance between two squares"""
+        row1, col1 = divmod(index1, self.num_cols)
+        row2, col2 = divmod(index2, self.num_cols)
+        return abs(row1 - row2) + abs(col1 - col2)
+
+    def _neighbours(self, index: int) -> list[int]:
+        """Neighbours in the same order as Square._update_neighbours, walls included"""
+        row, col = divmod(index, self.num_cols)
+        neighbours = []
+        if col > 0:
+            neighbours.append(index - 1)
+        if row > 0:
+            neighbours.append(index - self.num_cols)
+        if col < self.num_cols - 1:
+            neighbours.append(index + 1)
+        if row < self.num_rows - 1:
+            neighbours.append(index + self.num_cols)
+        return neighbours
@@ -0,0 +1,98 @@
+"""Jump point search on grids where every square costs the same.
+Straight runs are scanned without queueing anything. Only squares where the best
+path may have to turn, jump points, are handed back to the search, so symmetric
+paths through open areas are never expanded. Works on flat row-major indices like flood_fill.
+"""
+
+
+def get_successors(walls, num_rows: int, num_cols: int, index: int, parent: int, end: int) -> list[int]:
+    """Jump points reachable in a straight line from index, pruned by the direction it was reached from.
+    walls is indexed by flat index, e.g. Square.walls. parent is -1 for the first square.
+    """
+    row, col = divmod(index, num_cols)
+    if parent < 0:
+        directions = ((0, -1), (-1, 0), (0, 1), (1, 0))  # Same order as Square neighbours
+    else:
+        parent_row, parent_col = divmod(parent, num_cols)
+        d_row = (row > parent_row) - (row < parent_row)
+        d_col = (col > parent_col) - (col < parent_col)
+
+        # Going back, or sideways then back, is never shorter than a path not through this square
+        if d_col:
+            directions = ((-1, 0), (1, 0), (0, d_col))
+        else:
+            directions = ((0, -1), (0, 1), (d_row, 0))
+
+    successors = []
+    for d_row, d_col in directions:
+        if d_col:
+            jump_point = _jump_horizontal(walls, num_rows, num_cols, row, col, d_col, end)
+        else:
+            jump_point = _jump_vertical(walls, num_rows, num_cols, row, col, d_row, end)
+        if jump_point >= 0:
+            successors.append(jump_point)
+    return successors
+
+
+def fill_path(jump_points: list[int], num_cols: int) -> list[int]:
+    """Turns consecutive jump points into every square between them"""
+    if not jump_points:
+        return []
+
+    path = []
+    for index1, index2 in zip(jump_points, jump_points[1:]):
+        step = num_cols if abs(index2 - index1) >= num_cols else 1
+        path.extend(range(index1, index2, step if index2 > index1 else -step))
+    path.append(jump_points[-1])
+    return path
+
+
+def _jump_horizontal(walls, num_rows: int, num_cols: int, row: int, col: int, d_col: int, end: int) -> int:
+    """Scans along a row until a jump point, returns -1 on hitting a wall or the edge"""
+    base = row * num_cols
+    up = base - num_cols if row > 0 else -1
+    down = base + num_cols if row < num_rows - 1 else -1
+    while True:
+        col += d_col
+        if not 0 <= col < num_cols:
+            return -1
+        index = base + col
+        if walls[index]:
+            return -1
+        if index == end:
+            return index
+
+        # A wall behind opening up above or below forces a turn here
+        behind = col - d_col
+        if up >= 0 and not walls[up + col] and walls[up + behind]:
+            return index
+        if down >= 0 and not walls[down + col] and walls[down + behind]:
+            return index
+
+
+def _jump_vertical(walls, num_rows: int, num_cols: int, row: int, col: int, d_row: int, end: int) -> int:
+    """Scans along a column until a jump point, returns -1 on hitting a wall or the edge"""
+    has_left = col > 0
+    has_right = col < num_cols - 1
+    step = d_row * num_cols
+    while True:
+        row += d_row
+        if not 0 <= row < num_rows:
+            return -1
+        index = row * num_cols + col
+        if walls[index]:
+            return -1
+        if index == end:
+            return index
+
+        # A wall behind opening up to the left or right forces a turn here
+        behind = index - step
+        if has_left and not walls[index - 1] and walls[behind - 1]:
+            return index
+        if has_right and not walls[index + 1] and walls[behind + 1]:
+            return index
+
+        # Turning onto a row that leads to a jump point also makes this one
+        if (_jump_horizontal(walls, num_rows, num_cols, row, col, -1, end) >= 0
+            or _jump_horizontal(walls, num_rows, num_cols, row, col, 1, end) >= 0):
+            return index
@@ -13,11 +13,12 @@ else:
     from src.pathfinding.py.square import Square
     from src.pathfinding.py.algorithms import AlgoState
 
-from src.pathfinding.py.maps import get_img_base, get_img_clean
+from src.pathfinding.py.maps import get_img_base, get_img_clean, prefetch_img_clean, cancel_prefetches, stop_prefetching
 from src.pathfinding.py.graph import (GraphState, VisText, set_graph, draw,
     reset_graph, reset_algo, change_graph_size, pygame_image_to_squares,
-    draw_vis_text, HEIGHT)
-from lib.timer import sleep
+    draw_vis_text, start_recording, stop_recording, set_squares_from_trace, draw_replay_text, HEIGHT, WIDTH)
+from lib.timer import sleep, calibrate_sleep, SleepCalibration
+from src.trace import TraceReader, TracePlayer
 
 from threading import Thread
 import pygame
@@ -40,10 +41,15 @@ class LogicState:
     GRAPH_MEDIUM: int = 46
     GRAPH_LARGE: int = 95
     GRAPH_MAX: int = 400
+    sleep_calibration: SleepCalibration = None  # How accurately this machine paces the visualizations
 
 
 def run_pathfinding(gph: GraphState, algo: AlgoState, lgc: LogicState, txt: VisText) -> None:
     """The pygame logic loop. This runs forever until exited. This is what should be called to run program."""
+    # Fit the precise sleep to this machine before anything is paced with it
+    lgc.sleep_calibration = calibrate_sleep()
+    txt.sleep_calibration_to_string(lgc.sleep_calibration)
+
     # Start other loops
     Thread(target=algo.start_loop, args=(), daemon=True).start()
     
@@ -90,6 +96,12 @@ def logic_loop(gph: GraphState, algo: AlgoState, lgc: LogicState, txt: VisText)
             if event.type == pygame.QUIT:
                 lgc.run = False
 
+            # Dragging during an instant rerun aborts it, the handlers below submit a fresh one
+            cancelled_rerun = False
+            if _is_instant_rerun(algo, lgc) and any(pygame.mouse.get_pressed(3)):
+                algo.cancel()
+                cancelled_rerun = True
+
             # Don't allow button presses in certain phases
             if algo.check_phase() != algo.NONE:
                 continue
@@ -112,6 +124,10 @@ def logic_loop(gph: GraphState, algo: AlgoState, lgc: LogicState, txt: VisText)
             elif (pygame.mouse.get_pressed(3)[1] and pygame.mouse.get_pos()[1] < HEIGHT and not gph.has_img):
                 _middle_click_button(algo, lgc)
 
+            # Click did not change anything so finish the rerun that was cancelled
+            if cancelled_rerun and algo.check_phase() == algo.NONE and lgc.start and lgc.end:
+                _run_pathfinding_algo(algo, lgc, algo.check_algo(), False)
+
             """Keyboard buttons"""
 
             # Reset graph with "SPACE" on keyboard
@@ -130,6 +146,18 @@ def logic_loop(gph: GraphState, algo: AlgoState, lgc: LogicState, txt: VisText)
             if (event.type == pygame.KEYDOWN and event.key == pygame.K_b and lgc.start and lgc.end and not gph.has_img):
                 _bi_dijkstra_button(algo, lgc)
 
+            # Run Jump Point Search with "J" key on keyboard
+            if (event.type == pygame.KEYDOWN and event.key == pygame.K_j and lgc.start and lgc.end and not gph.has_img):
+                _jps_button(algo, lgc)
+
+            # Run Bi-directional A* with "N" key on keyboard
+            if (event.type == pygame.KEYDOWN and event.key == pygame.K_n and lgc.start and lgc.end and not gph.has_img):
+                _bi_a_star_button(algo, lgc)
+
+            # Run Hierarchical A* with "H" key on keyboard
+            if (event.type == pygame.KEYDOWN and event.key == pygame.K_h and lgc.start and lgc.end and not gph.has_img):
+                _hpa_button(algo, lgc)
+
             # Draw recursive maze with "G" key on keyboard
             if (event.type == pygame.KEYDOWN and event.key == pygame.K_g and not gph.has_img):
                 if Square.get_num_rows() == lgc.GRAPH_MAX:
@@ -166,9 +194,14 @@ def logic_loop(gph: GraphState, algo: AlgoState, lgc: LogicState, txt: VisText)
             if event.type == pygame.KEYDOWN and event.key == pygame.K_v:
                 _visualize_changes_button(gph, algo, txt)
 
+            # Record changes as a trace with the "R" key
+            if event.type == pygame.KEYDOWN and event.key == pygame.K_r:
+                _record_button(gph)
+
         clock.tick(gph.FPS)
 
     # Only reached if while loop ends, which happens if window is closed. Program terminates.
+    stop_recording(gph)
     quit_program()
 
 
@@ -322,8 +355,16 @@ def _none_to_null_square(square) -> Square:
     return square
 
 
+def _is_instant_rerun(algo: AlgoState, lgc: LogicState) -> bool:
+    """Checks if a pathfinding algo is running again with no visualizations"""
+    return algo.check_phase() == algo.PHASE_ALGO and not lgc.visualize
+
+
 def _run_pathfinding_algo(algo: AlgoState, lgc: LogicState, algo_to_run, visualize: bool) -> None:
     """Run's the specificed algo"""
+    # A stale run would keep drawing over the new one
+    algo.cancel()
+
     # Resets algo visualizations without removing ordinal squares or walls
     reset_algo()
 
@@ -333,13 +374,14 @@ def _run_pathfinding_algo(algo: AlgoState, lgc: LogicState, algo_to_run, visuali
     end = _none_to_null_square(lgc.end)
     null_square = _none_to_null_square(None)
 
-    # Set algorithm to run
+    # Set algorithm to run. Instant reruns repair the last search where they can.
     algo.run_options(start, mid, end, null_square)
-    algo.run(algo.PHASE_ALGO, algo_to_run)
     lgc.visualize = visualize
     if not visualize:
         algo.set_best_path_delay(0)
+        algo.set_flood_fill_delay(0)
         lgc.vis_text_counter = lgc.DEFAULT_VIS_COUNTER
+    algo.run(algo.PHASE_ALGO, algo_to_run, replan=not visualize)
 
 
 def _dijkstra_button(algo: AlgoState, lgc: LogicState) -> None:
@@ -357,6 +399,21 @@ def _bi_dijkstra_button(algo: AlgoState, lgc: LogicState) -> None:
     _run_pathfinding_algo(algo, lgc, algo.ALGO_BI_DIJKSTRA, True)
 
 
+def _jps_button(algo: AlgoState, lgc: LogicState) -> None:
+    """Runs the Jump Point Search algorithm"""
+    _run_pathfinding_algo(algo, lgc, algo.ALGO_JPS, True)
+
+
+def _bi_a_star_button(algo: AlgoState, lgc: LogicState) -> None:
+    """Runs the Bi-Directional A* algorithm"""
+    _run_pathfinding_algo(algo, lgc, algo.ALGO_BI_A_STAR, True)
+
+
+def _hpa_button(algo: AlgoState, lgc: LogicState) -> None:
+    """Runs the Hierarchical A* algorithm"""
+    _run_pathfinding_algo(algo, lgc, algo.ALGO_HPA, True)
+
+
 def _recursive_maze_buttons(gph: GraphState, algo: AlgoState, lgc: LogicState, txt: VisText, visualize) -> None:
     """Draws recursive maze"""
     reset_graph(gph, algo, txt)
@@ -393,17 +450,37 @@ def _load_img_to_graph(gph: GraphState, algo: AlgoState, lgc: LogicState, txt: V
     draw_vis_text(gph, algo, txt, is_base_img=True)
     change_graph_size(gph, algo, txt, lgc.GRAPH_MAX, to_draw=False)
 
-    gph.img = pygame.image.load(get_img_base(txt.address))
+    # Clean image downloads while the base image is fetched and shown, ready for 'C'
+    prefetch_img_clean(txt.address)
+    try:
+        gph.img = pygame.image.load(get_img_base(txt.address))
+    except FileNotFoundError:
+        gph.has_img = False
+        _show_not_cached(gph, algo, txt)
+        _reset_ordinal_squares(lgc)
+        return
     gph.has_img = True
     draw(gph, algo, txt)
     _reset_ordinal_squares(lgc)
 
 
+def _show_not_cached(gph: GraphState, algo: AlgoState, txt: VisText) -> None:
+    """Redraws the graph and says the image is missing. Only happens offline."""
+    gph.base_drawn = False
+    draw(gph, algo, txt)
+    draw_vis_text(gph, algo, txt, is_not_cached=True)
+
+
 def _convert_img_to_squares(gph: GraphState, algo: AlgoState, txt: VisText) -> None:
     """Coverts the map data into squares the algorithms can use"""
     draw_vis_text(gph, algo, txt, is_clean_img=True)
 
-    gph.img = pygame.image.load(get_img_clean(txt.address))
+    try:
+        gph.img = pygame.image.load(get_img_clean(txt.address))
+    except FileNotFoundError:
+        # The base image was cached without the clean one, keep showing it
+        _show_not_cached(gph, algo, txt)
+        return
 
     gph.base_drawn = False
     draw(gph, algo, txt)
@@ -420,6 +497,9 @@ def _get_address_from_user(gph: GraphState, algo: AlgoState, lgc: LogicState, tx
     # Used to get rid of commas inserted by url encoding.
     txt.address = txt.address.replace(",", "")
 
+    # The previous address won't be converted anymore
+    cancel_prefetches()
+
     gph.base_drawn = False
     draw(gph, algo, txt)
     draw_vis_text(gph, algo, txt, is_input=True)
@@ -460,8 +540,64 @@ def _visualize_changes_button(gph: GraphState, algo: AlgoState, txt: VisText) ->
     draw(gph, algo, txt, legend=True)
 
 
+def _record_button(gph: GraphState) -> None:
+    """Starts recording the graph, or finishes the recording"""
+    if gph.trace is None:
+        start_recording(gph)
+    else:
+        stop_recording(gph)
+
+
+def run_replay(gph: GraphState, algo: AlgoState, txt: VisText, path: str) -> None:
+    """Plays back a trace recorded with 'R'. This runs forever until exited."""
+    player = TracePlayer(TraceReader(path))
+    if player.reader.kind != "pathfinding":
+        raise ValueError(f"{path} is a {player.reader.kind} trace")
+    num_events = len(player.reader)
+
+    # Same graph as the recording, starting as it was
+    gph.create_pygame_window()
+    Square.update_num_rows_cols(player.reader.shape[0])
+    set_graph(gph)
+    set_squares_from_trace(player, range(len(player.values)))
+    pygame.event.set_allowed([pygame.QUIT, pygame.KEYDOWN, pygame.MOUSEBUTTONDOWN])
+
+    clock = pygame.time.Clock()
+    playing = False
+    while True:
+        position = player.position
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT:
+                quit_program()
+            elif event.type == pygame.KEYDOWN and event.key == pygame.K_SPACE:
+                playing = not playing
+            elif event.type == pygame.KEYDOWN and event.key == pygame.K_RIGHT:
+                position = player.get_frame_after(position)
+            elif event.type == pygame.KEYDOWN and event.key == pygame.K_LEFT:
+                position = player.get_frame_before(position)
+            elif event.type == pygame.KEYDOWN and event.key == pygame.K_HOME:
+                position = 0
+            elif event.type == pygame.KEYDOWN and event.key == pygame.K_END:
+                position = num_events
+
+            # Clicking the legend jumps as far into the trace as across the window
+            elif event.type == pygame.MOUSEBUTTONDOWN and event.pos[1] >= HEIGHT:
+                position = round(event.pos[0] / WIDTH * num_events)
+
+        # Plays one recorded frame per tick, the same rate it was drawn at
+        if playing:
+            position = player.get_frame_after(position)
+            playing = position < num_events
+
+        set_squares_from_trace(player, player.seek(position).tolist())
+        draw(gph, algo, txt, clear_legend=True)
+        draw_replay_text(gph, txt, player.position, num_events)
+        clock.tick(gph.FPS)
+
+
 def quit_program() -> None:
     """Quits the program"""
+    stop_prefetching()
     pygame.quit()
     import sys
     sys.exit()
@@ -1,13 +1,42 @@
 import os
 import sys
+import time
+import hashlib
 import requests
 import tkinter as tk
 import tkinter.messagebox
+from concurrent.futures import Future, ThreadPoolExecutor
 from io import BytesIO
+from threading import Lock, get_ident
 from urllib.parse import quote as url_encode
 from dotenv import load_dotenv
 
 
+# Requests for the same (server, address, zoom, size, style) are answered from disk.
+# Set in lib/.env: MAPS_OFFLINE=1 to only use the cache, MAPS_URL to point at a local stand-in server.
+CACHE_DIR = os.path.join("lib", "maps_cache")
+CACHE_MAX_BYTES = 200 * 1024**2  # Least recently used images are evicted past this
+CACHE_TTL_S = 30 * 24 * 60 * 60  # Images older than this are fetched again
+
+_BASE_URL = 'https://maps.googleapis.com/maps/api/staticmap?'
+_ZOOM = 13
+_SIZE = '400x400'
+_SCALE = 2
+_TIMEOUT_S = 10  # A stalled request would also hold up exiting
+_CLEAN_STYLE = '&style=feature:landscape|color:0x000000' \
+               '&style=feature:poi|visibility:off' \
+               '&style=feature:administrative|visibility:off' \
+               '&style=feature:water|visibility:off' \
+               '&style=feature:transit|visibility:off' \
+               '&style=feature:road|element:labels|visibility:off'
+
+# Connections are reused between requests. Clean images are fetched in the background while the base image is shown.
+_session = requests.Session()
+_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix='maps')
+_prefetched: dict[str, Future] = {}  # Clean image bytes by address, only for the latest address
+_prefetched_lock = Lock()
+
+
 def _get_api_key() -> str:
     """Gets api key from local environmental variables"""
     load_dotenv(os.path.join("lib", ".env"))
@@ -28,33 +57,133 @@ def _invalid_api_key() -> None:
     sys.exit()
 
 
-def get_img_base(loc) -> BytesIO:
-    """Gets the img with all the labels and markets to initially show"""
+def _is_offline() -> bool:
+    """Checks if maps should only be served from the cache"""
+    load_dotenv(os.path.join("lib", ".env"))
+    return os.getenv('MAPS_OFFLINE', '').lower() in ('1', 'true', 'yes')
 
-    base_url = 'https://maps.googleapis.com/maps/api/staticmap?'
-    center = 'center='
-    params = '&zoom=13&size=400x400&scale=2'
-    KEY = _get_api_key()
-    url = base_url + center + loc + params + KEY
-    img = BytesIO(requests.get(url).content)
 
-    return img
+def _get_base_url() -> str:
+    """Gets the url of the static maps api, which MAPS_URL can replace"""
+    load_dotenv(os.path.join("lib", ".env"))
+    return os.getenv('MAPS_URL', _BASE_URL)
+
+
+def get_img_base(loc) -> BytesIO:
+    """Gets the img with all the labels and markets to initially show"""
+    return BytesIO(_get_img_content(loc, style=''))
 
 
 def get_img_clean(loc) -> BytesIO:
     """Gets the cleaned up image for pygame insertion from the specified url"""
+    with _prefetched_lock:
+        future = _prefetched.get(loc)
+    if future is not None and not future.cancelled():
+        try:
+            return BytesIO(future.result())  # Waits if still downloading
+        except Exception:
+            pass  # Fetched again below so the error, if any, happens on this thread
+    return BytesIO(_get_img_content(loc, style=_CLEAN_STYLE))
+
+
+def prefetch_img_clean(loc) -> None:
+    """Starts fetching the clean image in the background. Cancels prefetches of other addresses."""
+    # A missing key shows a dialog and exits, which only works from the main thread
+    key = None if _is_offline() else _get_api_key()
+    with _prefetched_lock:
+        if loc in _prefetched:
+            return
+        _cancel_prefetches()
+        _prefetched[loc] = _executor.submit(_get_img_content, loc, _CLEAN_STYLE, key)
+
 
-    base_url = 'https://maps.googleapis.com/maps/api/staticmap?'
+def cancel_prefetches() -> None:
+    """Drops every prefetched image. Downloads already started finish into the disk cache."""
+    with _prefetched_lock:
+        _cancel_prefetches()
+
+
+def stop_prefetching() -> None:
+    """Cancels prefetches without waiting for them. Call before exiting, else a pending fetch holds up the exit."""
+    with _prefetched_lock:
+        _cancel_prefetches()
+    _executor.shutdown(wait=False, cancel_futures=True)
+
+
+def _cancel_prefetches() -> None:
+    """Same as cancel_prefetches but expects _prefetched_lock to be held"""
+    for future in _prefetched.values():
+        future.cancel()
+    _prefetched.clear()
+
+
+def _get_img_content(loc, style: str, key: str = None) -> bytes:
+    """Gets the bytes of an image from the cache, or fetches and caches them. Key is looked up if not given."""
+    path = _get_cache_path(loc, style)
+    content = _read_cache(path)
+    if content is None:
+        if _is_offline():
+            raise FileNotFoundError(f"'{loc}' is not cached and MAPS_OFFLINE is set")
+        content = _fetch(loc, style, key or _get_api_key())
+        _write_cache(path, content)
+    return content
+
+
+def _fetch(loc, style: str, key: str) -> bytes:
+    """Requests the image from the static maps api"""
+    base_url = _get_base_url()
     center = 'center='
-    params = '&zoom=13&size=400x400&scale=2'
-    style = '&style=feature:landscape|color:0x000000' \
-            '&style=feature:poi|visibility:off' \
-            '&style=feature:administrative|visibility:off' \
-            '&style=feature:water|visibility:off' \
-            '&style=feature:transit|visibility:off' \
-            '&style=feature:road|element:labels|visibility:off'
-    KEY = _get_api_key()
-    url = base_url + center + loc + params + url_encode(style, safe='/:&=') + KEY
-    img = BytesIO(requests.get(url).content)
-
-    return img
+    params = f'&zoom={_ZOOM}&size={_SIZE}&scale={_SCALE}'
+    url = base_url + center + loc + params + url_encode(style, safe='/:&=') + key
+    response = _session.get(url, timeout=_TIMEOUT_S)
+    response.raise_for_status()  # Never cache error pages
+    return response.content
+
+
+def _get_cache_path(loc, style: str) -> str:
+    """Image file named by the hash of everything that changes the image"""
+    key = '\n'.join((_get_base_url(), loc, str(_ZOOM), _SIZE, str(_SCALE), style))
+    return os.path.join(CACHE_DIR, hashlib.sha256(key.encode('utf-8')).hexdigest() + '.png')
+
+
+def _read_cache(path: str) -> bytes | None:
+    """Returns the cached image or None if missing or expired. Expired images are still used offline."""
+    try:
+        stored_at = os.path.getmtime(path)
+        if time.time() - stored_at > CACHE_TTL_S and not _is_offline():
+            return None
+        with open(path, 'rb') as file:
+            content = file.read()
+        # Access time orders eviction, modification time stays the time it was stored for the TTL
+        os.utime(path, (time.time(), stored_at))
+        return content
+    except OSError:
+        return None
+
+
+def _write_cache(path: str, content: bytes) -> None:
+    """Stores an image then evicts the least recently used ones past CACHE_MAX_BYTES"""
+    os.makedirs(CACHE_DIR, exist_ok=True)
+
+    # Write then rename so a crash never leaves half an image behind.
+    # Unique per thread as a prefetch can store the same image as the main thread.
+    tmp_path = f'{path}.{get_ident()}.tmp'
+    with open(tmp_path, 'wb') as file:
+        file.write(content)
+    os.replace(tmp_path, path)
+
+    entries = []
+    for entry in os.scandir(CACHE_DIR):
+        if entry.name.endswith('.png'):
+            stat = entry.stat()
+            entries.append((stat.st_atime, stat.st_size, entry.path))
+    total = sum(size for _, size, _ in entries)
+    for _, size, entry_path in sorted(entries):
+        if total <= CACHE_MAX_BYTES:
+            break
+        if entry_path != path:
+            try:
+                os.remove(entry_path)
+            except FileNotFoundError:
+                pass  # Evicted by another thread
+            total -= size
@@ -0,0 +1,79 @@
+"""Spreads independent start/end queries across processes.
+The wall array is placed in shared memory once and each worker builds its Grid
+from it a single time, so only the queries and results are pickled per task.
+Starting the pool costs time, so fewer workers than cores can be faster on small batches.
+"""
+
+
+from src.pathfinding.py.headless import Grid, SolveResult, check_pos, solve_batch
+
+import os
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from multiprocessing import shared_memory
+from typing import Iterator
+
+
+# Set once per worker process by _init_worker
+_worker_grid: Grid = None
+
+
+def solve_parallel(walls, queries: list[tuple[tuple[int, int], tuple[int, int]]], algo: str = "a_star",
+    workers: int = None, chunk_size: int = 64) -> Iterator[tuple[int, SolveResult]]:
+    """Solves queries on a process pool, yielding (query_num, result) as each chunk completes.
+    walls is a (num_rows, num_cols) bool array. workers defaults to the number of cores.
+    Raises ValueError before starting the pool if a position is outside the grid.
+    """
+    walls = np.ascontiguousarray(walls, dtype=np.bool_)
+    workers = workers or os.cpu_count()
+    queries = [(check_pos(start, *walls.shape), check_pos(end, *walls.shape)) for start, end in queries]
+
+    # Queries sharing a start land in the same chunk so dijkstra can reuse its flood fill
+    order = sorted(range(len(queries)), key=lambda query_num: queries[query_num][0])
+    chunks = [order[i:i + chunk_size] for i in range(0, len(order), chunk_size)]
+
+    shm = shared_memory.SharedMemory(create=True, size=max(walls.nbytes, 1))
+    try:
+        np.ndarray(walls.shape, dtype=np.bool_, buffer=shm.buf)[:] = walls
+
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+            initargs=(shm.name, walls.shape)) as executor:
+            futures = {
+                executor.submit(_solve_chunk, [queries[query_num] for query_num in chunk], algo): chunk
+                for chunk in chunks
+            }
+            try:
+                for future in as_completed(futures):
+                    yield from zip(futures[future], future.result())
+            finally:
+                # Don't start chunks nobody will read if the caller stops early
+                for future in futures:
+                    future.cancel()
+    finally:
+        shm.close()
+        shm.unlink()
+
+
+def solve_parallel_list(walls, queries: list[tuple[tuple[int, int], tuple[int, int]]], algo: str = "a_star",
+    workers: int = None, chunk_size: int = 64) -> list[SolveResult]:
+    """Same as solve_parallel but waits for every result and returns them in query order"""
+    results: list[SolveResult] = [None] * len(queries)
+    for query_num, result in solve_parallel(walls, queries, algo, workers, chunk_size):
+        results[query_num] = result
+    return results
+
+
+def _init_worker(shm_name: str, shape: tuple[int, int]) -> None:
+    """Copies the shared wall array, builds the Grid for this worker and detaches.
+    Workers can exit without running atexit, so the handle is closed here rather than at exit.
+    """
+    global _worker_grid
+    shm = shared_memory.SharedMemory(name=shm_name)
+    walls = np.array(np.ndarray(shape, dtype=np.bool_, buffer=shm.buf))  # Grid must not keep a view over shm
+    shm.close()
+    _worker_grid = Grid(walls)
+
+
+def _solve_chunk(queries: list[tuple[tuple[int, int], tuple[int, int]]], algo: str) -> list[SolveResult]:
+    """Runs in a worker. Solves a chunk of queries against the worker's Grid."""
+    return solve_batch(_worker_grid, queries, algo)
@@ -1,6 +1,10 @@
 """Creates square objects that drives the visualizations"""
 
 
+import numpy as np
+from itertools import compress
+
+
 class Square:
     """Defines the properties needed for each square on graph"""
 
@@ -8,16 +12,29 @@ class Square:
         "row",
         "col",
         "pos",
+        "index",
         "rows",
         "x",
         "y",
         "square_dim",
-        "neighbours",
-        "color",
         "wall_color",
-        "color_history",
-        "highway"
+        "state_history"
     )
+
+    # Possible states for square. Stored as uint8 codes in Square.states
+    _EMPTY = 0
+    _OPEN = 1
+    _OPEN2 = 2
+    _OPEN3 = 3
+    _CLOSED = 4
+    _CLOSED2 = 5
+    _CLOSED3 = 6
+    _START = 7
+    _MID = 8
+    _END = 9
+    _WALL = 10
+    _PATH = 11
+    _HISTORY = 12
     
     # Possible colors for square
     _DEFAULT_COLOR = (255, 255, 255)
@@ -34,6 +51,24 @@ class Square:
     __WALL_COLOR_MAP = (0, 0, 0)  # To avoid using over self.wall_color
     _PATH_COLOR = (255, 255, 0)
     _HISTORY_COLOR = (106, 13, 173)
+
+    # Color of each state, indexed by state code. Only looked up when rendering.
+    _STATE_COLORS = (
+        _DEFAULT_COLOR,
+        _OPEN_COLOR,
+        _OPEN2_COLOR,
+        _OPEN3_COLOR,
+        _CLOSED_COLOR,
+        _CLOSED2_COLOR,
+        _CLOSED3_COLOR,
+        _START_COLOR,
+        _MID_COLOR,
+        _END_COLOR,
+        __WALL_COLOR,
+        _PATH_COLOR,
+        _HISTORY_COLOR
+    )
+    _STATE_COLOR_TABLE = np.array(_STATE_COLORS, dtype=np.uint8)
     
     # Extend set class and remove ability to .copy() to
     # force use of copy module. This is for seamless compatibility
@@ -43,6 +78,23 @@ class Square:
     # Row-major order
     graph: list['Square'] = []
 
+    # State code and wall mask of every square in the same row-major order.
+    # Bytearrays give fast scalar access, numpy views over them are zero-copy.
+    states = bytearray()
+    walls = bytearray()
+
+    # Cost of stepping onto each square, highways are cheaper. Small ints so the bucket frontier still works.
+    _ROAD_COST = 2
+    _HIGHWAY_COST = 1
+    costs = bytearray()
+
+    # Neighbours of every square as CSR arrays, walls included so walls only change the mask above.
+    # Neighbours of square i are indices[indptr[i]:indptr[i+1]], ordered left, up, right, down.
+    indptr = np.zeros(1, dtype=np.int32)
+    indices = np.zeros(0, dtype=np.int32)
+    _indptr_list: list[int] = [0]  # Same as above, python ints are faster to slice and index one at a time
+    _indices_list: list[int] = []
+
     # Info about the squares
     num_rows = 46  # Default value.
     num_cols = 46  # Default value.
@@ -65,6 +117,23 @@ class Square:
     all_path_squares = set()
     all_history_squares = set()
 
+    # The set of squares for each state, indexed by state code
+    _squares_by_state = (
+        all_empty_squares,
+        all_open_squares,
+        all_open2_squares,
+        all_open3_squares,
+        all_closed_squares,
+        all_closed2_squares,
+        all_closed3_squares,
+        all_start_squares,
+        all_mid_squares,
+        all_end_squares,
+        all_wall_squares,
+        all_path_squares,
+        all_history_squares
+    )
+
     # All changed squares are queue for update each frame
     squares_to_update = set()
 
@@ -80,14 +149,12 @@ class Square:
         self.col = col
 
         self.pos = row, col
+        self.index = row * Square.num_cols + col
         self.x: float = self.row * Square.square_length
         self.y: float = self.col * Square.square_length
         self.square_dim = (self.x, self.y, int(Square.square_length), int(Square.square_length))
-        self.neighbours: dict = {}
-        self.color = Square._DEFAULT_COLOR
         self.wall_color = Square.__WALL_COLOR
-        self.color_history = None
-        self.highway = False
+        self.state_history = None
 
     def __bool__(self) -> bool:
         """Returns false for impossible squares"""
@@ -97,18 +164,27 @@ class Square:
         """Returns the square location"""
         return self.pos
 
+    def get_index(self) -> int:
+        """Returns the square location in the flat row-major graph"""
+        return self.index
+
+    def get_state(self) -> int:
+        """Returns the state code of the square"""
+        return Square.states[self.index]
+
     def get_color(self) -> tuple:
         """Gets color of square"""
-        return self.color
+        state = Square.states[self.index]
+        if state == Square._WALL:
+            return self.wall_color
+        return Square._STATE_COLORS[state]
     
     def get_neighbours(self) -> list:
         """Gets list of neighbours"""
-        neighbours = []
-        for direction in self.neighbours:
-            nei: Square = self.neighbours[direction]
-            # Append walls to list if nei exists
-            neighbours.append(nei)
-        return neighbours
+        if not self:
+            return []
+        indptr = Square._indptr_list
+        return [Square.graph[nei] for nei in Square._indices_list[indptr[self.index]:indptr[self.index + 1]]]
 
     def draw_square(self) -> tuple:
         """Updates the square with square type"""
@@ -116,59 +192,63 @@ class Square:
 
     def is_empty(self) -> bool:
         """Checks if blank square"""
-        return self.color == Square._DEFAULT_COLOR
+        return Square.states[self.index] == Square._EMPTY
 
     def is_open(self) -> bool:
         """Checks if open square"""
-        return self.color == Square._OPEN_COLOR
+        return Square.states[self.index] == Square._OPEN
 
     def is_open2(self) -> bool:
         """Checks if open square for second swarm of bi_dijkstra"""
-        return self.color == Square._OPEN2_COLOR
+        return Square.states[self.index] == Square._OPEN2
 
     def is_open3(self) -> bool:
         """Checks if open square for end square when mid is included"""
-        return self.color == Square._OPEN3_COLOR
+        return Square.states[self.index] == Square._OPEN3
 
     def is_closed(self) -> bool:
         """Checks if closed square"""
-        return self.color == Square._CLOSED_COLOR
+        return Square.states[self.index] == Square._CLOSED
 
     def is_closed2(self) -> bool:
         """Checks if closed square for second swarm of bi_dijkstra"""
-        return self.color == Square._CLOSED2_COLOR
+        return Square.states[self.index] == Square._CLOSED2
 
     def is_closed3(self) -> bool:
         """Checks if closed square for end square when mid is included"""
-        return self.color == Square._CLOSED3_COLOR
+        return Square.states[self.index] == Square._CLOSED3
 
     def is_start(self) -> bool:
         """Checks if start square"""
-        return self.color == Square._START_COLOR
+        return Square.states[self.index] == Square._START
 
     def is_mid(self) -> bool:
         """Checks if mid square"""
-        return self.color == Square._MID_COLOR
+        return Square.states[self.index] == Square._MID
 
     def is_end(self) -> bool:
         """Checks if end square"""
-        return self.color == Square._END_COLOR
+        return Square.states[self.index] == Square._END
 
     def is_wall(self) -> bool:
         """Checks if wall square"""
-        return self.color == self.wall_color
+        return Square.states[self.index] == Square._WALL
 
     def is_path(self) -> bool:
         """Checks if path square"""
-        return self.color == Square._PATH_COLOR
+        return Square.states[self.index] == Square._PATH
 
     def is_history(self) -> bool:
         """Checks if history square"""
-        return self.color == Square._HISTORY_COLOR
+        return Square.states[self.index] == Square._HISTORY
     
     def is_highway(self) -> bool:
         """Checks if square is a highway"""
-        return self.highway
+        return Square.costs[self.index] == Square._HIGHWAY_COST
+
+    def get_cost(self) -> int:
+        """Cost of stepping onto the square"""
+        return Square.costs[self.index]
 
     def reset(self) -> None:
         """Sets square to blank"""
@@ -181,8 +261,7 @@ class Square:
             Square.future_history_squares.add(self)
 
         self._discard_square()
-        self.color = Square._DEFAULT_COLOR
-        self.highway = False
+        self._set_state(Square._EMPTY)
         Square.squares_to_update.add(self)
         Square.all_empty_squares.add(self)
 
@@ -197,7 +276,7 @@ class Square:
             Square.future_history_squares.add(self)
 
         self._discard_square()
-        self.color = Square._OPEN_COLOR
+        self._set_state(Square._OPEN)
         Square.squares_to_update.add(self)
         Square.all_open_squares.add(self)
 
@@ -212,7 +291,7 @@ class Square:
             Square.future_history_squares.add(self)
 
         self._discard_square()
-        self.color = Square._OPEN2_COLOR
+        self._set_state(Square._OPEN2)
         Square.squares_to_update.add(self)
         Square.all_open2_squares.add(self)
 
@@ -229,7 +308,7 @@ class Square:
             Square.future_history_squares.add(self)
 
         self._discard_square()
-        self.color = Square._OPEN3_COLOR
+        self._set_state(Square._OPEN3)
         Square.squares_to_update.add(self)
         Square.all_open3_squares.add(self)
 
@@ -244,7 +323,7 @@ class Square:
             Square.future_history_squares.add(self)
 
         self._discard_square()
-        self.color = Square._CLOSED_COLOR
+        self._set_state(Square._CLOSED)
         Square.squares_to_update.add(self)
         Square.all_closed_squares.add(self)
 
@@ -259,7 +338,7 @@ class Square:
             Square.future_history_squares.add(self)
 
         self._discard_square()
-        self.color = Square._CLOSED2_COLOR
+        self._set_state(Square._CLOSED2)
         Square.squares_to_update.add(self)
         Square.all_closed2_squares.add(self)
 
@@ -274,7 +353,7 @@ class Square:
             Square.future_history_squares.add(self)
 
         self._discard_square()
-        self.color = Square._CLOSED3_COLOR
+        self._set_state(Square._CLOSED3)
         Square.squares_to_update.add(self)
         Square.all_closed3_squares.add(self)
 
@@ -289,7 +368,7 @@ class Square:
             Square.future_history_squares.add(self)
 
         self._discard_square(remove_wall=False)
-        self.color = Square._START_COLOR
+        self._set_state(Square._START)
         Square.squares_to_update.add(self)
         Square.all_start_squares.add(self)
 
@@ -304,7 +383,7 @@ class Square:
             Square.future_history_squares.add(self)
 
         self._discard_square(remove_wall=False)
-        self.color = Square._MID_COLOR
+        self._set_state(Square._MID)
         Square.squares_to_update.add(self)
         Square.all_mid_squares.add(self)
 
@@ -319,7 +398,7 @@ class Square:
             Square.future_history_squares.add(self)
 
         self._discard_square(remove_wall=False)
-        self.color = Square._END_COLOR
+        self._set_state(Square._END)
         Square.squares_to_update.add(self)
         Square.all_end_squares.add(self)
 
@@ -334,7 +413,7 @@ class Square:
             Square.future_history_squares.add(self)
 
         self._discard_square()
-        self.color = self.wall_color
+        self._set_state(Square._WALL)
         Square.squares_to_update.add(self)
         Square.all_wall_squares.add(self)
 
@@ -349,7 +428,7 @@ class Square:
             Square.future_history_squares.add(self)
 
         self._discard_square()
-        self.color = Square._PATH_COLOR
+        self._set_state(Square._PATH)
         Square.squares_to_update.add(self)
         Square.all_path_squares.add(self)
 
@@ -365,13 +444,13 @@ class Square:
 
         # Don't discard square from list as will be immediately revert color
         # Also don't add to squares_to_update as it is handled differently
-        self.color_history = self.color
-        self.color = Square._HISTORY_COLOR
+        self.state_history = Square.states[self.index]
+        self._set_state(Square._HISTORY)
         Square.all_history_squares.add(self)
     
     def set_history_rollback(self) -> None:
         """Set square to previous color before setting to history"""
-        self.color = self.color_history
+        self._set_state(self.state_history)
 
     def set_wall_color_map(self) -> None:
         """Resets wall color for map to default"""
@@ -379,56 +458,29 @@ class Square:
     
     def set_highway(self, x: bool) -> None:
         """Sets the square to highway"""
-        self.highway = x
+        Square.costs[self.index] = Square._HIGHWAY_COST if x else Square._ROAD_COST
     
-    def _update_neighbours(self) -> None:
-        """Updates this square's neighbours in the four cardinal directions"""
-        if self.col > 0:
-            self.neighbours["Left"] = Square.get_square(self.row, self.col - 1)
-        if self.row > 0:
-            self.neighbours["Up"] = Square.get_square(self.row - 1, self.col)
-        if self.col < Square.num_cols - 1:
-            self.neighbours["Right"] = Square.get_square(self.row, self.col + 1)
-        if self.row < Square.num_rows - 1:
-            self.neighbours["Down"] = Square.get_square(self.row + 1, self.col)
-
     def _reset_wall_color(self) -> None:
         """Resets wall color to default"""
         self.wall_color = Square.__WALL_COLOR
 
+    def _set_state(self, state: int) -> None:
+        """Writes the state code and wall mask of the square.
+        History only recolors for a moment, so a wall shown as history is still a wall to the algorithms.
+        """
+        Square.states[self.index] = state
+        if state != Square._HISTORY:
+            Square.walls[self.index] = state == Square._WALL
+
     def _discard_square(self, remove_wall=True) -> None:
         """Discard the square from corresponding set when changed"""
-        
+        state = Square.states[self.index]
+
         # Ordinal squares should not remove wall to reinstate after dragging
-        if not remove_wall and self.is_wall():
+        if not remove_wall and state == Square._WALL:
             return
-        
-        if self.is_empty():
-            Square.all_empty_squares.discard(self)
-        elif self.is_open():
-            Square.all_open_squares.discard(self)
-        elif self.is_open2():
-            Square.all_open2_squares.discard(self)
-        elif self.is_open3():
-            Square.all_open3_squares.discard(self)
-        elif self.is_closed():
-            Square.all_closed_squares.discard(self)
-        elif self.is_closed2():
-            Square.all_closed2_squares.discard(self)
-        elif self.is_closed3():
-            Square.all_closed3_squares.discard(self)
-        elif self.is_start():
-            Square.all_start_squares.discard(self)
-        elif self.is_mid():
-            Square.all_mid_squares.discard(self)
-        elif self.is_end():
-            Square.all_end_squares.discard(self)
-        elif self.is_wall():
-            Square.all_wall_squares.discard(self)
-        elif self.is_path():
-            Square.all_path_squares.discard(self)
-        elif self.is_history():
-            Square.all_history_squares.discard(self)
+
+        Square._squares_by_state[state].discard(self)
 
     @classmethod
     def init(cls, graph_width, pixel_offset=0) -> None:
@@ -439,15 +491,18 @@ class Square:
         
         # Update values
         cls._update_square_length(graph_width, pixel_offset)
+
+        # Every square starts empty. New buffers as old ones may still be viewed.
+        cls.states = bytearray(cls.num_rows * cls.num_cols)
+        cls.walls = bytearray(cls.num_rows * cls.num_cols)
+        cls.costs = bytearray([cls._ROAD_COST]) * (cls.num_rows * cls.num_cols)
         
         # Emplace each square into graph in row-major order
         for row in range(cls.num_rows):
             for col in range(cls.num_cols):
                 cls.graph.append(Square(row, col))
         
-        # Update neighbours once graph is done
-        for square in cls.graph:
-            square._update_neighbours()
+        cls._update_adjacency()
 
         cls.null_square = Square(-1, -1)
     
@@ -471,6 +526,41 @@ class Square:
         """Get square size of a single dimension"""
         return cls.square_length
     
+    @classmethod
+    def get_states(cls) -> np.ndarray:
+        """Get a (num_rows, num_cols) uint8 view of every square's state code"""
+        return np.frombuffer(cls.states, dtype=np.uint8).reshape(cls.num_rows, cls.num_cols)
+
+    @classmethod
+    def get_walls(cls) -> np.ndarray:
+        """Get a (num_rows, num_cols) bool view of where the walls are"""
+        return np.frombuffer(cls.walls, dtype=np.bool_).reshape(cls.num_rows, cls.num_cols)
+
+    @classmethod
+    def get_colors(cls) -> np.ndarray:
+        """Get a (num_rows, num_cols, 3) array of every square's rgb color"""
+        return cls._STATE_COLOR_TABLE[cls.get_states()]
+
+    @classmethod
+    def get_costs(cls) -> np.ndarray:
+        """Get a (num_rows, num_cols) uint8 view of the cost of stepping onto each square. Writable."""
+        return np.frombuffer(cls.costs, dtype=np.uint8).reshape(cls.num_rows, cls.num_cols)
+
+    @classmethod
+    def has_highways(cls) -> bool:
+        """Checks if any square is cheaper than a road"""
+        return cls._HIGHWAY_COST in cls.costs
+
+    @classmethod
+    def get_adjacency(cls) -> tuple[np.ndarray, np.ndarray]:
+        """Get the (indptr, indices) int32 CSR arrays of every square's neighbours"""
+        return cls.indptr, cls.indices
+
+    @classmethod
+    def get_adjacency_lists(cls) -> tuple[list[int], list[int]]:
+        """Same as get_adjacency as lists, for expanding one square at a time"""
+        return cls._indptr_list, cls._indices_list
+
     @classmethod
     def get_all_empty_squares(cls) -> list:
         """Gets all empty squares"""
@@ -596,6 +686,9 @@ class Square:
                 square._reset_wall_color()
                 square.reset()
 
+        # Costs are kept when squares are reset so clearing the algorithm keeps the highways
+        cls.costs[:] = bytes([cls._ROAD_COST]) * len(cls.costs)
+
     @classmethod
     def clear_squares_to_update(cls) -> None:
         """Clears squares to update"""
@@ -683,8 +776,38 @@ class Square:
             raise NotImplementedError("Invalid square type provided")
 
     @classmethod
-    def set_square_color_by_array(cls, pixels_r, pixels_g, pixels_b) -> None:
-        """Set the square colors based on the 2D array of rgb values."""
+    def set_square_color_by_indices(cls, indices: np.ndarray, square_type: str) -> None:
+        """Sets the squares at an array of flat indices to open or closed at once.
+        Same result as set_square_color_by_group on those squares.
+        """
+        if square_type == "open":
+            new_state, new_squares = cls._OPEN, cls.all_open_squares
+        elif square_type == "closed":
+            new_state, new_squares = cls._CLOSED, cls.all_closed_squares
+        else:
+            raise NotImplementedError("Invalid square type provided")
+
+        # Only squares changing state need their sets and the update queue touched
+        states = np.frombuffer(cls.states, dtype=np.uint8)
+        changed = indices[states[indices] != new_state]
+        changed_squares = [cls.graph[index] for index in changed.tolist()]
+        old_states = states[changed]
+        for state in np.unique(old_states).tolist():
+            cls._squares_by_state[state].difference_update(compress(changed_squares, (old_states == state).tolist()))
+        new_squares.update(changed_squares)
+
+        cls.squares_to_update.update(changed_squares)
+        if cls.track_square_history:
+            cls.future_history_squares.update(changed_squares)
+
+        states[changed] = new_state
+        np.frombuffer(cls.walls, dtype=np.uint8)[changed] = False
+
+    @classmethod
+    def set_square_color_by_array(cls, pixels: np.ndarray) -> None:
+        """Set the square colors based on a (width, height, 3) array of rgb values, e.g. from pixels3d.
+        Every square becomes a wall or empty, empty squares can also be highways.
+        """
 
         ROAD_CUTOFF = 1  # Any value above this is a road
         HIGHWAY_CUTOFF = 225  # Any value below this is a highway
@@ -693,27 +816,71 @@ class Square:
         square_length_squared = square_length * square_length
         length_int = int(square_length)
 
+        # Split both axes into squares then sum each square's pixels. Views until the sum.
+        # Summing the strided axis with adds of whole slices is several times faster than sum(axis=1).
+        pixels = pixels[:cls.num_rows * length_int, :cls.num_cols * length_int]
+        blocks = pixels.reshape(cls.num_rows, length_int, cls.num_cols, length_int, 3)
+        col_sums = blocks.sum(axis=3, dtype=np.uint32)
+        sums = col_sums[:, 0].copy()
+        for x in range(1, length_int):
+            sums += col_sums[:, x]
+        rgb_avg = sums.sum(axis=2) / square_length_squared * 3
+        blue_avg = sums[:, :, 2] / square_length_squared
+
+        # Set squares to roads, highways and non pathable space
+        wall_mask = (rgb_avg < ROAD_CUTOFF).ravel()
+        highway_mask = (blue_avg < HIGHWAY_CUTOFF).ravel() & ~wall_mask
+        new_states = np.where(wall_mask, cls._WALL, cls._EMPTY).astype(np.uint8)
+
+        # Only squares changing state need their sets and the update queue touched
+        states = np.frombuffer(cls.states, dtype=np.uint8)
+        changed = np.flatnonzero(states != new_states)
+        changed_squares = [cls.graph[index] for index in changed.tolist()]
+        old_states = states[changed]
+        for state in np.unique(old_states).tolist():
+            if cls._squares_by_state[state]:
+                cls._squares_by_state[state].difference_update(
+                    compress(changed_squares, (old_states == state).tolist()))
+        changed_walls = wall_mask[changed].tolist()
+        changed_empties = (~wall_mask[changed]).tolist()
+        cls.all_wall_squares.update(compress(changed_squares, changed_walls))
+        cls.all_empty_squares.update(compress(changed_squares, changed_empties))
+
+        cls.squares_to_update.update(changed_squares)
+        if cls.track_square_history:
+            cls.future_history_squares.update(changed_squares)
+
+        states[:] = new_states
+        np.frombuffer(cls.walls, dtype=np.uint8)[:] = wall_mask
+
+        # Every square's cost comes from the map, same as set_highway on each square
+        np.frombuffer(cls.costs, dtype=np.uint8)[:] = np.where(highway_mask, cls._HIGHWAY_COST, cls._ROAD_COST)
+
         square: Square
-        for index, square in enumerate(cls.graph):
-            square.set_wall_color_map()
-            row, col = square.get_pos()
-
-            rgb_sum = 0
-            blue_sum = 0  # Used for highway
-            for x in range(row * length_int, (row+1) * length_int):
-                for y in range(col * length_int, (col+1) * length_int):
-                    rgb_sum += pixels_r[x][y] + pixels_g[x][y] + pixels_b[x][y]
-                    blue_sum += pixels_b[x][y]
-            rgb_avg = rgb_sum / square_length_squared * 3
-            blue_avg = blue_sum / square_length_squared
-
-            # Set squares to roads, highways and non pathable space
-            if rgb_avg < ROAD_CUTOFF:
-                square.set_wall()
-            else:
-                square.reset()
-                if blue_avg < HIGHWAY_CUTOFF:
-                    square.set_highway(True)
+        for square in cls.graph:
+            square.wall_color = Square.__WALL_COLOR_MAP
+
+    @classmethod
+    def _update_adjacency(cls) -> None:
+        """Builds the CSR neighbours of the four cardinal directions for the current graph size"""
+        size = cls.num_rows * cls.num_cols
+        index = np.arange(size, dtype=np.int32)
+        rows, cols = np.divmod(index, cls.num_cols)
+        directions = (
+            (cols > 0, -1),
+            (rows > 0, -cls.num_cols),
+            (cols < cls.num_cols - 1, 1),
+            (rows < cls.num_rows - 1, cls.num_cols)
+        )
+
+        # One column per direction, missing neighbours are dropped when flattening row by row
+        in_graph = np.stack([direction for direction, _ in directions], axis=1)
+        neighbours = np.stack([index + offset for _, offset in directions], axis=1)
+        cls.indptr = np.zeros(size + 1, dtype=np.int32)
+        np.cumsum(in_graph.sum(axis=1), out=cls.indptr[1:])
+        cls.indices = neighbours[in_graph].astype(np.int32)
+        cls._indptr_list = cls.indptr.tolist()
+        cls._indices_list = cls.indices.tolist()
 
     @classmethod
     def update_num_rows_cols(cls, new_num) -> None:
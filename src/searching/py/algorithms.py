@@ -2,12 +2,12 @@
 
 
 from src.searching.py.utils.colors import *
-import matplotlib.pyplot as plt
+from src.bar_blitter import BarBlitter
 import numpy as np
 from src.searching.py.utils.values import get_sqrt
 
 
-def linear(vis: plt.bar,
+def linear(vis: BarBlitter,
            key: int,
            array: np.ndarray,
            array_size: int,
@@ -24,21 +24,21 @@ def linear(vis: plt.bar,
 
     for i in range(low, high):
         vis[i].set_color(GOLD)
-        plt.pause(pause_short)
+        vis.pause(pause_short)
 
         if array[i] != key:
             vis[i].set_color(RED)
-            plt.pause(pause_short)
+            vis.pause(pause_short)
         elif array[i] == key:
             vis[i].set_color(GREEN)
             for bar in range(i+1, array_size):
                 vis[bar].set_color(RED)
 
-            plt.draw()
+            vis.draw()
             return
 
 
-def binary(vis: plt.bar,
+def binary(vis: BarBlitter,
            key: int,
            array: np.ndarray,
            array_size: int,
@@ -66,17 +66,17 @@ def binary(vis: plt.bar,
                 for bar in range(low - 1, mid):
                     vis[bar].set_color(RED)
 
-                plt.draw()
+                vis.draw()
                 return
             else:
                 for bar in range(low - 1, array_size):
                     vis[bar].set_color(RED)
 
-                plt.draw()
+                vis.draw()
                 return
 
         vis[mid].set_color(MAGENTA)
-        plt.pause(pause_long)
+        vis.pause(pause_long)
 
         if array[mid] > key:
             if high < array_size-1:
@@ -103,16 +103,16 @@ def binary(vis: plt.bar,
             for i in range(mid+1, upper):
                 vis[i].set_color(RED)
 
-            plt.draw()
+            vis.draw()
             return
 
     for bar in range(lower, upper):
         vis[bar].set_color(RED)
 
-    plt.draw()
+    vis.draw()
 
 
-def jump(vis: plt.bar,
+def jump(vis: BarBlitter,
          key: int,
          array: np.ndarray,
          array_size: int,
@@ -130,7 +130,7 @@ def jump(vis: plt.bar,
         for bar in range(array_size):
             vis[bar].set_color(RED)
 
-        plt.draw()
+        vis.draw()
         return
 
     while left < array_size:
@@ -138,12 +138,12 @@ def jump(vis: plt.bar,
 
         vis[left].set_color(CYAN)
         vis[right].set_color(CYAN)
-        plt.pause(pause_long)
+        vis.pause(pause_long)
 
         if array[left] <= key <= array[right]:
             for i in range(right+1, array_size):
                 vis[i].set_color(RED)
-            plt.pause(pause_long)
+            vis.pause(pause_long)
 
             linear(vis, key, array, array_size, pause_short, left, right + 1)
             return
@@ -154,11 +154,11 @@ def jump(vis: plt.bar,
 
         left += step + 1
 
-    plt.draw()
+    vis.draw()
 
 
 # Does weird stuff when searching for 48 with array. The height arg for binary search probably is the cause.
-def exponential(vis: plt.bar,
+def exponential(vis: BarBlitter,
                 key: int,
                 array: np.ndarray,
                 array_size: int,
@@ -170,7 +170,7 @@ def exponential(vis: plt.bar,
     """
 
     vis[0].set_color(GOLD)
-    plt.pause(pause_long)
+    vis.pause(pause_long)
     vis[0].set_color(RED)
 
     if array[0] == key:
@@ -191,7 +191,7 @@ def exponential(vis: plt.bar,
             for j in range(temp_low, temp):
                 vis[j].set_color(RED)
             vis[i].set_color(CYAN)
-        plt.pause(pause_long)
+        vis.pause(pause_long)
         temp = i
         temp_low = int(temp / 2)
 
@@ -205,7 +205,7 @@ def exponential(vis: plt.bar,
         return binary(vis, key, array, array_size, pause_long)
 
 
-def fibonacci(vis: plt.bar,
+def fibonacci(vis: BarBlitter,
               key: int,
               array: np.ndarray,
               array_size: int,
@@ -220,7 +220,7 @@ def fibonacci(vis: plt.bar,
     fib: int = fib_minus_1 + fib_minus_2
 
     vis[fib_minus_2].set_color(CYAN)
-    plt.pause(pause_long)
+    vis.pause(pause_long)
 
     while fib < array_size:
         fib_minus_2 = fib_minus_1
@@ -229,7 +229,7 @@ def fibonacci(vis: plt.bar,
 
         if fib < array_size:
             vis[fib].set_color(CYAN)
-            plt.pause(pause_long)
+            vis.pause(pause_long)
 
     index: int = -1
 
@@ -237,7 +237,7 @@ def fibonacci(vis: plt.bar,
         i: int = min(index + fib_minus_2, (array_size - 1))
 
         vis[i].set_color(MAGENTA)
-        plt.pause(pause_long)
+        vis.pause(pause_long)
 
         if array[i] < key:
             for j in range(i+1):
@@ -261,7 +261,7 @@ def fibonacci(vis: plt.bar,
             for bar in range(i+1, array_size):
                 vis[bar].set_color(RED)
 
-            plt.draw()
+            vis.draw()
             return
 
-    plt.draw()
+    vis.draw()
@@ -7,6 +7,7 @@ import matplotlib.pyplot as plt
 from matplotlib.widgets import Button, Slider, TextBox
 import src.searching.py.algorithms as search
 from src.searching.py.utils.values import generate_array
+from src.bar_blitter import BarBlitter
 
 
 @dataclass
@@ -18,7 +19,7 @@ class Graph:
     labels: list[int]        # Name of xaxis values. Setting to index of array.
     key: int
 
-    vis: plt.bar                                             # Object that contains the graph
+    vis: BarBlitter                          # Bars of the graph, only redrawing those that change
     pause_short: float                  # Sets pause length for visualizations. Relative to size.
     pause_long: float   # Longer pause that is needed for certain visualizations
     hesitate: float                                      # Pause before starting animations
@@ -30,7 +31,7 @@ def set_graph(g: Graph, initialize=False) -> None:
 
     # Clears previous graph for update
     plt.clf()
-    g.vis = plt.bar(g.labels, g.array, color=DEFAULT)
+    g.vis = BarBlitter(plt.gca(), g.array, DEFAULT)
     plt.subplots_adjust(left=0.15, bottom=0.3)
 
     # Shows 'x', 'y' or 'xy' axis
@@ -49,7 +50,7 @@ def buttons_sliders(g: Graph, initialize=False) -> None:
     stop_loc = plt.axes([0.85, 0.01, 0.1, 0.05])  # left, bottom, width, height
     stop = Button(ax=stop_loc, label='Stop', color=RED)
     size_loc = plt.axes([0.05, 0.235, 0.05, 0.5])
-    size = Slider(ax=size_loc, label='Size & Speed', valmin=5, valmax=100,
+    size = Slider(ax=size_loc, label='Size & Speed', valmin=5, valmax=10000,
                   valinit=g.array_size, valstep=1, orientation='vertical')
     text_loc = plt.axes([0.475, 0.01, 0.3, 0.05])
     text = TextBox(ax=text_loc, label='Enter search value (1-150): ', initial=str(g.key))
@@ -155,7 +156,7 @@ def update_array(g: Graph) -> None:
     g.array = generate_array(0, 150, g.array_size)
     g.labels = [label for label in range(g.array_size)]
     g.pause_short = 150 / g.array_size * 0.01
-    g.pause_long = (g.pause_short * 3) + (g.array_size * 0.005)
+    g.pause_long = (g.pause_short * 3) + (min(g.array_size, 100) * 0.005)  # Under a second, however many bars
     set_graph(g)
 
 
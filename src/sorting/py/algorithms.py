@@ -1,106 +1,68 @@
-"""Contains sorting algorithms"""
+"""Contains sorting algorithms.
+Each algorithm sorts array in place as a generator, yielding an event for every step as (event, a, b).
+Nothing is drawn here, graph.play draws the events and exhausting the generator just sorts.
+"""
 
 
-from src.sorting.py.utils.colors import *
-import matplotlib.pyplot as plt
+from typing import Generator, Iterator
+import math
 import numpy as np
-from src.sorting.py.utils.values import generate_array, get_factorial
+from src.sorting.py.utils.values import generate_array, get_log10_factorial
 
 
-def selection(vis: plt.bar,
-              array: np.ndarray,
-              array_size: int,
-              pause_short: float,
-              pause_mid: float) \
-              -> None:
+# Events yielded by the algorithms. What a and b hold for each:
+COMPARE = 0  # Indices of the two values compared
+SWAP = 1  # Indices of the two values that traded places
+SET = 2  # Index written to and the value written, e.g. by merging
+SORTED = 3  # Start and stop of a range of indices whose values are in their final place
 
+Events = Iterator[tuple[int, int, int]]
+
+
+def selection(array: np.ndarray, array_size: int) -> Events:
     """Goes through list comparing values of the current number to all values after, swapping as needed.
     Complexity: Time - O(n^2), Space - O(1), Unstable
     """
 
     for i in range(array_size - 1):
-        vis[i].set_color(BLACK)
-        plt.pause(pause_mid)
-
         index: int = i
         for j in range(i + 1, array_size):
-            vis[j].set_color(GOLD)
-            plt.pause(pause_short)
-
+            yield COMPARE, j, index
             if array[j] < array[index]:
-                vis[j].set_color(CYAN)
-                if index != i:
-                    vis[index].set_color(GOLD)
-
                 index = j
 
-        # Swaps bars while maintaining color for each
-        vis[i].set_height(array[index])
-        vis[i].set_color(CYAN)
         array[i], array[index] = array[index], array[i]
-        vis[index].set_height(array[index])
-        vis[index].set_color(BLACK)
-        plt.pause(pause_mid)
-
-        vis[i].set_color(GREEN)
-        for b in range(i+1, array_size):
-            vis[b].set_color(DEFAULT)
-
-        if i == array_size-2:
-            for b in range(i, array_size):
-                vis[b].set_color(GREEN)
-
-    plt.draw()
+        yield SWAP, i, index
+        yield SORTED, i, i + 1
 
+    yield SORTED, 0, array_size
 
-def insertion(vis: plt.bar,
-              array: np.ndarray,
-              array_size: int,
-              pause_short: float) \
-              -> None:
 
+def insertion(array: np.ndarray, array_size: int) -> Events:
     """Splits input into the sorted and unsorted parts. Places unsorted elements to the correct position.
     Complexity: Time - O(n^2), Space - O(1), Stable
     """
 
-    for i in range(1, array_size):
-        a: int = i
+    yield from _insertion(array, 0, array_size)
+    yield SORTED, 0, array_size
 
-        vis[a].set_color(RED)
 
-        while a > 0 and array[a] < array[a - 1]:
-            # Swaps bars while maintaining color for each
-            vis[a].set_color(RED)
-            vis[a-1].set_color(GOLD)
-            plt.pause(pause_short)
-            vis[a].set_color(DEFAULT)
-            vis[a-1].set_color(DEFAULT)
+def _insertion(array: np.ndarray, start: int, stop: int) -> Events:
+    """Helper function for insertion. Sorts the values from start up to stop."""
 
-            vis[a].set_height(array[a-1])
-            array[a], array[a-1] = array[a-1], array[a]
-            vis[a-1].set_height(array[a-1])
+    for i in range(start + 1, stop):
+        a: int = i
+        while a > start:
+            yield COMPARE, a, a - 1
+            if not array[a] < array[a - 1]:
+                break
 
+            array[a], array[a - 1] = array[a - 1], array[a]
+            yield SWAP, a, a - 1
             a -= 1
-        else:
-            if a < array_size-1:
-                vis[a+1].set_color(GOLD)
-            vis[a].set_color(RED)
-            plt.pause(pause_short)
-            if a < array_size-1:
-                vis[a+1].set_color(DEFAULT)
-            vis[a].set_color(DEFAULT)
-
-    for b in range(array_size):
-        vis[b].set_color(GREEN)
-    plt.draw()
 
 
-def bubble(vis: plt.bar,
-           array: np.ndarray,
-           array_size: int,
-           pause_short: float) \
-           -> None:
-
+def bubble(array: np.ndarray, array_size: int) -> Events:
     """Swaps adjacent elements if they are in the wrong order.
     Repeats n-1 times with max index to check decreasing by 1.
     Complexity: Time - O(n^2), Space - O(1), Stable
@@ -108,366 +70,180 @@ def bubble(vis: plt.bar,
 
     for i in range(array_size - 1):
         for j in range(0, array_size-i - 1):
-            vis[j].set_color(RED)
-            vis[j+1].set_color(GOLD)
-            plt.pause(pause_short)
-
-            if array[j] > array[j+1]:
-                # Swaps bars while maintaining color for each
-                vis[j].set_height(array[j+1])
-                vis[j].set_color(GOLD)
+            yield COMPARE, j, j + 1
+            if array[j+1] < array[j]:
                 array[j], array[j+1] = array[j+1], array[j]
-                vis[j+1].set_height(array[j+1])
-                vis[j+1].set_color(RED)
-                plt.pause(pause_short)
-
-            vis[j].set_color(DEFAULT)
-            vis[j+1].set_color(DEFAULT)
-
-            if j == array_size-i - 2:
-                vis[j+1].set_color(GREEN)
+                yield SWAP, j, j + 1
 
-    vis[0].set_color(GREEN)
-    plt.draw()
+        yield SORTED, array_size-i - 1, array_size-i
 
+    yield SORTED, 0, array_size
 
-def heap(vis: plt.bar,
-         array: np.ndarray,
-         array_size: int,
-         pause_short: float,
-         pause_long: float) \
-         -> None:
 
+def heap(array: np.ndarray, array_size: int) -> Events:
     """Converts input into a max heap data structure and pops values.
     Complexity: Time - O(nlog(n)), Space - O(1), Unstable
     """
 
     # Puts values in heap
     for i in range(array_size // 2 - 1, -1, -1):
-        _heap(vis, array, pause_short, array_size, i)
-
-    # Show that values are now in heap
-    for b in range(array_size):
-        vis[b].set_color(BLACK)
-    plt.pause(pause_long)
+        yield from _heap(array, array_size, i)
 
     # Sorts values from min to max, max first
     for i in range(array_size - 1, 0, -1):
-        vis[i].set_color(GOLD)
-        vis[0].set_color(GOLD)
-        for b in range(i):
-            vis[b].set_color(BLACK)
-        plt.pause(pause_short)
-        for b in range(i):
-            vis[b].set_color(DEFAULT)
-
-        vis[i].set_height(array[0])
         array[i], array[0] = array[0], array[i]
-        vis[0].set_height(array[0])
-        vis[i].set_color(GREEN)
-        plt.pause(pause_short)
-        vis[0].set_color(DEFAULT)
-
-        _heap(vis, array, pause_short, i, 0)
-
-    vis[0].set_color(GREEN)
-    plt.draw()
-
+        yield SWAP, 0, i
+        yield SORTED, i, i + 1
 
-def _heap(vis: plt.bar,
-          array: np.ndarray,
-          pause_short: float,
-          length: int,
-          i: int) \
-          -> None:
+        yield from _heap(array, i, 0)
 
-    """Helper function for heap"""
+    yield SORTED, 0, array_size
 
-    largest: int = i
-    left: int = 2 * i + 1
-    right: int = 2 * i + 2
 
-    vis[i].set_color(GOLD)
+def _heap(array: np.ndarray, length: int, i: int) -> Events:
+    """Helper function for heap. Sifts i down the heap made of the first length values."""
 
-    if left < length:
-        vis[left].set_color(GOLD)
-        if array[largest] < array[left]:
-            largest = left
+    while True:
+        largest: int = i
+        left: int = 2 * i + 1
+        right: int = 2 * i + 2
 
-    if right < length:
-        vis[right].set_color(GOLD)
-        if array[largest] < array[right]:
-            largest = right
+        if left < length:
+            yield COMPARE, largest, left
+            if array[largest] < array[left]:
+                largest = left
 
-    plt.pause(pause_short)
+        if right < length:
+            yield COMPARE, largest, right
+            if array[largest] < array[right]:
+                largest = right
 
-    if largest != i:
-        vis[i].set_color(RED)
-        vis[largest].set_color(RED)
-        plt.pause(pause_short)
+        if largest == i:
+            return
 
-        vis[i].set_height(array[largest])
         array[i], array[largest] = array[largest], array[i]
-        vis[largest].set_height(array[largest])
-        plt.pause(pause_short)
-
-        _heap(vis, array, pause_short, length, largest)
-
-    vis[i].set_color(DEFAULT)
-    if left < length:
-        vis[left].set_color(DEFAULT)
-    if right < length:
-        vis[right].set_color(DEFAULT)
-
+        yield SWAP, i, largest
+        i = largest
 
-def quick(vis: plt.bar,
-          array: np.ndarray,
-          array_size: int,
-          pause_short: float,
-          start: int = 0,
-          end: int = -1) \
-          -> None:
 
+def quick(array: np.ndarray, array_size: int) -> Events:
     """Sets a pivot value and places every value below the pivot before and all values greater after.
-    Repeats recursively until only single element partitions remains.
+    Repeats until only single element partitions remains.
     Complexity: Time - O(nlog(n)), Space - O(log(n)), Unstable
     """
 
-    if end == -1:
-        end = array_size - 1
+    # Partitions left to do as (start, end). A stack instead of recursion so events aren't passed up every level.
+    partitions: list[tuple[int, int]] = [(0, array_size - 1)]
+    while partitions:
+        start, end = partitions.pop()
+        if end <= start:
+            if end == start:
+                yield SORTED, start, start + 1
+            continue
 
-    if end <= start:
-        return
+        high = yield from _quick(array, start, end)
 
-    high = _quick(vis, array, pause_short, start, end)
+        partitions.append((high + 1, end))
+        partitions.append((start, high))
 
-    quick(vis, array, array_size, pause_short, start, high)
+    yield SORTED, 0, array_size
 
-    quick(vis, array, array_size, pause_short, high + 1, end)
 
-    if end == array_size-1:
-        vis[end].set_color(GREEN)
-        vis[end-1].set_color(GREEN)  # Sometimes this one is colored.
-        plt.draw()
-
-
-def _quick(vis: plt.bar,
-           array: np.ndarray,
-           pause_short: float,
-           start: int,
-           end: int) \
-           -> int:
-
-    """Helper function for quick"""
+def _quick(array: np.ndarray, start: int, end: int) -> Generator[tuple[int, int, int], None, int]:
+    """Helper function for quick. Returns the last index of the lower partition."""
 
     mid: int = start + (end - start) // 2
     pivot: int = array[mid]
 
-    vis[mid].set_color(MAGENTA)
-    plt.pause(pause_short)
-
     low: int = start
     high: int = end
 
-    done: bool = False
-    while not done:
+    while True:
+        yield COMPARE, low, mid
         while array[low] < pivot:
-            if low != mid:
-                vis[low].set_color(RED)
-                plt.pause(pause_short)
             low += 1
+            yield COMPARE, low, mid
 
+        yield COMPARE, high, mid
         while pivot < array[high]:
-            if high != mid:
-                vis[high].set_color(CYAN)
-                plt.pause(pause_short)
             high -= 1
+            yield COMPARE, high, mid
 
         if low >= high:
-            done = True
-        else:
-            if low != mid:
-                vis[low].set_color(CYAN)
-            if high != mid:
-                vis[high].set_color(RED)
-            plt.pause(pause_short)
-            if low != mid and high != mid:
-                vis[low].set_color(RED)
-                vis[high].set_color(CYAN)
-            elif low == mid and high == mid:
-                vis[mid].set_color(MAGENTA)     # Does nothing. Avoiding using pass
-            elif low == mid:
-                vis[low].set_color(RED)
-                vis[high].set_color(MAGENTA)
-            elif high == mid:
-                vis[high].set_color(CYAN)
-                vis[low].set_color(MAGENTA)
-
-            vis[low].set_height(array[high])
-            array[low], array[high] = array[high], array[low]
-            vis[high].set_height(array[high])
-            plt.pause(pause_short)
+            return high
 
-            low += 1
-            high -= 1
+        array[low], array[high] = array[high], array[low]
+        yield SWAP, low, high
 
-    for b in range(start, end+1):
-        vis[b].set_color(DEFAULT)
+        # The pivot value moves with the swap
+        if mid == low:
+            mid = high
+        elif mid == high:
+            mid = low
 
-    if end - start <= 1:
-        for i in range(end+1):
-            vis[i].set_color(GREEN)
+        low += 1
+        high -= 1
 
-    return high
 
-
-def merge(vis: plt.bar,
-          array: np.ndarray,
-          array_size: int,
-          pause_short: float,
-          i: int = 0,
-          key: int = -1) \
-          -> None:
-
-    """Recursively splits input in halves. Sorts each element at each level bottom up.
+def merge(array: np.ndarray, array_size: int) -> Events:
+    """Splits input in halves until single values remain. Merges each pair of halves bottom up.
     Complexity: Time - O(nlog(n)), Space - O(n), Stable
     """
 
-    if key == -1:
-        key = array_size - 1
+    # Ranges left to do as (i, key, halves_sorted). Both halves are done before the merge that joins them.
+    ranges: list[tuple[int, int, bool]] = [(0, array_size - 1, False)]
+    while ranges:
+        i, key, halves_sorted = ranges.pop()
+        if i >= key:
+            continue
 
-    if i < key:
         j: int = (i + key) // 2
+        if halves_sorted:
+            yield from _merge(array, i, j, key)
+        else:
+            ranges.append((i, key, True))
+            ranges.append((j + 1, key, False))
+            ranges.append((i, j, False))
 
-        merge(vis, array, array_size, pause_short, i, j)
-        merge(vis, array, array_size, pause_short, j + 1, key)
-
-        _merge(vis, array, array_size, pause_short, i, j, key)
-
-    if i == 0 and key == array_size - 1:
-        plt.draw()
-
+    yield SORTED, 0, array_size
 
-def _merge(vis: plt.bar,
-           array: np.ndarray,
-           array_size: int,
-           pause_short: float,
-           i: int,
-           j: int,
-           key: int) \
-           -> None:
 
-    """Helper function for merge"""
+def _merge(array: np.ndarray, i: int, j: int, key: int) -> Events:
+    """Helper function for merge. Merges the sorted values from i to j with those from j+1 to key."""
 
-    merged_size: int = key - i + 1
-    merged_numbers: list = [0] * merged_size
-    merge_pos: int = 0
+    merged_numbers: list = []
     left_pos: int = i
     right_pos: int = j + 1
 
-    left_bar, right_bar = left_pos, right_pos
-    temp: np.ndarray = array.copy()
-
-    # Compares left and right merge and places lowest of each first.
+    # Compares left and right merge and places lowest of each first. Left goes first on ties to stay stable.
     while left_pos <= j and right_pos <= key:
-        vis[left_bar].set_color(RED)
-        vis[right_bar].set_color(GOLD)
-        plt.pause(pause_short)
-
-        # If left bar less, it's already in place.
-        if array[left_pos] <= array[right_pos]:
-            if i != 0 or key != array_size-1:
-                vis[left_bar].set_color(DEFAULT)
-            else:
-                vis[left_bar].set_color(GREEN)
-            vis[right_bar].set_color(DEFAULT)
-            left_bar += 1
-
-            merged_numbers[merge_pos] = array[left_pos]
-            left_pos += 1
-
-        # If right bar is less, shifts everything in between left and right bar to the right.
-        # Moves right bar to the left spot, moves the left bar one spot ahead.
-        else:
-            t = temp.copy()
-            temp[left_bar] = array[right_pos]
-            for b in range(left_bar, right_bar):
-                temp[b + 1] = t[b]
-                vis[b].set_height(temp[b])
-            left_bar += 1
-            vis[left_bar].set_color(RED)
-            vis[right_bar].set_height(temp[right_bar])
-            vis[right_bar].set_color(DEFAULT)
-            right_bar += 1
-            plt.pause(pause_short)
-            if i != 0 or key != array_size-1:
-                vis[left_bar-1].set_color(DEFAULT)
-            else:
-                vis[left_bar-1].set_color(GREEN)
-            vis[left_bar].set_color(DEFAULT)
-
-            merged_numbers[merge_pos] = array[right_pos]
+        yield COMPARE, left_pos, right_pos
+        if array[right_pos] < array[left_pos]:
+            merged_numbers.append(array[right_pos])
             right_pos += 1
-
-        merge_pos += 1
-
-    # Runs when right merge ends before left merge. Rest of left's values are just added as it's already sorted.
-    while left_pos <= j:
-        vis[left_bar].set_color(MAGENTA)
-        plt.pause(pause_short)
-        if i != 0 or key != array_size-1:
-            vis[left_bar].set_color(DEFAULT)
-        else:
-            vis[left_bar].set_color(GREEN)
-        left_bar += 1
-
-        merged_numbers[merge_pos] = array[left_pos]
-        left_pos += 1
-        merge_pos += 1
-
-    # Runs when left merge ends before right merge. Rest of right's values are just added as it's already sorted.
-    while right_pos <= key:
-        vis[right_bar].set_color(MAGENTA)
-        plt.pause(pause_short)
-
-        for b in range(left_bar, right_bar):  # Shifts bars between left and right-1 over by 1
-            vis[b + 1].set_height(array[b])
-        left_bar += 1
-        vis[left_bar-1].set_height(array[right_pos])  # Moves right bar to left bar's original position
-        vis[right_bar].set_color(DEFAULT)  # Removes right bar's original position's color
-        vis[left_bar-1].set_color(MAGENTA)    # Adds color to current right bar
-        plt.pause(pause_short)
-        if i != 0 or key != array_size - 1:
-            vis[left_bar-1].set_color(DEFAULT)  # Removes right bar's color
         else:
-            vis[left_bar-1].set_color(GREEN)
-        right_bar += 1
-
-        merged_numbers[merge_pos] = array[right_pos]
-        right_pos += 1
-        merge_pos += 1
+            merged_numbers.append(array[left_pos])
+            left_pos += 1
 
-    # Commits the current sorted values to array. Redundant for visualization but necessary for the sort.
-    for merge_pos in range(merged_size):
-        array[i + merge_pos] = merged_numbers[merge_pos]
+    # Whichever merge is left over is already sorted
+    merged_numbers.extend(array[left_pos:j + 1])
+    merged_numbers.extend(array[right_pos:key + 1])
 
+    for merge_pos, num in enumerate(merged_numbers, i):
+        array[merge_pos] = num
+        yield SET, merge_pos, num
 
-# Seems to use insertion too much. Possibly a bug.
-def tim(vis: plt.bar,
-        array: np.ndarray,
-        array_size: int,
-        pause_short: float) \
-        -> None:
 
+def tim(array: np.ndarray, array_size: int) -> Events:
     """Combination of merge sort and insertion sort.
     Divides input into blocks, sorts using insertion, combines using merge.
-    Complexity: Time - O(nlog(n)), Space - O(1), Stable
+    Complexity: Time - O(nlog(n)), Space - O(n), Stable
     """
 
-    min_run = _min_run(array_size)
+    min_run = max(_min_run(array_size), 1)  # Empty arrays have no runs
 
     for start in range(0, array_size, min_run):
-        insertion(vis, array, array_size, pause_short)
+        yield from _insertion(array, start, min(start + min_run, array_size))
 
     size: int = min_run
     while size < array_size:
@@ -478,10 +254,12 @@ def tim(vis: plt.bar,
             right: int = min((left + 2 * size - 1), (array_size - 1))
 
             if mid < right:
-                _merge(vis, array, array_size, pause_short, left, mid, right)
+                yield from _merge(array, left, mid, right)
 
         size *= 2
 
+    yield SORTED, 0, array_size
+
 
 def _min_run(n: int) -> int:
     """Minimum size needed for merge sort, else insertion sort"""
@@ -495,13 +273,7 @@ def _min_run(n: int) -> int:
     return n + r
 
 
-def radix(vis: plt.bar,
-          array: np.ndarray,
-          array_size: int,
-          pause_short: float,
-          pause_long: float) \
-          -> None:
-
+def radix(array: np.ndarray, array_size: int) -> Events:
     """Only for integers. Places values into buckets from the least to most significant digit. Sorts with buckets
     Complexity: Time - O(n*k), Space - O(n+k), Stable
     """
@@ -511,55 +283,25 @@ def radix(vis: plt.bar,
         buckets.append([])
 
     max_digits: int = _radix_max(array)
-    array = list(array)
     pow_10: int = 1
 
-    for digit_index in range(max_digits):
+    for _ in range(max_digits):
         for num in array:
             bucket_index: int = (abs(num) // pow_10) % 10
             buckets[bucket_index].append(num)
 
-        color: str = ''  # Used so each digit gets it's own color.
-        temp: list[np.ndarray] = array.copy()
-
-        if pow_10 == 1:
-            color = CYAN
-        elif pow_10 == 10:
-            color = MAGENTA
-        elif pow_10 == 100:
-            color = RED
-        elif pow_10 == 1000:
-            color = BLACK
-
-        array.clear()
+        # Writes the buckets back in order
+        b: int = 0
         for bucket in buckets:
-            array.extend(bucket)
+            for num in bucket:
+                array[b] = num
+                yield SET, b, num
+                b += 1
             bucket.clear()
 
-        # Main tool for visualizing. Needs to be complicated to push values to the right rather than just replace.
-        for b in range(array_size):
-            index: int = temp.index(array[b])
-            vis[b].set_color(color)
-            vis[index].set_color(GOLD)
-            plt.pause(pause_short)
-
-            t: list[np.ndarray] = temp.copy()
-            temp[b] = array[b]
-            for i in range(b, index):
-                temp[i + 1] = t[i]
-                vis[i].set_height(temp[i])
-            vis[index].set_height(temp[index])
-            vis[index].set_color(DEFAULT)
-            plt.pause(pause_short)
-            if digit_index != max_digits-1:
-                vis[b].set_color(DEFAULT)
-            else:
-                vis[b].set_color(GREEN)
-
-        plt.pause(pause_long)
-
         pow_10 *= 10
 
+    # Negatives are sorted by magnitude so they go first, reversed
     negatives: list = []
     non_negatives: list = []
     for num in array:
@@ -567,12 +309,13 @@ def radix(vis: plt.bar,
             negatives.append(num)
         else:
             non_negatives.append(num)
-    negatives.reverse()
-    array.clear()
-    array.extend(negatives + non_negatives)
+    if negatives:
+        negatives.reverse()
+        for b, num in enumerate(negatives + non_negatives):
+            array[b] = num
+            yield SET, b, num
 
-    plt.draw()
-    # set_graph()    # To reset so other funcs can use. Causes reset after it's finished.
+    yield SORTED, 0, array_size
 
 
 def _radix_max(array: np.ndarray) -> int:
@@ -600,17 +343,22 @@ def _radix_length(num: int) -> int:
     return digits
 
 
-def bogo(vis: plt.bar,
-         array: np.ndarray,
-         array_size: int,
-         pause_short: float) \
-         -> None:
-
+def bogo(array: np.ndarray, array_size: int) -> Events:
     """Equivalent of throwing a deck of cards in the air, picking them up randomly hoping it's sorted
     Complexity: Time - O(n*n!), Space - O(1), Unstable
     """
 
-    EXPECTED_RUN_TIME: float = ((get_factorial(array_size)) / 4)
+    while not (yield from _is_sorted(array, array_size)):
+        yield from _shuffle(array, array_size)
+
+    yield SORTED, 0, array_size
+
+
+def bogo_text(array_size: int) -> str:
+    """Expected run time of bogo when drawn, to show above the graph"""
+
+    LOG_RUN_TIME: float = get_log10_factorial(array_size) - math.log10(4)
+    EXPECTED_RUN_TIME: float = 10**LOG_RUN_TIME if LOG_RUN_TIME < 300 else math.inf
     text: str
 
     if EXPECTED_RUN_TIME < 60:
@@ -634,35 +382,29 @@ MONTHS. But since you're, here might as well go all the way right?"""
         text = f"""Here you discover the meaning of life. Get comfortable. This make take 
 time. Only {round((EXPECTED_RUN_TIME / 3.154**7), 2)} YEARS"""
     else:
+        # Years as mantissa and exponent, the time itself can be too big for a float
+        LOG_YEARS = LOG_RUN_TIME - 7 * math.log10(3.154)
         text = f"""Congratulations! You won! What did you win? Well you'll just have to wait a 
-measly {round((EXPECTED_RUN_TIME / 3.154 ** 7), 2)} YEARS to find out.
+measly {10**(LOG_YEARS % 1):.2f}e+{int(LOG_YEARS)} YEARS to find out.
 (The universe dies at 10e+100 YEARS btw.)"""
 
-    plt.suptitle(text)
-
-    while not _is_sorted(array, array_size):
-        _shuffle(array, array_size)
-        for b in range(array_size):
-            vis[b].set_height(array[b])
-        plt.pause(pause_short)
-
-    for i in range(array_size):
-        vis[i].set_color(GREEN)
-    plt.draw()
+    return text
 
 
-def _is_sorted(array: np.ndarray, array_size: int) -> bool:
-    """Checks if array is sorted"""
+def _is_sorted(array: np.ndarray, array_size: int) -> Generator[tuple[int, int, int], None, bool]:
+    """Checks if array is sorted. The result is the return value of the generator."""
 
     for b in range(0, array_size - 1):
-        if array[b] > array[b + 1]:
+        yield COMPARE, b + 1, b
+        if array[b + 1] < array[b]:
             return False
     return True
 
 
-def _shuffle(array: np.ndarray, array_size: int) -> None:
+def _shuffle(array: np.ndarray, array_size: int) -> Events:
     """Shuffles array"""
 
     for i in range(0, array_size):
         r = generate_array(0, array_size-1)
         array[i], array[r] = array[r], array[i]
+        yield SWAP, i, r
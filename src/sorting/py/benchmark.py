@@ -0,0 +1,171 @@
+"""Times the sorting algorithms without drawing anything, against numpy.sort.
+Timed runs exhaust the event stream of each algorithm unread, a separate run counts
+comparisons, swaps and writes from it. Inputs are seeded so runs can be compared.
+"""
+
+
+import sys
+import json
+import argparse
+import tracemalloc
+import numpy as np
+from collections import Counter, deque
+from dataclasses import dataclass, asdict
+from time import perf_counter_ns
+
+import src.sorting.py.algorithms as sort
+
+
+ALGOS = ("selection", "insertion", "bubble", "heap", "quick", "merge", "tim", "radix", "bogo")
+SIZES = (5, 10, 100, 1000, 10**4, 10**5, 10**6)  # 5 is the only one small enough for bogosort
+DISTRIBUTIONS = ("random", "sorted", "reversed", "few_unique", "nearly_sorted")
+
+# Largest size each algorithm runs at by default. Past these a case takes minutes. Bogosort needs n! shuffles.
+SIZE_LIMITS = {
+    "selection": 10**3,
+    "insertion": 10**3,
+    "bubble": 10**3,
+    "heap": 10**5,
+    "quick": 10**5,
+    "merge": 10**5,
+    "tim": 10**5,
+    "radix": 10**5,
+    "bogo": 8
+}
+
+_FEW_UNIQUE = 8  # Distinct values in few_unique
+_NEARLY_SORTED_SWAPS = 0.01  # Fraction of values swapped out of place in nearly_sorted
+_PERCENTILES = (50, 90, 99)
+
+
+@dataclass(slots=True)
+class CaseResult:
+    """Stats of one algorithm on one input"""
+
+    algo: str
+    size: int
+    distribution: str
+    repeats: int
+    comparisons: int
+    swaps: int
+    writes: int  # Values written into place other than by swaps, e.g. by merge and radix
+    events: int  # Everything yielded, including marking values sorted
+    wall_time_ns: dict[str, int]  # p50, p90, p99, min and max over the repeats
+    numpy_wall_time_ns: int  # Median of numpy.sort on the same input
+    slowdown: float  # Median wall time over numpy's
+    peak_python_bytes: int  # Peak allocations over one extra run
+    sorted_correctly: bool  # Same result as numpy.sort
+
+
+def run(algos=ALGOS, sizes=SIZES, distributions=DISTRIBUTIONS, repeats: int = 3, seed: int = 0,
+    limits: dict[str, int] = SIZE_LIMITS) -> dict:
+    """Runs every case within the limits. Cases past them are listed under skipped."""
+    report = {"seed": seed, "repeats": repeats, "results": [], "skipped": []}
+    for size in sizes:
+        for distribution in distributions:
+            array = make_array(size, distribution, seed)
+            for algo in algos:
+                if size > limits.get(algo, size):
+                    report["skipped"].append(f"{algo}/{size}/{distribution}")
+                    continue
+                report["results"].append(asdict(run_case(algo, array, distribution, repeats)))
+    return report
+
+
+def run_case(algo: str, array: np.ndarray, distribution: str = "", repeats: int = 3) -> CaseResult:
+    """Sorts copies of array with one algorithm and with numpy.sort"""
+    times = []
+    for _ in range(repeats):
+        result = array.copy()
+        time_start = perf_counter_ns()
+        deque(_sort(algo, result), maxlen=0)
+        times.append(perf_counter_ns() - time_start)
+
+    numpy_times = []
+    for _ in range(repeats):
+        time_start = perf_counter_ns()
+        expected = np.sort(array)
+        numpy_times.append(perf_counter_ns() - time_start)
+
+    # Tracing and counting slow the run down too much to time, so they get a run of their own
+    tracemalloc.start()
+    counts = Counter(event for event, _, _ in _sort(algo, array.copy()))
+    peak_python_bytes = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    times.sort()
+    numpy_times.sort()
+    wall_time_ns = {f"p{percentile}": _get_percentile(times, percentile) for percentile in _PERCENTILES}
+    wall_time_ns["min"], wall_time_ns["max"] = times[0], times[-1]
+    numpy_wall_time_ns = _get_percentile(numpy_times, 50)
+    return CaseResult(
+        algo, len(array), distribution, repeats, counts[sort.COMPARE], counts[sort.SWAP], counts[sort.SET],
+        counts.total(), wall_time_ns,
+        numpy_wall_time_ns, wall_time_ns["p50"] / max(numpy_wall_time_ns, 1), peak_python_bytes,
+        bool(np.array_equal(result, expected))
+    )
+
+
+def make_array(size: int, distribution: str, seed: int = 0) -> np.ndarray:
+    """Seeded input of a distribution"""
+    rng = np.random.default_rng(seed)
+    if distribution == "few_unique":
+        return rng.integers(0, _FEW_UNIQUE, size)
+
+    array = rng.integers(0, max(size, 150), size)  # Same range as the visualizer for small sizes
+    if distribution == "random":
+        return array
+    array.sort()
+    if distribution == "sorted":
+        return array
+    if distribution == "reversed":
+        return array[::-1].copy()
+    if distribution == "nearly_sorted":
+        num_swaps = max(1, int(size * _NEARLY_SORTED_SWAPS))
+        for i, j in rng.integers(0, size, (num_swaps, 2)):
+            array[i], array[j] = array[j], array[i]
+        return array
+    raise NotImplementedError(f"Invalid distribution. Choose from {DISTRIBUTIONS}")
+
+
+def main(argv=None) -> int:
+    """Command line entry. Returns 1 if any algorithm sorted incorrectly."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--algos", nargs="+", default=list(ALGOS), choices=ALGOS)
+    parser.add_argument("--sizes", nargs="+", type=int, default=list(SIZES))
+    parser.add_argument("--distributions", nargs="+", default=list(DISTRIBUTIONS), choices=DISTRIBUTIONS)
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--no-limits", action="store_true", help="Run every size, even if it takes hours")
+    parser.add_argument("--output", help="Write the JSON report here instead of stdout")
+    args = parser.parse_args(argv)
+
+    report = run(args.algos, args.sizes, args.distributions, args.repeats, args.seed,
+        limits={} if args.no_limits else SIZE_LIMITS)
+
+    text = json.dumps(report, indent=4)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as file:
+            file.write(text)
+    else:
+        print(text)
+
+    incorrect = [result for result in report["results"] if not result["sorted_correctly"]]
+    for result in incorrect:
+        print(f"Incorrect  {result['algo']}/{result['size']}/{result['distribution']}", file=sys.stderr)
+    return 1 if incorrect else 0
+
+
+def _sort(algo: str, array: np.ndarray) -> sort.Events:
+    """Events of an algorithm sorting array. Nothing happens until they are read."""
+    return getattr(sort, algo)(array, len(array))
+
+
+def _get_percentile(sorted_values: list[int], percentile: int) -> int:
+    """Nearest rank percentile"""
+    rank = -(-percentile * len(sorted_values) // 100)
+    return sorted_values[max(rank, 1) - 1]
+
+
+if __name__ == "__main__":
+    sys.exit(main())
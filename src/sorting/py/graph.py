@@ -3,10 +3,19 @@
 
 from src.sorting.py.utils.colors import *
 from dataclasses import dataclass
+from itertools import islice
+from math import log10
 import matplotlib.pyplot as plt
 from matplotlib.widgets import Button, Slider
 import src.sorting.py.algorithms as sort
 from src.sorting.py.utils.values import generate_array, remove_duplicates
+from src.bar_blitter import BarBlitter, BarRaster, FRAME_INTERVAL
+from src.trace import TraceWriter, TraceReader, TracePlayer
+
+TRACE_COLORS = (DEFAULT, GOLD, RED, GREEN)  # Colors play uses, in the order traces number them
+RASTER_MIN_BARS = 1000  # Past this bars are thinner than a pixel, so they're drawn as an image
+RASTER_COLORS = (RED, GOLD, DEFAULT, GREEN)  # Color shown by a pixel column of bars with several
+MAX_ARRAY_SIZE = 10**5
 
 
 @dataclass
@@ -18,11 +27,10 @@ class Graph:
     labels: list[int]  # Name of xaxis values. Setting to index of array.
     is_sorted: bool
 
-    vis: plt.bar  # Object that contains the graph
+    vis: BarBlitter | BarRaster  # Bars of the graph, drawn by play
     pause_short: float  # Sets pause length for visualizations. Relative to size.
-    pause_mid: float  # Needed for some algos
-    pause_long: float  # Longer pause that is needed for certain visualizations
     # Change update_pause() function if changing formula for pause
+    record_path: str | None = None  # Each run is recorded here as a trace, replacing the last
 
 
 def set_graph(g: Graph) -> None:
@@ -30,7 +38,7 @@ def set_graph(g: Graph) -> None:
 
     # Clears previous graph for update
     plt.clf()
-    g.vis = plt.bar(g.labels, g.array, color=DEFAULT)
+    g.vis = _get_bars(plt.gca(), g.array)
     plt.subplots_adjust(left=0.15, bottom=0.3)
 
     # Shows 'x', 'y' or 'xy' axis
@@ -49,8 +57,10 @@ def buttons_sliders(g: Graph) -> None:
     stop_loc = plt.axes([0.85, 0.03, 0.1, 0.05])  # left, bottom, width, height
     stop = Button(ax=stop_loc, label='Stop', color=RED)
     size_loc = plt.axes([0.05, 0.235, 0.05, 0.5])
-    size = Slider(ax=size_loc, label='Size & Speed', valmin=5, valmax=100,
-                  valinit=g.array_size, valstep=1, orientation='vertical')
+    # Steps through sizes by powers of 10, so small arrays are as easy to pick as large ones
+    size = Slider(ax=size_loc, label='Size & Speed', valmin=log10(5), valmax=log10(MAX_ARRAY_SIZE),
+                  valinit=log10(g.array_size), orientation='vertical')
+    size.valtext.set_text(g.array_size)
     sel_loc = plt.axes([0.225, 0.03, 0.15, 0.05])
     sel = Button(ax=sel_loc, label='Selection', color=ORANGE)
     ins_loc = plt.axes([0.625, 0.1, 0.15, 0.05])
@@ -73,7 +83,7 @@ def buttons_sliders(g: Graph) -> None:
     # These functions define the action on click
     def generate_new_array(_) -> None:
         g.array = generate_array(0, 150, g.array_size)
-        set_graph(g)
+        show_array(g)
         g.is_sorted = False
         generate.disconnect(generate_cid)
 
@@ -84,7 +94,8 @@ def buttons_sliders(g: Graph) -> None:
         stop.disconnect(stop_cid)
 
     def change_size(_) -> None:
-        g.array_size = int(size.val)
+        g.array_size = round(10 ** size.val)
+        size.valtext.set_text(g.array_size)
         update_array(g)
         g.is_sorted = False
 
@@ -92,49 +103,49 @@ def buttons_sliders(g: Graph) -> None:
         if g.is_sorted:
             update_array(g)
         g.is_sorted = True
-        sort.selection(g.vis, g.array, g.array_size, g.pause_short, g.pause_mid)
+        play(g, sort.selection(g.array, g.array_size))
         sel.disconnect(sel_cid)
 
     def ins_sort(_) -> None:
         if g.is_sorted:
             update_array(g)
         g.is_sorted = True
-        sort.insertion(g.vis, g.array, g.array_size, g.pause_short)
+        play(g, sort.insertion(g.array, g.array_size))
         ins.disconnect(ins_cid)
 
     def bub_sort(_) -> None:
         if g.is_sorted:
             update_array(g)
         g.is_sorted = True
-        sort.bubble(g.vis, g.array, g.array_size, g.pause_short)
+        play(g, sort.bubble(g.array, g.array_size))
         bub.disconnect(bub_cid)
 
     def heap_sort(_) -> None:
         if g.is_sorted:
             update_array(g)
         g.is_sorted = True
-        sort.heap(g.vis, g.array, g.array_size, g.pause_short, g.pause_long)
+        play(g, sort.heap(g.array, g.array_size))
         heap.disconnect(heap_cid)
 
     def quick_sort(_) -> None:
         if g.is_sorted:
             update_array(g)
         g.is_sorted = True
-        sort.quick(g.vis, g.array, g.array_size, g.pause_short)
+        play(g, sort.quick(g.array, g.array_size))
         quick.disconnect(quick_cid)
 
     def merge_sort(_) -> None:
         if g.is_sorted:
             update_array(g)
         g.is_sorted = True
-        sort.merge(g.vis, g.array, g.array_size, g.pause_short)
+        play(g, sort.merge(g.array, g.array_size))
         merge.disconnect(merge_cid)
 
     def tim_sort(_) -> None:
         if g.is_sorted:
             update_array(g)
         g.is_sorted = True
-        sort.tim(g.vis, g.array, g.array_size, g.pause_short)
+        play(g, sort.tim(g.array, g.array_size))
         tim.disconnect(tim_cid)
 
     def radix_sort(_) -> None:
@@ -142,14 +153,15 @@ def buttons_sliders(g: Graph) -> None:
             update_array(g)
         g.is_sorted = True
         delete_duplicates(g)
-        sort.radix(g.vis, g.array, g.array_size, g.pause_short, g.pause_long)
+        play(g, sort.radix(g.array, g.array_size))
         radix.disconnect(radix_cid)
 
     def bogo_sort(_) -> None:
         if g.is_sorted:
             update_array(g)
         g.is_sorted = True
-        sort.bogo(g.vis, g.array, g.array_size, g.pause_short)
+        plt.suptitle(sort.bogo_text(g.array_size))
+        play(g, sort.bogo(g.array, g.array_size))
         bogo.disconnect(bogo_cid)
 
     # These allow resetting the button after click, allowing repeat clicks
@@ -170,13 +182,126 @@ def buttons_sliders(g: Graph) -> None:
     plt.show()
 
 
+def play(g: Graph, events: sort.Events) -> None:
+    """Draws the events of a sorting algorithm as it runs.
+    Each frame takes as many events as fit in its interval at pause_short each and only redraws bars they touched.
+    Stops early if the graph is redrawn, e.g. by stop or generate. Recorded as a trace if record_path is set.
+    """
+
+    bars = g.vis
+    if g.record_path:
+        bars.trace = TraceWriter(g.record_path, "sorting", g.array, TRACE_COLORS)  # Nothing is sorted yet
+    try:
+        _play(g, bars, events)
+    finally:
+        if bars.trace is not None:
+            bars.trace.close()
+            bars.trace = None
+
+
+def _play(g: Graph, bars: BarBlitter, events: sort.Events) -> None:
+    """Helper function for play"""
+
+    events_per_frame: int = max(1, round(FRAME_INTERVAL / g.pause_short))
+    interval: float = max(FRAME_INTERVAL, g.pause_short)
+    is_final: list[bool] = [False] * g.array_size  # Values in their final place, shown green
+    highlighted: dict[int, str] = {}  # Bars colored for what happened in the last frame
+
+    events = iter(events)
+    while frame := list(islice(events, events_per_frame)):
+        if g.vis is not bars:
+            return
+
+        # Moves the bars, then colors what was touched. Moving a value wins over looking at it.
+        colors: dict[int, str] = {}
+        for event, a, b in frame:
+            if event == sort.COMPARE:
+                colors.setdefault(a, GOLD)
+                colors.setdefault(b, GOLD)
+            elif event == sort.SWAP:
+                height = bars.get_height(a)
+                bars.set_height(a, bars.get_height(b))
+                bars.set_height(b, height)
+                colors[a] = colors[b] = RED
+            elif event == sort.SET:
+                bars.set_height(a, b)
+                colors[a] = RED
+            elif event == sort.SORTED:
+                for index in range(a, b):
+                    if not is_final[index]:
+                        is_final[index] = True
+                        colors.setdefault(index, GREEN)
+
+        for index in highlighted.keys() - colors.keys():
+            bars.set_color(index, GREEN if is_final[index] else DEFAULT)
+        for index, color in colors.items():
+            bars.set_color(index, color)
+        highlighted = {index: color for index, color in colors.items() if color != GREEN}
+        bars.pause(interval)
+
+    if g.vis is bars:
+        for index in highlighted:
+            bars.set_color(index, GREEN if is_final[index] else DEFAULT)
+        bars.draw()
+
+
+def replay(path: str, start: int = 0) -> None:
+    """Shows a trace recorded by play. The slider jumps to any event, play draws the frames from there as recorded."""
+
+    player = TracePlayer(TraceReader(path))
+    if player.reader.kind != "sorting":
+        raise ValueError(f"{path} is a {player.reader.kind} trace")
+    colors = player.reader.colors
+    num_events = len(player.reader)
+
+    plt.clf()
+    bars = _get_bars(plt.gca(), player.values, colors[0])
+    plt.subplots_adjust(left=0.15, bottom=0.3)
+    show_axis()
+
+    event_loc = plt.axes([0.225, 0.17, 0.55, 0.05])
+    event = Slider(ax=event_loc, label='Event', valmin=0, valmax=max(num_events, 1), valinit=0, valstep=1)
+    play_loc = plt.axes([0.425, 0.03, 0.15, 0.05])
+    play_button = Button(ax=play_loc, label='Play', color=GREEN)
+    is_playing: list[bool] = [False]  # Changed by clicks handled during play
+
+    def seek(val) -> None:
+        for index in player.seek(int(val)).tolist():
+            bars.set_height(index, player.values[index])
+            bars.set_color(index, colors[player.colors[index]])
+        bars.update()
+
+    def play_or_pause(_) -> None:
+        if is_playing[0]:
+            is_playing[0] = False
+            return
+
+        is_playing[0] = True
+        play_button.label.set_text('Pause')
+        event.drawon = False  # Redrawing the slider every frame would redraw everything
+        plt.draw()
+        while is_playing[0] and player.position < num_events and plt.fignum_exists(bars.ax.figure.number):
+            event.set_val(player.get_frame_after(player.position))
+            bars.pause(FRAME_INTERVAL)
+        is_playing[0] = False
+        event.drawon = True
+        play_button.label.set_text('Play')
+        plt.draw()
+
+    event.on_changed(seek)
+    play_button.on_clicked(play_or_pause)
+    event.set_val(start)
+
+    plt.show()
+
+
 def update_array(g: Graph) -> None:
     """Used for updating slider of array size"""
 
     g.array = generate_array(0, 150, g.array_size)
     g.labels = [label for label in range(g.array_size)]
     update_pause(g)
-    set_graph(g)
+    show_array(g)
 
 
 def delete_duplicates(g: Graph) -> None:
@@ -186,15 +311,33 @@ def delete_duplicates(g: Graph) -> None:
     g.array_size = len(g.array)
     g.labels = [label for label in range(g.array_size)]
     update_pause(g)
-    set_graph(g)
+    show_array(g)
+
+
+def show_array(g: Graph) -> None:
+    """Shows a new array. Large ones only swap the raster, rebuilding the figure with its buttons takes longer."""
+
+    if isinstance(g.vis, BarRaster) and g.array_size > RASTER_MIN_BARS:
+        ax = g.vis.ax
+        g.vis.remove()
+        g.vis = _get_bars(ax, g.array)
+        ax.figure.canvas.draw_idle()
+    else:
+        set_graph(g)
+
+
+def _get_bars(ax, heights, color: str = DEFAULT) -> BarBlitter | BarRaster:
+    """Bars for an array, a raster if they would be thinner than a pixel"""
+
+    if len(heights) > RASTER_MIN_BARS:
+        return BarRaster(ax, heights, color, RASTER_COLORS)
+    return BarBlitter(ax, heights, color)
 
 
 def update_pause(g) -> None:
     """Updates pause values"""
 
     g.pause_short = 150 / g.array_size * 0.01
-    g.pause_mid = (g.pause_short * 3) + (g.array_size * 0.001)
-    g.pause_long = (g.pause_short * 3) + (g.array_size * 0.005)
 
 
 def show_axis(axis: str = 'None') -> None:
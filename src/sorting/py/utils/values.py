@@ -1,6 +1,7 @@
 """Functions needed by multiple modules"""
 
 
+import math
 import numpy as np
 from collections import OrderedDict
 
@@ -15,6 +16,6 @@ def remove_duplicates(array: list) -> list:
     return list(OrderedDict.fromkeys(array))
 
 
-def get_factorial(num: int) -> int:
-    """Returns factorial of a number. Used by bogosort"""
-    return np.math.factorial(num)
+def get_log10_factorial(num: int) -> float:
+    """Returns log10 of the factorial of a number, which is past a float's range above 170. Used by bogosort."""
+    return math.lgamma(num + 1) / math.log(10)
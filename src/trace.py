@@ -0,0 +1,179 @@
+"""Compact binary traces of visualizer runs, to replay or scrub through without running the algorithm again.
+A file holds a header, the state before the first event, then fixed size events:
+    MAGIC | uint32 length of header | header as JSON | int32 per element of the initial state | events
+Events are EVENT_DTYPE records appended as they happen. Readers memory-map them, so any
+event is reached without loading the ones before it, even for traces of millions of events.
+"""
+
+
+import json
+import struct
+import numpy as np
+
+
+MAGIC = b"AVTRACE1"
+
+# Packed, so every event is 9 bytes
+EVENT_DTYPE = np.dtype([("op", "<u1"), ("index", "<u4"), ("value", "<i4")])
+
+# Operation codes of events. What index and value hold for each:
+FRAME = 0  # Unused. Everything since the last frame was drawn together.
+SET_STATE = 1  # Pathfinding square, its new state code as in Square.states
+SET_HEIGHT = 2  # Sorting bar, its new height
+SET_COLOR = 3  # Sorting bar, its new color as an index into the header's colors. Bars start at the first.
+
+_BUFFER_EVENTS = 2**16  # Events held by a writer before going to the file
+_KEYFRAME_EVENTS = 2**16  # Fewest events between the states a player keeps to seek back from
+
+
+class TraceWriter:
+    """Writes a trace as events happen. Close it, or use it in a with block, to write the last of them."""
+
+    def __init__(self, path: str, kind: str, initial, colors: tuple[str, ...] = ()) -> None:
+        self.kind = kind
+        self.colors = tuple(colors)
+        self.num_events = 0
+        self._color_codes: dict[str, int] = {color: code for code, color in enumerate(self.colors)}
+        self._events: list[tuple[int, int, int]] = []
+
+        initial = np.asarray(initial, dtype="<i4")
+        header = json.dumps({"kind": kind, "shape": list(initial.shape), "colors": list(self.colors)}).encode()
+        self._file = open(path, "wb")
+        self._file.write(MAGIC + struct.pack("<I", len(header)) + header + initial.tobytes())
+
+    def __enter__(self) -> "TraceWriter":
+        return self
+
+    def __exit__(self, *_) -> None:
+        self.close()
+
+    def set_state(self, index: int, state: int) -> None:
+        self._add(SET_STATE, index, state)
+
+    def set_height(self, index: int, height: int) -> None:
+        self._add(SET_HEIGHT, index, height)
+
+    def set_color(self, index: int, color: str) -> None:
+        self._add(SET_COLOR, index, self._color_codes[color])
+
+    def frame(self) -> None:
+        """Ends a frame. Replays draw everything since the last one at once."""
+        self._add(FRAME, 0, 0)
+
+    def flush(self) -> None:
+        """Writes the buffered events to the file"""
+        if self._events:
+            self._file.write(np.array(self._events, dtype=EVENT_DTYPE).tobytes())
+            self._events.clear()
+        self._file.flush()
+
+    def close(self) -> None:
+        if not self._file.closed:
+            self.flush()
+            self._file.close()
+
+    def _add(self, op: int, index: int, value: int) -> None:
+        self._events.append((op, index, value))
+        self.num_events += 1
+        if len(self._events) >= _BUFFER_EVENTS:
+            self.flush()
+
+
+class TraceReader:
+    """A trace file with its events memory-mapped"""
+
+    def __init__(self, path: str) -> None:
+        with open(path, "rb") as file:
+            if file.read(len(MAGIC)) != MAGIC:
+                raise ValueError(f"{path} is not a trace")
+            header_length = struct.unpack("<I", file.read(4))[0]
+            header = json.loads(file.read(header_length))
+            self.kind: str = header["kind"]
+            self.shape: tuple[int, ...] = tuple(header["shape"])
+            self.colors: tuple[str, ...] = tuple(header["colors"])
+            self.initial: np.ndarray = np.fromfile(file, dtype="<i4", count=int(np.prod(self.shape))).reshape(self.shape)
+            events_offset = file.tell()
+            file.seek(0, 2)
+            num_events = (file.tell() - events_offset) // EVENT_DTYPE.itemsize
+
+        # Memory-mapping nothing is an error
+        self.events: np.ndarray = np.zeros(0, dtype=EVENT_DTYPE)
+        if num_events:
+            self.events = np.memmap(path, dtype=EVENT_DTYPE, mode="r", offset=events_offset, shape=(num_events,))
+        self._frame_ends: np.ndarray = None
+
+    def __len__(self) -> int:
+        return len(self.events)
+
+    def get_frame_ends(self) -> np.ndarray:
+        """Event index just past each frame, in order. The end of the trace counts as one."""
+        if self._frame_ends is None:
+            self._frame_ends = np.flatnonzero(self.events["op"] == FRAME) + 1
+            if not len(self._frame_ends) or self._frame_ends[-1] != len(self):
+                self._frame_ends = np.append(self._frame_ends, len(self))
+        return self._frame_ends
+
+
+class TracePlayer:
+    """State of a trace after any number of its events. Seeks start from the closest of the current state
+    and the states kept on the way, so scrubbing never replays from the start.
+    """
+
+    def __init__(self, reader: TraceReader) -> None:
+        self.reader = reader
+        self.position = 0  # Events applied so far
+        self.values: np.ndarray = reader.initial.ravel().copy()  # State codes or heights
+        self.colors: np.ndarray = np.zeros(len(self.values), dtype=np.int32)  # Color codes, sorting only
+
+        # Keeping a copy of the state costs about as much as the events in between
+        self._keyframe_events: int = max(_KEYFRAME_EVENTS, len(self.values))
+        self._keyframes: dict[int, tuple[np.ndarray, np.ndarray]] = {0: (self.values.copy(), self.colors.copy())}
+
+    def seek(self, position: int) -> np.ndarray:
+        """Moves to just after position events. Returns the flat indices whose value or color changed."""
+        position = min(max(position, 0), len(self.reader))
+        keyframe = max(key for key in self._keyframes if key <= position)
+        if position < self.position or keyframe > self.position:
+            before = self.values.copy(), self.colors.copy()
+            values, colors = self._keyframes[keyframe]
+            self.values[:], self.colors[:] = values, colors
+            self.position = keyframe
+            self._apply_to(position)
+            return np.flatnonzero((self.values != before[0]) | (self.colors != before[1]))
+        return self._apply_to(position)
+
+    def get_frame_after(self, position: int) -> int:
+        """Position at the end of the frame after position"""
+        frame_ends = self.reader.get_frame_ends()
+        return int(frame_ends[min(np.searchsorted(frame_ends, position, side="right"), len(frame_ends) - 1)])
+
+    def get_frame_before(self, position: int) -> int:
+        """Position at the end of the frame before position"""
+        frame_ends = self.reader.get_frame_ends()
+        before = np.searchsorted(frame_ends, position, side="left") - 1
+        return int(frame_ends[before]) if before >= 0 else 0
+
+    def _apply_to(self, position: int) -> np.ndarray:
+        """Applies events up to position, keeping states on the way. Returns the flat indices changed."""
+        changed = np.zeros(len(self.values), dtype=bool)
+        while self.position < position:
+            stop = min(position, (self.position // self._keyframe_events + 1) * self._keyframe_events)
+            changed[self._apply(self.reader.events[self.position:stop])] = True
+            self.position = stop
+            if stop % self._keyframe_events == 0 and stop not in self._keyframes:
+                self._keyframes[stop] = self.values.copy(), self.colors.copy()
+        return np.flatnonzero(changed)
+
+    def _apply(self, events: np.ndarray) -> np.ndarray:
+        """Applies a slice of events in order. Returns the flat indices they touched."""
+        changed = []
+        for ops, target in (((SET_STATE, SET_HEIGHT), self.values), ((SET_COLOR,), self.colors)):
+            selected = events[np.isin(events["op"], ops)]
+            if not len(selected):
+                continue
+
+            # Only the last event of each index matters
+            indices, last = np.unique(selected["index"][::-1], return_index=True)
+            target[indices] = selected["value"][::-1][last]
+            changed.append(indices.astype(np.int64))
+        return np.concatenate(changed) if changed else np.zeros(0, dtype=np.int64)
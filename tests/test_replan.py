@@ -0,0 +1,62 @@
+"""Instant reruns after a finished search must keep the walls drawn since it"""
+
+
+import os
+os.environ.setdefault("PATHFINDING_INCLUDE", ".py")  # replan is python only
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import random
+import numpy as np
+from src.pathfinding.py import algorithms
+from src.pathfinding.py.square import Square
+from src.pathfinding.py.headless import solve
+
+
+def _finished_a_star(num_rows_cols: int = 22) -> tuple[algorithms.AlgoState, Square, Square]:
+    """Empty graph with a drawn A* path from the top left to the bottom right corner"""
+    Square.update_num_rows_cols(num_rows_cols)
+    Square.init(800)
+    start, end = Square.get_square(0, 0), Square.get_square(num_rows_cols - 1, num_rows_cols - 1)
+    start.set_start()
+    end.set_end()
+    algo = algorithms.AlgoState()
+    algo.set_best_path_delay(0)
+    algorithms.a_star(algo, start, end, Square.get_null_square(), draw_best_path=True)
+    return algo, start, end
+
+
+def _draw_wall_and_replan(algo: algorithms.AlgoState, start: Square, end: Square, square: Square) -> list[Square]:
+    """Same as a wall click during an instant rerun. Returns the new path."""
+    square.set_wall()
+    Square.reset_algo_squares()
+    algorithms.replan(algo, start, end)
+    return Square.get_all_path_squares()
+
+
+def test_walls_drawn_on_the_path_stay_walls():
+    algo, start, end = _finished_a_star()
+    rng = random.Random(0)
+    drawn = []
+    for _ in range(8):
+        square = rng.choice(Square.get_all_path_squares())
+        _draw_wall_and_replan(algo, start, end, square)
+        drawn.append(square)
+
+    for square in drawn:
+        assert square.is_wall()
+        assert Square.walls[square.get_index()]
+        assert square in Square.all_wall_squares
+
+
+def test_replanned_paths_stay_shortest():
+    rng = random.Random(1)
+    for _ in range(20):
+        algo, start, end = _finished_a_star(12)
+        for _ in range(6):
+            path = Square.get_all_path_squares()
+            square = rng.choice(path) if path else rng.choice(Square.get_all_empty_squares())
+            path = _draw_wall_and_replan(algo, start, end, square)
+
+            walls = np.frombuffer(Square.walls, dtype=np.bool_).reshape(12, 12)
+            expected = solve(walls, start.get_pos(), end.get_pos(), "dijkstra")
+            assert len(path) == max(expected.length - 1, 0)